@@ -0,0 +1,49 @@
+"""hot path indexes
+
+Revision ID: 0c8e4f2d7a19
+Revises: f2b6d8a41c93
+Create Date: 2026-10-16 22:05:12.418307
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0c8e4f2d7a19"
+down_revision: Union[str, None] = "f2b6d8a41c93"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns, covered columns); the order of the key columns follows the ORDER BY of the queries
+INDEXES = (
+    ("ix_card_list_id_position", "card", ["list_id", "position", "id"], None),
+    ("ix_card_assignee_id", "card", ["assignee_id"], None),
+    ("ix_list_board_id_position", "list", ["board_id", "position"], None),
+    ("ix_comment_card_id_created_at", "comment", ["card_id", "created_at", "id"], None),
+    ("ix_board_owner_id", "board", ["owner_id"], ["id"]),
+    ("ix_board_share_user_id", "board_share", ["user_id"], ["board_id", "access_type"]),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY does not lock the tables for writes, but cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns, include in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_include=include,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,65 @@
+"""fractional card positions
+
+Revision ID: 5b2e7c91d4a3
+Revises: ed3f0f7d2408
+Create Date: 2026-10-16 10:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5b2e7c91d4a3"
+down_revision: Union[str, None] = "ed3f0f7d2408"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match POSITION_STEP in src/repositories/card.py
+POSITION_STEP = 1024
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column(
+        "card",
+        "position",
+        existing_type=sa.Integer(),
+        type_=sa.Float(),
+        existing_nullable=False,
+    )
+    # Existing positions may contain duplicates or holes: spread them evenly per list
+    op.execute(
+        f"""
+        UPDATE card SET position = ranked.rank * {POSITION_STEP}
+        FROM (
+            SELECT id, row_number() OVER (PARTITION BY list_id ORDER BY position, id) - 1 AS rank
+            FROM card
+        ) AS ranked
+        WHERE card.id = ranked.id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(
+        """
+        UPDATE card SET position = ranked.rank
+        FROM (
+            SELECT id, row_number() OVER (PARTITION BY list_id ORDER BY position, id) - 1 AS rank
+            FROM card
+        ) AS ranked
+        WHERE card.id = ranked.id
+        """
+    )
+    op.alter_column(
+        "card",
+        "position",
+        existing_type=sa.Float(),
+        type_=sa.Integer(),
+        existing_nullable=False,
+        postgresql_using="position::integer",
+    )
@@ -0,0 +1,43 @@
+"""user search trigram indexes
+
+Revision ID: 7a3d9e51c2b8
+Revises: 0c8e4f2d7a19
+Create Date: 2026-10-16 22:41:53.206914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7a3d9e51c2b8"
+down_revision: Union[str, None] = "0c8e4f2d7a19"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_COLUMNS = ("username", "email", "full_name")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # CONCURRENTLY does not lock the user table for writes, but cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name in SEARCH_COLUMNS:
+            op.create_index(
+                f"ix_user_{name}_trgm",
+                "user",
+                [name],
+                unique=False,
+                postgresql_using="gin",
+                postgresql_ops={name: "gin_trgm_ops"},
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name in reversed(SEARCH_COLUMNS):
+            op.drop_index(f"ix_user_{name}_trgm", table_name="user", postgresql_concurrently=True, if_exists=True)
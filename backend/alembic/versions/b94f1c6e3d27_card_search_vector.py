@@ -0,0 +1,50 @@
+"""card search vector
+
+Revision ID: b94f1c6e3d27
+Revises: 7a3d9e51c2b8
+Create Date: 2026-10-16 23:12:06.731548
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b94f1c6e3d27"
+down_revision: Union[str, None] = "7a3d9e51c2b8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'B')"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # A stored generated column is filled for existing rows by rewriting the card table
+    op.add_column(
+        "card",
+        sa.Column("search_vector", postgresql.TSVECTOR(), sa.Computed(SEARCH_VECTOR, persisted=True), nullable=True),
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_card_search_vector",
+            "card",
+            ["search_vector"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_card_search_vector", table_name="card", postgresql_concurrently=True, if_exists=True)
+    op.drop_column("card", "search_vector")
@@ -0,0 +1,89 @@
+"""board task counter instead of per-board sequences
+
+Revision ID: c47a1e9f08b2
+Revises: 5b2e7c91d4a3
+Create Date: 2026-10-16 11:03:27.540912
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c47a1e9f08b2"
+down_revision: Union[str, None] = "5b2e7c91d4a3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "board_task_counter",
+        sa.Column("board_id", sa.Integer(), nullable=False),
+        sa.Column("last_value", sa.Integer(), nullable=False),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["board_id"], ["board.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("board_id"),
+    )
+    op.create_index(op.f("ix_board_task_counter_id"), "board_task_counter", ["id"], unique=False)
+
+    # Continue numbering from the existing cards and task_seq_board_{id} sequences, then drop the sequences
+    op.execute(
+        """
+        INSERT INTO board_task_counter (board_id, last_value, created_at, updated_at)
+        SELECT list.board_id, max(card.card_id), now(), now()
+        FROM card JOIN list ON list.id = card.list_id
+        GROUP BY list.board_id
+        """
+    )
+    op.execute(
+        r"""
+        DO $$
+        DECLARE
+            seq record;
+            target_board integer;
+        BEGIN
+            FOR seq IN
+                SELECT sequencename, last_value FROM pg_sequences
+                WHERE schemaname = current_schema() AND sequencename ~ '^task_seq_board_\d+$'
+            LOOP
+                target_board := substring(seq.sequencename from '\d+$')::integer;
+                IF seq.last_value IS NOT NULL AND EXISTS (SELECT 1 FROM board WHERE id = target_board) THEN
+                    INSERT INTO board_task_counter (board_id, last_value, created_at, updated_at)
+                    VALUES (target_board, seq.last_value, now(), now())
+                    ON CONFLICT (board_id) DO UPDATE
+                    SET last_value = greatest(board_task_counter.last_value, excluded.last_value);
+                END IF;
+                EXECUTE format('DROP SEQUENCE %I', seq.sequencename);
+            END LOOP;
+        END $$;
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(
+        """
+        DO $$
+        DECLARE
+            counter record;
+        BEGIN
+            FOR counter IN SELECT board_id, last_value FROM board_task_counter LOOP
+                EXECUTE format(
+                    'CREATE SEQUENCE IF NOT EXISTS task_seq_board_%s START %s',
+                    counter.board_id,
+                    counter.last_value + 1
+                );
+            END LOOP;
+        END $$;
+        """
+    )
+    op.drop_index(op.f("ix_board_task_counter_id"), table_name="board_task_counter")
+    op.drop_table("board_task_counter")
@@ -0,0 +1,59 @@
+"""board versions and tombstones
+
+Revision ID: f2b6d8a41c93
+Revises: e81d3c5a7f20
+Create Date: 2026-10-16 21:24:37.904512
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f2b6d8a41c93"
+down_revision: Union[str, None] = "e81d3c5a7f20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in ("board", "list", "card", "comment"):
+        op.add_column(table, sa.Column("version", sa.Integer(), server_default="0", nullable=False))
+
+    op.create_index("ix_list_board_id_version", "list", ["board_id", "version"], unique=False)
+    op.create_index("ix_card_list_id_version", "card", ["list_id", "version"], unique=False)
+    op.create_index("ix_comment_card_id_version", "comment", ["card_id", "version"], unique=False)
+
+    op.create_table(
+        "board_tombstone",
+        sa.Column("board_id", sa.Integer(), nullable=False),
+        sa.Column("entity_type", sa.String(), nullable=False),
+        sa.Column("entity_id", sa.Integer(), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["board_id"], ["board.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_board_tombstone_id"), "board_tombstone", ["id"], unique=False)
+    op.create_index(
+        "ix_board_tombstone_board_id_version", "board_tombstone", ["board_id", "version"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_board_tombstone_board_id_version", table_name="board_tombstone")
+    op.drop_index(op.f("ix_board_tombstone_id"), table_name="board_tombstone")
+    op.drop_table("board_tombstone")
+
+    op.drop_index("ix_comment_card_id_version", table_name="comment")
+    op.drop_index("ix_card_list_id_version", table_name="card")
+    op.drop_index("ix_list_board_id_version", table_name="list")
+
+    for table in ("comment", "card", "list", "board"):
+        op.drop_column(table, "version")
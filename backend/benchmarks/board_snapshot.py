@@ -0,0 +1,116 @@
+"""
+Board page load: legacy get_board fan-out vs the single-statement board snapshot,
+and the encoded snapshot loaded and serialized vs served from BoardSnapshotCache.
+"cold burst" sends --concurrency reads of a new board version at once: single-flight
+in BoardSnapshotCache leaves one load for all of them.
+
+    python -m benchmarks.board_snapshot --lists 10 --cards 200 --iterations 200 --concurrency 50
+"""
+import argparse
+import asyncio
+import uuid
+
+from src.core.cache import MemoryCache
+from src.core.snapshot_cache import BoardSnapshotCache
+from src.models import Board, BoardList, BoardShare, Card, User
+from src.repositories import BoardRepository, BoardShareReository, ListRepository
+from src.schemas.board import BoardSnapshot
+
+from .common import QueryCounter, measure, report, rollback_session
+
+
+async def seed(session, lists: int, cards: int) -> tuple[Board, User]:
+    suffix = uuid.uuid4().hex[:8]
+    owner = User(email=f"owner-{suffix}@bench.io", username=f"owner-{suffix}", hashed_password="-")
+    reader = User(email=f"reader-{suffix}@bench.io", username=f"reader-{suffix}", hashed_password="-")
+    session.add_all([owner, reader])
+    await session.flush()
+
+    board = Board(title="Benchmark Board", owner_id=owner.id)
+    session.add(board)
+    await session.flush()
+    session.add(BoardShare(board_id=board.id, user_id=reader.id, access_type="read"))
+
+    board_lists = [BoardList(title=f"List {i}", position=i, board_id=board.id) for i in range(lists)]
+    session.add_all(board_lists)
+    await session.flush()
+
+    number = 0
+    for board_list in board_lists:
+        for position in range(cards):
+            number += 1
+            session.add(
+                Card(
+                    card_id=number,
+                    title=f"Card {number}",
+                    position=position,
+                    list_id=board_list.id,
+                    assignee_id=owner.id if number % 3 == 0 else None,
+                )
+            )
+    await session.flush()
+    return board, reader
+
+
+async def main(args: argparse.Namespace) -> None:
+    counter = QueryCounter()
+    async with rollback_session() as session:
+        board, reader = await seed(session, args.lists, args.cards)
+        board_repository = BoardRepository(session)
+        share_repository = BoardShareReository(session)
+        list_repository = ListRepository(session)
+
+        async def legacy():
+            db_board = await board_repository.get_board_with_lists(board.id)
+            await share_repository.get_one(board_id=db_board.id, user_id=reader.id)
+            await list_repository.get_board_lists(board.id, include_cards=True)
+            session.expunge_all()
+
+        async def snapshot():
+            await board_repository.get_board_snapshot(board.id, reader.id)
+            session.expunge_all()
+
+        async def load_encoded() -> bytes:
+            db_board, access_type = await board_repository.get_board_snapshot(board.id, reader.id)
+            payload = BoardSnapshot(**db_board.__dict__, access_type=access_type).model_dump_json(
+                exclude={"access_type"}
+            ).encode()
+            session.expunge_all()
+            return payload
+
+        snapshot_cache = BoardSnapshotCache(MemoryCache(ttl=3600))
+
+        async def cached():
+            payload = await snapshot_cache.get_or_load(board.id, 0, load_encoded)
+            snapshot_cache.with_access_type(payload, "read")
+
+        versions = iter(range(1, 1_000_000))
+
+        async def cold_burst():
+            version = next(versions)
+            await asyncio.gather(
+                *(snapshot_cache.get_or_load(board.id, version, load_encoded) for _ in range(args.concurrency))
+            )
+
+        runs = (
+            ("legacy get_board", legacy),
+            ("board snapshot", snapshot),
+            ("snapshot + encode", load_encoded),
+            ("snapshot cache", cached),
+            (f"cold burst x{args.concurrency}", cold_burst),
+        )
+        for name, func in runs:
+            with counter.count():
+                await func()
+            queries = counter.total
+            report(name, await measure(func, args.iterations), queries)
+        print(f"snapshot cache stats: {snapshot_cache.stats.as_dict()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lists", type=int, default=10)
+    parser.add_argument("--cards", type=int, default=200, help="cards per list")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50, help="simultaneous reads per cold burst")
+    asyncio.run(main(parser.parse_args()))
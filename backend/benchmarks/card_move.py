@@ -0,0 +1,87 @@
+"""
+Rows written per card move: legacy integer shifting vs fractional positions.
+
+    python -m benchmarks.card_move --cards 2000 --moves 200
+"""
+import argparse
+import asyncio
+import random
+import uuid
+
+from sqlalchemy import update
+
+from src.models import Board, BoardList, Card, User
+from src.repositories import CardRepository
+from src.repositories.card import POSITION_STEP
+
+from .common import QueryCounter, measure, report, rollback_session
+
+
+async def seed_list(session, cards: int, step: float) -> tuple[BoardList, list[int]]:
+    suffix = uuid.uuid4().hex[:8]
+    owner = User(email=f"mover-{suffix}@bench.io", username=f"mover-{suffix}", hashed_password="-")
+    session.add(owner)
+    await session.flush()
+    board = Board(title="Move Benchmark", owner_id=owner.id)
+    session.add(board)
+    await session.flush()
+    board_list = BoardList(title="Backlog", position=0, board_id=board.id)
+    session.add(board_list)
+    await session.flush()
+    db_cards = [
+        Card(card_id=i + 1, title=f"Card {i}", position=i * step, list_id=board_list.id) for i in range(cards)
+    ]
+    session.add_all(db_cards)
+    await session.flush()
+    return board_list, [card.id for card in db_cards]
+
+
+async def legacy_move(session, card: Card, new_position: int) -> None:
+    """The integer-shifting implementation move_card used before fractional positions."""
+    old_position = card.position
+    if old_position < new_position:
+        await session.execute(
+            update(Card)
+            .where((Card.list_id == card.list_id) & (Card.position > old_position) & (Card.position <= new_position))
+            .values(position=Card.position - 1)
+        )
+    elif old_position > new_position:
+        await session.execute(
+            update(Card)
+            .where((Card.list_id == card.list_id) & (Card.position >= new_position) & (Card.position < old_position))
+            .values(position=Card.position + 1)
+        )
+    card.position = new_position
+    await session.commit()
+
+
+async def main(args: argparse.Namespace) -> None:
+    counter = QueryCounter()
+    moves = [(random.randrange(args.cards), random.randrange(args.cards)) for _ in range(args.moves)]
+
+    async with rollback_session() as session:
+        legacy_list, legacy_ids = await seed_list(session, args.cards, 1)
+        fractional_list, fractional_ids = await seed_list(session, args.cards, POSITION_STEP)
+        repository = CardRepository(session)
+
+        async def run_legacy():
+            for card_index, new_position in moves:
+                card = await repository.get_one(id=legacy_ids[card_index])
+                await legacy_move(session, card, new_position)
+
+        async def run_fractional():
+            for card_index, new_position in moves:
+                await repository.move_card(fractional_ids[card_index], fractional_list.id, new_position)
+
+        for name, func in (("integer shifting", run_legacy), ("fractional positions", run_fractional)):
+            with counter.count():
+                samples = await measure(func, 1)
+            print(f"{name:<28} rows written per move={counter.rows_written / args.moves:10.1f}")
+            report(f"{name} ({args.moves} moves)", samples, counter.total)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cards", type=int, default=2000)
+    parser.add_argument("--moves", type=int, default=200)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,110 @@
+"""
+Cards serialized per second for GET /cards?list_id=: the legacy path (CardWithAssignee(**card.__dict__)
+per card, then FastAPI response_model validation and JSONResponse), bulk from_attributes validation with
+a cached TypeAdapter encoded by orjson or pydantic-core, and card_list_serializer (no validation, orjson).
+
+CPU only, no database needed:
+    python -m benchmarks.card_serialization --cards 2000 --iterations 50
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime
+from typing import List
+
+import orjson
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from pydantic import TypeAdapter
+from sqlalchemy.orm import configure_mappers
+from sqlalchemy.orm.attributes import set_committed_value
+
+from src.models import Card, User
+from src.schemas.card import CardWithAssignee, card_list_serializer
+
+from .common import percentile
+
+
+def make_cards(count: int) -> list[Card]:
+    """Detached cards shaped like CardRepository.get_list_cards results (assignee loaded, comments not)."""
+    configure_mappers()
+    now = datetime.utcnow()
+    assignee = User(id=1, email="owner@bench.io", username="owner", full_name="Owner", is_active=True)
+    cards = []
+    for number in range(1, count + 1):
+        card = Card(
+            id=number,
+            card_id=number,
+            list_id=1,
+            title=f"Card {number}",
+            description="Lorem ipsum dolor sit amet " * 3,
+            position=float(number),
+            card_color="#61bd4f" if number % 2 else None,
+            assignee_id=1 if number % 3 == 0 else None,
+            created_at=now,
+            updated_at=now,
+        )
+        set_committed_value(card, "assignee", assignee if card.assignee_id else None)
+        # noload(Card.comments): the bulk adapters would otherwise lazy-load comments per card
+        set_committed_value(card, "comments", [])
+        cards.append(card)
+    return cards
+
+
+async def main(args: argparse.Namespace) -> None:
+    cards = make_cards(args.cards)
+    card_list_adapter = TypeAdapter(List[CardWithAssignee])
+    response_field = create_model_field(name="Response_get_cards", type_=List[CardWithAssignee], mode="serialization")
+
+    async def legacy() -> bytes:
+        result = [CardWithAssignee(**card.__dict__, formatted_id=f"TA-{card.card_id}") for card in cards]
+        content = await serialize_response(field=response_field, response_content=result)
+        return JSONResponse(content).body
+
+    def set_formatted_ids() -> None:
+        for card in cards:
+            card.formatted_id = f"TA-{card.card_id}"
+
+    async def adapter_orjson() -> bytes:
+        set_formatted_ids()
+        validated = card_list_adapter.validate_python(cards, from_attributes=True)
+        return ORJSONResponse(card_list_adapter.dump_python(validated, mode="json")).body
+
+    async def adapter_dump_json() -> bytes:
+        set_formatted_ids()
+        return card_list_adapter.dump_json(card_list_adapter.validate_python(cards, from_attributes=True))
+
+    async def serializer() -> bytes:
+        return orjson.dumps([card_list_serializer.to_dict(card, formatted_id=f"TA-{card.card_id}") for card in cards])
+
+    runs = (
+        ("legacy response_model", legacy),
+        ("adapter + orjson", adapter_orjson),
+        ("adapter dump_json", adapter_dump_json),
+        ("card_list_serializer", serializer),
+    )
+
+    def decoded(body: bytes) -> list[dict]:
+        # comments are not loaded: the serializer sends null, the adapters the empty noload list
+        return [{**card, "comments": None} for card in orjson.loads(body)]
+
+    expected = decoded(await legacy())
+    for name, func in runs:
+        assert decoded(await func()) == expected, name
+        samples = []
+        for _ in range(args.iterations):
+            started = time.perf_counter()
+            await func()
+            samples.append(time.perf_counter() - started)
+        print(
+            f"{name:<28} cards/s={args.cards / percentile(samples, 50):>10,.0f} "
+            f"p50={percentile(samples, 50) * 1000:8.2f}ms p95={percentile(samples, 95) * 1000:8.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cards", type=int, default=2000, help="cards in the list")
+    parser.add_argument("--iterations", type=int, default=50)
+    asyncio.run(main(parser.parse_args()))
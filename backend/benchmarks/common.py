@@ -0,0 +1,78 @@
+"""
+Shared helpers for benchmarks: SQL round-trip counting and latency percentiles.
+
+Benchmarks run from the backend directory against the database configured in .env:
+    python -m benchmarks.<name>
+"""
+import statistics
+import time
+from contextlib import asynccontextmanager, contextmanager
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from src.db.session import engine
+
+
+class QueryCounter:
+    """Counts SQL statements (round trips) and rows written by the engine."""
+
+    def __init__(self, async_engine: AsyncEngine = engine):
+        self.engine = async_engine.sync_engine
+        self.statements: list[str] = []
+        self.rows_written = 0
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+        if statement.lstrip().upper().startswith(("INSERT", "UPDATE", "DELETE")):
+            self.rows_written += max(cursor.rowcount, 0)
+
+    @contextmanager
+    def count(self):
+        self.statements.clear()
+        self.rows_written = 0
+        event.listen(self.engine, "after_cursor_execute", self._on_execute)
+        try:
+            yield self
+        finally:
+            event.remove(self.engine, "after_cursor_execute", self._on_execute)
+
+    @property
+    def total(self) -> int:
+        return len(self.statements)
+
+
+@asynccontextmanager
+async def rollback_session():
+    """Session whose changes (including repository commits) are rolled back when the benchmark ends."""
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+        session = AsyncSession(bind=conn, expire_on_commit=False, join_transaction_mode="create_savepoint")
+        try:
+            yield session
+        finally:
+            await session.close()
+            await transaction.rollback()
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    if len(samples) < 2:
+        return samples[0] if samples else 0.0
+    return statistics.quantiles(samples, n=100, method="inclusive")[int(pct) - 1]
+
+
+async def measure(func, iterations: int) -> list[float]:
+    """Await func() `iterations` times and return latencies in milliseconds."""
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def report(name: str, samples: list[float], queries: int) -> None:
+    print(
+        f"{name:<28} queries={queries:<4} "
+        f"p50={percentile(samples, 50):8.2f}ms p95={percentile(samples, 95):8.2f}ms"
+    )
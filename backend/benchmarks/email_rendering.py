@@ -0,0 +1,87 @@
+"""
+Notification emails rendered per second: the per-call get_template path the tasks used
+before vs the preloaded EmailRenderer, for single notifications and digests.
+
+    python -m benchmarks.email_rendering --messages 2000 --digest-size 10
+"""
+import argparse
+import tempfile
+import time
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+from jinja2 import Environment, FileSystemLoader
+
+from src.core.config import settings
+from src.core.email_templates import NOTIFICATION_TEMPLATE, TEMPLATE_DIR, EmailRenderer
+
+
+def notification(i: int, comment: bool = False) -> dict:
+    data = {
+        "email": f"user{i}@bench.io",
+        "username": f"user{i}",
+        "card_title": f"Card {i}",
+        "task_id": f"BN-{i}",
+        "editor_username": "bench",
+        "board_id": 1,
+    }
+    if comment:
+        data["comment_text"] = "Looks good, merging after review"
+    return data
+
+
+def legacy_build(jinja_env: Environment, data: dict) -> MIMEMultipart:
+    """What send_email / send_comment_notification did for every message before the renderer."""
+    template = jinja_env.get_template(NOTIFICATION_TEMPLATE)
+    notification_type = "comment" if data.get("comment_text") else None
+    html_content = template.render(frontend_url=settings.FRONTEND_URL, notification_type=notification_type, **data)
+    msg = MIMEMultipart()
+    msg["From"] = settings.SMTP_LOGIN
+    msg["To"] = data["email"]
+    if notification_type:
+        msg["Subject"] = f"Новый комментарий к карточке '{data['card_title']}' в TaskFlow"
+    else:
+        msg["Subject"] = f"Обновление карточки '{data['card_title']}' в TaskFlow"
+    msg.attach(MIMEText(html_content, "html", "utf-8"))
+    return msg
+
+
+def rate(func, count: int) -> float:
+    started = time.perf_counter()
+    func()
+    return count / (time.perf_counter() - started)
+
+
+def main(args: argparse.Namespace) -> None:
+    notifications = [notification(i, comment=i % 3 == 0) for i in range(args.messages)]
+    digests = [
+        [notification(i, comment=j % 3 == 0) for j in range(args.digest_size)]
+        for i in range(args.messages // args.digest_size)
+    ]
+
+    started = time.perf_counter()
+    jinja_env = Environment(loader=FileSystemLoader(TEMPLATE_DIR))
+    jinja_env.get_template(NOTIFICATION_TEMPLATE)
+    print(f"{'compile on startup':<28} {(time.perf_counter() - started) * 1000:8.2f}ms")
+    with tempfile.TemporaryDirectory() as cache_dir:
+        EmailRenderer(bytecode_cache_dir=cache_dir)
+        started = time.perf_counter()
+        renderer = EmailRenderer(bytecode_cache_dir=cache_dir)
+        print(f"{'load from bytecode cache':<28} {(time.perf_counter() - started) * 1000:8.2f}ms")
+
+    runs = (
+        ("get_template per message", lambda: [legacy_build(jinja_env, n) for n in notifications], len(notifications)),
+        ("preloaded renderer", lambda: [renderer.build_notification(**n) for n in notifications], len(notifications)),
+        ("renderer build_many", lambda: renderer.build_many(notifications), len(notifications)),
+        (f"digests of {args.digest_size}", lambda: [renderer.build_digest(d) for d in digests], len(digests)),
+    )
+    for name, func, count in runs:
+        func()
+        print(f"{name:<28} messages/s={rate(func, count):10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--digest-size", type=int, default=10)
+    main(parser.parse_args())
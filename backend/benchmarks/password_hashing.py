@@ -0,0 +1,68 @@
+"""
+Event-loop latency of unrelated requests during a login storm: bcrypt on the loop vs in the hashing pool.
+
+A probe coroutine sleeps for 1ms in a loop and records how late it wakes up, which is
+the delay every other request on the worker would see. Meanwhile `--logins` concurrent
+password verifications run either inline (as authenticate did before) or through
+verify_password_async. No database is needed.
+
+    python -m benchmarks.password_hashing --logins 50
+"""
+import argparse
+import asyncio
+import time
+
+from src.core.security import get_password_hash, verify_password, verify_password_async
+
+from .common import percentile
+
+
+PROBE_INTERVAL = 0.001
+
+
+async def probe(lags: list[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append((time.perf_counter() - started - PROBE_INTERVAL) * 1000)
+
+
+async def inline_login(password: str, hashed: str) -> None:
+    await asyncio.sleep(0)
+    verify_password(password, hashed)
+
+
+async def pooled_login(password: str, hashed: str) -> None:
+    await asyncio.sleep(0)
+    await verify_password_async(password, hashed)
+
+
+async def storm(login, logins: int, password: str, hashed: str) -> tuple[list[float], float]:
+    lags: list[float] = []
+    stop = asyncio.Event()
+    probe_task = asyncio.create_task(probe(lags, stop))
+    await asyncio.sleep(0.05)
+    started = time.perf_counter()
+    await asyncio.gather(*(login(password, hashed) for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await probe_task
+    return lags, elapsed
+
+
+async def main(args: argparse.Namespace) -> None:
+    password = "correct horse battery staple"
+    hashed = get_password_hash(password)
+
+    for name, login in (("bcrypt on event loop", inline_login), ("bcrypt in hashing pool", pooled_login)):
+        lags, elapsed = await storm(login, args.logins, password, hashed)
+        print(
+            f"{name:<28} logins/s={args.logins / elapsed:8.1f} "
+            f"loop lag p50={percentile(lags, 50):8.2f}ms p99={percentile(lags, 99):8.2f}ms max={max(lags):8.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=50)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,113 @@
+"""
+Notification throughput: a new SMTP session per message (as the tasks did before)
+vs the pooled connection vs send_emails_batch over one session.
+
+Runs against a minimal in-process SMTP stand-in that answers every command after
+`--latency` ms, which models the round trip to a remote relay. The stand-in has no
+TLS or AUTH, so the per-message handshake cost measured here is a lower bound:
+in production every new session also pays STARTTLS and LOGIN.
+
+    python -m benchmarks.smtp_throughput --messages 200 --latency 5
+"""
+import argparse
+import asyncio
+import smtplib as smtp
+import threading
+import time
+
+from src.core.email_templates import email_renderer
+from src.core.smtp import SMTPConnectionPool
+
+
+class StandInSMTPServer:
+    """Accepts any mail and discards it, replying to each command after a fixed delay."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.received = 0
+        self.sessions = 0
+        self.loop = asyncio.new_event_loop()
+        self.port: int | None = None
+
+    async def _reply(self, writer: asyncio.StreamWriter, line: str) -> None:
+        await asyncio.sleep(self.latency)
+        writer.write(f"{line}\r\n".encode())
+        await writer.drain()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.sessions += 1
+        await self._reply(writer, "220 stand-in ESMTP")
+        while line := await reader.readline():
+            command = line.decode(errors="replace").strip().upper()
+            if command.startswith(("EHLO", "HELO")):
+                await self._reply(writer, "250 stand-in")
+            elif command == "DATA":
+                await self._reply(writer, "354 End data with <CR><LF>.<CR><LF>")
+                while (await reader.readline()) not in (b".\r\n", b""):
+                    pass
+                self.received += 1
+                await self._reply(writer, "250 OK")
+            elif command == "QUIT":
+                await self._reply(writer, "221 Bye")
+                break
+            else:
+                await self._reply(writer, "250 OK")
+        writer.close()
+
+    def start(self) -> None:
+        started = threading.Event()
+
+        async def serve():
+            server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+            self.port = server.sockets[0].getsockname()[1]
+            started.set()
+            async with server:
+                await server.serve_forever()
+
+        threading.Thread(target=self.loop.run_until_complete, args=(serve(),), daemon=True).start()
+        started.wait()
+
+
+def send_per_message(port: int, messages) -> None:
+    """What send_email did before: connect, greet and quit for every message."""
+    for message in messages:
+        with smtp.SMTP("127.0.0.1", port) as server:
+            server.ehlo()
+            server.send_message(message)
+
+
+def main(args: argparse.Namespace) -> None:
+    server = StandInSMTPServer(args.latency / 1000)
+    server.start()
+    pool = SMTPConnectionPool("127.0.0.1", server.port, starttls=False)
+    messages = [
+        email_renderer.build_notification(f"user{i}@bench.io", f"user{i}", f"Card {i}", f"BN-{i}", "bench", 1)
+        for i in range(args.messages)
+    ]
+
+    def pooled():
+        for message in messages:
+            pool.send(message)
+
+    runs = (
+        ("new session per message", lambda: send_per_message(server.port, messages)),
+        ("pooled connection", pooled),
+        ("send_emails_batch", lambda: pool.send_many(messages)),
+    )
+    for name, func in runs:
+        sessions = server.sessions
+        started = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - started
+        print(
+            f"{name:<28} messages/s={len(messages) / elapsed:8.1f} "
+            f"sessions opened={server.sessions - sessions}"
+        )
+    pool.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=5, help="stand-in reply delay, ms")
+    main(parser.parse_args())
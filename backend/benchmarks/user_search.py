@@ -0,0 +1,80 @@
+"""
+Share dialog user search at --users users: the legacy ILIKE (a sequential scan, with the current
+user filtered out in Python after LIMIT) vs search_users served by the pg_trgm GIN indexes.
+The counts in parentheses show how many users each search returned.
+
+Users are generated server-side with generate_series and rolled back at the end; the trigram
+indexes must exist in the database (alembic upgrade head).
+
+    python -m benchmarks.user_search --users 1000000 --iterations 50
+"""
+import argparse
+import asyncio
+
+from sqlalchemy import or_, select, text
+
+from src.models import User
+from src.repositories import UserRepository
+
+from .common import QueryCounter, measure, report, rollback_session
+
+
+# Keystrokes typed into the share dialog: short prefixes, a full username, an email fragment, a miss
+QUERIES = ("us", "user12", "user123456", "bench.io", "nobody-here")
+
+
+async def seed(session, users: int) -> int:
+    await session.execute(
+        text(
+            """
+            INSERT INTO "user" (email, username, hashed_password, full_name, is_active, is_superuser,
+                                created_at, updated_at)
+            SELECT 'user' || i || '@bench.io', 'user' || i, '-', 'Bench User ' || i, true, false, now(), now()
+            FROM generate_series(1, :users) AS i
+            """
+        ),
+        {"users": users},
+    )
+    await session.execute(text('ANALYZE "user"'))
+    return (await session.execute(select(User.id).where(User.username == "user1"))).scalar_one()
+
+
+async def main(args: argparse.Namespace) -> None:
+    counter = QueryCounter()
+    async with rollback_session() as session:
+        current_user_id = await seed(session, args.users)
+        repository = UserRepository(session)
+
+        async def legacy(query: str):
+            pattern = f"%{query}%"
+            stmt = (
+                select(User)
+                .filter(or_(User.username.ilike(pattern), User.email.ilike(pattern), User.full_name.ilike(pattern)))
+                .limit(args.limit)
+            )
+            # Without the trigram indexes, as before the migration: the planner can only scan the table
+            await session.execute(text("SET LOCAL enable_bitmapscan = off"))
+            users = (await session.execute(stmt)).scalars().all()
+            await session.execute(text("SET LOCAL enable_bitmapscan = on"))
+            session.expunge_all()
+            return [user for user in users if user.id != current_user_id]
+
+        async def trigram(query: str):
+            users = await repository.search_users(query, args.limit, current_user_id)
+            session.expunge_all()
+            return users
+
+        for query in QUERIES:
+            for name, search in (("legacy ILIKE", legacy), ("pg_trgm search_users", trigram)):
+                with counter.count():
+                    found = len(await search(query))
+                samples = await measure(lambda: search(query), args.iterations)
+                report(f"{name} {query!r} ({found})", samples, counter.total)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--iterations", type=int, default=50)
+    asyncio.run(main(parser.parse_args()))
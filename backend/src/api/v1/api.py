@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from src.api.v1 import auth, boards, cards, lists, users
+from src.api.v1 import auth, boards, cards, lists, users, ws
 
 api_router = APIRouter()
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
@@ -8,3 +8,4 @@ api_router.include_router(users.router, prefix="/users", tags=["users"])
 api_router.include_router(boards.router, prefix="/boards", tags=["boards"])
 api_router.include_router(lists.router, prefix="/lists", tags=["lists"])
 api_router.include_router(cards.router, prefix="/cards", tags=["cards"])
+api_router.include_router(ws.router, prefix="/ws", tags=["ws"])
@@ -9,6 +9,7 @@ from src.services import UserService, ServiceFactory
 from src.core.config import settings
 from src.core.deps import get_current_active_user, get_user_from_refresh_token
 from src.core.security import create_access_token, create_refresh_token, delete_auth_cookies, set_auth_cookies
+from src.core.principal import Principal
 from src.models.user import User
 from src.schemas.token import Token
 from src.schemas.user import UserCreate, UserInDBBase, UserProfileUpdate
@@ -101,7 +102,7 @@ async def logout(response: Response) -> Any:
 
 @router.get("/me", response_model=UserInDBBase)
 async def get_current_user_info(
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
 ) -> Any:
     """
     Get current user information.
@@ -114,7 +115,7 @@ async def update_profile(
     *,
     profile_update: UserProfileUpdate,
     service_factory: ServiceFactory = Depends(get_sqlalchemy_service_factory),
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
 ) -> Any:
     """
     Update current user profile.
@@ -122,7 +123,7 @@ async def update_profile(
     try:
         service = service_factory.create_user_service()
         updated_user = await service.update_user_profile(
-            current_user=current_user, profile_update=profile_update
+            principal=current_user, profile_update=profile_update
         )
         return updated_user
     except Exception as e:
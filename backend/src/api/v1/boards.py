@@ -1,21 +1,28 @@
-from typing import Any, List
+from typing import Any, List, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from services import UserService, BoardService, BoardShareService, ServiceFactory
 from src.core.deps import get_sqlalchemy_service_factory
 from src.core import deps
-from src.models.user import User
+from src.core.etag import board_etag, etag_matches, not_modified, set_etag
+from src.core.snapshot_cache import board_snapshot_cache
+from src.core.events import publish_board_event
+from src.core.formatting import generate_board_prefix
+from src.core.principal import Principal
 from src.schemas.board import (
+    BoardChanges,
     BoardCreate,
     BoardInDBBase,
     BoardShareCreate,
     BoardShareInfo,
     BoardShareUpdate,
+    BoardSnapshot,
     BoardUpdate,
     BoardWithLists,
 )
+from src.schemas.card import CardWithAssignee
 
 router = APIRouter()
 
@@ -23,33 +30,28 @@ router = APIRouter()
 @router.get("/", response_model=List[BoardWithLists])
 async def get_boards(
     *,
-    current_user: User = Depends(deps.get_current_active_user),
+    skip: int = Query(0, ge=0, description="Number of boards to skip"),
+    limit: Optional[int] = Query(None, ge=1, le=200, description="Maximum number of boards to return"),
+    sort: Optional[Literal["updated_at", "-updated_at"]] = Query(None, description="Sort by last update"),
+    current_user: Principal = Depends(deps.get_current_active_user),
     service_factory: ServiceFactory = Depends(get_sqlalchemy_service_factory),
 ) -> Any:
     """
-    Get all boards for the current user.
+    Get all boards owned by or shared with the current user.
     """
     board_service = service_factory.create_board_service()
-    board_share_service = service_factory.create_board_share_service()
-
-    owned_boards = await board_service.get_boards(current_user.id)
-    shared_boards_access = await board_share_service.get_shared_boards_for_user(current_user.id)
 
-    shared_boards = []
-    for share in shared_boards_access:
-        board = await board_service.get_board(share.board_id)
-        if board:
-            shared_boards.append(board)
-
-    all_boards = owned_boards + shared_boards
-    return all_boards
+    return [
+        BoardWithLists(**board.__dict__, access_type=access_type)
+        for board, access_type in await board_service.get_boards(current_user.id, skip, limit, sort)
+    ]
 
 
 @router.post("/", response_model=BoardInDBBase)
 async def create_board(
     *,
     board_in: BoardCreate,
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
     service_factory: ServiceFactory = Depends(get_sqlalchemy_service_factory),
 ) -> Any:
     """
@@ -59,27 +61,90 @@ async def create_board(
     return await service.create_board(board_in, current_user.id)
 
 
-@router.get("/{board_id}", response_model=BoardWithLists)
+@router.get("/snapshot-cache/stats")
+async def get_snapshot_cache_stats(
+    *,
+    current_user: Principal = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Hit rate and average latency of board snapshot reads served by this worker (cache hits vs DB loads).
+    """
+    return board_snapshot_cache.stats.as_dict()
+
+
+@router.get("/{board_id}", response_model=BoardSnapshot)
 async def get_board(
     *,
     board_id: int,
-    current_user: User = Depends(deps.get_current_active_user),
+    request: Request,
+    current_user: Principal = Depends(deps.get_current_active_user),
     service_factory: ServiceFactory = Depends(get_sqlalchemy_service_factory),
 ) -> Any:
     """
-    Get a specific board by id.
+    Get a specific board by id with its ordered lists, cards and the caller's access type.
+    Answers 304 without loading the board tree when If-None-Match has the current ETag;
+    otherwise the encoded snapshot of the current board version is served from board_snapshot_cache.
     """
     board_service = service_factory.create_board_service()
-    list_service = service_factory.create_list_service()
-    board_share_service = service_factory.create_board_share_service()
-    
-    board = await board_service.get_board(board_id)
-    if not board:
+
+    if not (board_version := await board_service.get_board_version(board_id, current_user.id)):
         raise HTTPException(status_code=404, detail="Board not found")
 
-    await deps.check_board_access(board, current_user, ["read", "write", "admin"], board_share_service)
-    board.lists = await list_service.get_board_lists(board_id, include_cards=True)
-    return board
+    access_type = board_version.access_type
+    deps.check_access_type(access_type, ["read", "write", "admin"])
+    etag = board_etag(board_id, board_version.version, board_version.updated_at, access_type)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    async def load_snapshot() -> bytes | None:
+        if not (snapshot := await board_service.get_board_snapshot(board_id, current_user.id)):
+            return None
+
+        # access_type is excluded from the cached payload and added per request (see with_access_type)
+        board, _ = snapshot
+        board_snapshot = BoardSnapshot(**board.__dict__, access_type=access_type)
+        board_prefix = generate_board_prefix(board.title)
+        for board_list in board_snapshot.lists:
+            for card in board_list.cards:
+                card.formatted_id = f"{board_prefix}-{card.card_id}"
+        return board_snapshot.model_dump_json(exclude={"access_type"}).encode()
+
+    payload = await board_snapshot_cache.get_or_load(board_id, board_version.version, load_snapshot)
+    if payload is None:
+        raise HTTPException(status_code=404, detail="Board not found")
+
+    response = Response(board_snapshot_cache.with_access_type(payload, access_type), media_type="application/json")
+    set_etag(response, etag)
+    return response
+
+
+@router.get("/{board_id}/changes", response_model=BoardChanges)
+async def get_board_changes(
+    *,
+    board_id: int,
+    since: int = Query(0, ge=0, description="Board version the client already has"),
+    current_user: Principal = Depends(deps.get_current_active_user),
+    service_factory: ServiceFactory = Depends(get_sqlalchemy_service_factory),
+) -> Any:
+    """
+    Lists, cards and comments changed after the `since` version of the board, with tombstones of deleted ones.
+    The returned `version` is the cursor for the next call (the initial one comes with GET /boards/{id}).
+    """
+    board_service = service_factory.create_board_service()
+
+    if not (board_access := await board_service.get_board_with_access(board_id, current_user.id)):
+        raise HTTPException(status_code=404, detail="Board not found")
+
+    board, access_type = board_access
+    deps.check_access_type(access_type, ["read", "write", "admin"])
+
+    # The version is read before the changes: rows committed in between are sent again next time, never lost
+    version = board.version
+    lists, cards, comments, deleted = await board_service.get_board_changes(board.id, since)
+
+    board_prefix = generate_board_prefix(board.title)
+    cards = [CardWithAssignee(**card.__dict__, formatted_id=f"{board_prefix}-{card.card_id}") for card in cards]
+    return {"version": version, "lists": lists, "cards": cards, "comments": comments, "deleted": deleted}
 
 
 @router.put("/{board_id}", response_model=BoardInDBBase)
@@ -87,7 +152,7 @@ async def update_board(
     *,
     board_id: int,
     board_in: BoardUpdate,
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
     service_factory: ServiceFactory = Depends(get_sqlalchemy_service_factory),
 ) -> Any:
     """
@@ -102,28 +167,29 @@ async def update_board(
 
     await deps.check_board_access(board, current_user, ["write", "admin"], board_share_service)
 
-    return await service.update_board(board, board_in)
+    async with service_factory.unit_of_work():
+        board = await service.update_board(board, board_in)
+    await publish_board_event(board.id, "board.updated", BoardInDBBase.model_validate(board).model_dump(mode="json"))
+    return board
 
 
 @router.delete("/{board_id}")
 async def delete_board(
     *,
     board_id: int,
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
     service_factory: ServiceFactory = Depends(get_sqlalchemy_service_factory),
 ) -> Any:
     """
     Delete a board.
     """
     service = service_factory.create_board_service()
-    board_share_service = service_factory.create_board_share_service()
-    
-    board = await service.get_board(board_id)
-    if not board:
-        raise HTTPException(status_code=404, detail="Board not found")
-    await deps.check_board_access(board, current_user, ["admin"], board_share_service)
 
-    await service.delete_board(board_id)
+    await deps.require_board_access(board_id, current_user, ["admin"], service_factory)
+
+    async with service_factory.unit_of_work():
+        await service.delete_board(board_id)
+    await publish_board_event(board_id, "board.deleted", {"id": board_id})
     return {"message": "Board deleted successfully"}
 
 
@@ -131,7 +197,7 @@ async def delete_board(
 async def get_board_shares(
     *,
     board_id: int,
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
     service_factory: ServiceFactory = Depends(get_sqlalchemy_service_factory),
 ) -> Any:
     """
@@ -170,20 +236,16 @@ async def create_board_share(
     *,
     board_id: int,
     board_share_in: BoardShareCreate,
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
     service_factory: ServiceFactory = Depends(get_sqlalchemy_service_factory),
 ) -> Any:
     """
     Share a board with another user.
     """
     user_service = service_factory.create_user_service()
-    board_service = service_factory.create_board_service()
     board_share_service = service_factory.create_board_share_service()
 
-    if not (board := await board_service.get_board(board_id)):
-        raise HTTPException(status_code=404, detail="Board not found")
-
-    await deps.check_board_access(board, current_user, ["admin"], board_share_service)
+    await deps.require_board_access(board_id, current_user, ["admin"], service_factory)
 
     if not (user := await user_service.get_user_by_id(board_share_in.user_id)):
         raise HTTPException(status_code=404, detail="User not found")
@@ -194,7 +256,11 @@ async def create_board_share(
     if await board_share_service.get_board_share(board_id, user.id):
         raise HTTPException(status_code=400, detail="User already has access to this board")
 
-    board_share = await board_share_service.create_board_share(board_share_in)
+    async with service_factory.unit_of_work():
+        board_share = await board_share_service.create_board_share(board_share_in)
+    await publish_board_event(
+        board_share.board_id, "share.created", {"user_id": user.id, "access_type": board_share.access_type}
+    )
 
     return {"id": board_share.id, "access_type": board_share.access_type, "user": user}
 
@@ -205,20 +271,16 @@ async def update_board_share(
     board_id: int,
     user_id: int,
     board_share_in: BoardShareUpdate,
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
     service_factory: ServiceFactory = Depends(get_sqlalchemy_service_factory),
 ) -> Any:
     """
     Update a board share (change access type).
     """
     user_service = service_factory.create_user_service()
-    board_service = service_factory.create_board_service()
     board_share_service = service_factory.create_board_share_service()
 
-    if not (board := await board_service.get_board(board_id)):
-        raise HTTPException(status_code=404, detail="Board not found")
-
-    await deps.check_board_access(board, current_user, ["admin"], board_share_service)
+    await deps.require_board_access(board_id, current_user, ["admin"], service_factory)
 
     board_share = await board_share_service.get_board_share(board_id, user_id)
     if not board_share:
@@ -227,7 +289,11 @@ async def update_board_share(
     if not (user := await user_service.get_user_by_id(user_id)):
         raise HTTPException(status_code=404, detail="User not found")
 
-    updated_share = await board_share_service.update_board_share(board_share, board_share_in)
+    async with service_factory.unit_of_work():
+        updated_share = await board_share_service.update_board_share(board_share, board_share_in)
+    await publish_board_event(
+        board_id, "share.updated", {"user_id": user_id, "access_type": updated_share.access_type}
+    )
 
     return {"id": updated_share.id, "access_type": updated_share.access_type, "user": user}
 
@@ -237,25 +303,22 @@ async def delete_board_share(
     *,
     board_id: int,
     user_id: int,
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
     service_factory: ServiceFactory = Depends(get_sqlalchemy_service_factory),
 ) -> Any:
     """
     Remove a user's access to a board.
     """
-    board_service = service_factory.create_board_service()
     board_share_service = service_factory.create_board_share_service()
 
-    board = await board_service.get_board(board_id)
-    if not board:
-        raise HTTPException(status_code=404, detail="Board not found")
-
-    await deps.check_board_access(board, current_user, ["admin"], board_share_service)
+    await deps.require_board_access(board_id, current_user, ["admin"], service_factory)
 
     board_share = await board_share_service.get_board_share(board_id, user_id)
     if not board_share:
         raise HTTPException(status_code=404, detail="Share not found")
 
-    await board_share_service.delete_board_share(board_share)
+    async with service_factory.unit_of_work():
+        await board_share_service.delete_board_share(board_share)
+    await publish_board_event(board_id, "share.deleted", {"user_id": user_id})
 
     return {"message": "Share removed successfully"}
@@ -1,85 +1,113 @@
 import pprint
 from typing import Any, List, Tuple, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core import deps
-from src.core.deps import check_board_access
-from src.models.user import User
-from src.schemas.card import CardCreate, CardUpdate, CardWithAssignee, MoveCard
-from src.schemas.comment import CommentCreate, CommentUpdate, CommentWithUser
-from src.tasks import send_comment_notification, send_email
+from src.core.deps import check_access_type
+from src.core.etag import board_etag, etag_matches, not_modified, set_etag
+from src.core.events import publish_board_event
+from src.core.formatting import format_task_id, generate_board_prefix
+from src.core.principal import Principal
+from src.schemas.card import (
+    BatchCreateCards,
+    BatchDeleteCards,
+    BatchMoveCards,
+    BatchUpdateCards,
+    CardCreate,
+    CardSearchResult,
+    CardUpdate,
+    CardWithAssignee,
+    MoveCard,
+    card_list_serializer,
+)
+from src.schemas.comment import CommentCreate, CommentInDBBase, CommentUpdate, CommentWithUser
+from src.schemas.user import UserInDBBase
 from src.services.factory import ServiceFactory
 
 router = APIRouter()
 
 
-def generate_board_prefix(board_title: str) -> str:
-    """
-    Generate board prefix from board title by taking first letter of each word.
-    Example: "Awesome Board" -> "AB"
-    """
-    if not board_title or not (words := board_title.split()):
-        return "TA"
-    return "".join(word[0].upper() for word in words)
-
-
 async def get_card_context(
     card_id: int,
     factory: ServiceFactory,
-    user: User,
+    user: Principal,
     required_access: List[str]
-) -> tuple[Any, Any, Any, str]:
-    """Get card context including card, list, board and formatted card ID."""
+) -> tuple[Any, Any, Any, str, str]:
+    """
+    Get card context including card, list, board, formatted card ID and the user's access type.
+    Card, list, board and access are resolved with a single query.
+    """
     card_service = factory.create_card_service()
-    list_service = factory.create_list_service()
-    board_service = factory.create_board_service()
-    board_share_service = factory.create_board_share_service()
-    if not (card := await card_service.get_card(card_id)):
+    if not (context := await card_service.get_card_with_access(card_id, user.id)):
         raise HTTPException(status_code=404, detail="Card not found")
 
-    if not (list_obj := await list_service.get_list(card.list_id)):
-        raise HTTPException(status_code=404, detail="List not found")
+    card, list_obj, board, access_type = context
+    check_access_type(access_type, required_access)
+
+    formatted_id = format_task_id(board.title, card.card_id)
+    return card, list_obj, board, formatted_id, access_type
 
-    if not (board := await board_service.get_board(list_obj.board_id)):
+
+async def get_board_context(board_id: int, factory: ServiceFactory, user: Principal, required_access: List[str]) -> Any:
+    """Get the board of a batch request, resolved together with the user's access type."""
+    board_service = factory.create_board_service()
+    if not (board_access := await board_service.get_board_with_access(board_id, user.id)):
         raise HTTPException(status_code=404, detail="Board not found")
 
-    await check_board_access(board, user, required_access, board_share_service)
-    
-    formatted_id = f"{generate_board_prefix(board.title)}-{card.card_id}"
-    return card, list_obj, board, formatted_id
+    board, access_type = board_access
+    check_access_type(access_type, required_access)
+    return board
 
 
-async def notify_assignee(
-    card: Any,
-    formatted_id: str,
-    current_user: User,
-    board_id: int,
+async def check_board_lists(
+    board_id: int, list_ids: set[int], factory: ServiceFactory, detail: str = "List not found"
+) -> None:
+    if await factory.create_list_service().get_board_list_ids(board_id, list_ids) != list_ids:
+        raise HTTPException(status_code=404, detail=detail)
+
+
+async def check_board_members(board_id: int, user_ids: set[int], factory: ServiceFactory) -> None:
+    """400 unless every user can access the board (cards are assigned to the owner or shared users only)."""
+    if await factory.create_board_share_service().get_board_member_ids(board_id, user_ids) != user_ids:
+        raise HTTPException(status_code=400, detail="Assignee has no access to the board")
+
+
+async def get_board_cards(board_id: int, card_ids: set[int], factory: ServiceFactory) -> dict:
+    """Map card id -> (id, list_id, assignee_id); 404 unless every card belongs to the board."""
+    board_cards = await factory.create_card_service().get_board_cards(board_id, card_ids)
+    if len(board_cards) != len(card_ids):
+        raise HTTPException(status_code=404, detail="Card not found")
+    return board_cards
+
+
+def serialize_cards(cards: List[Any], board_title: str) -> bytes:
+    board_prefix = generate_board_prefix(board_title)
+    return orjson.dumps(
+        [card_list_serializer.to_dict(card, formatted_id=f"{board_prefix}-{card.card_id}") for card in cards]
+    )
+
+
+def notify_assignee(
+    card_id: int,
+    assignee_id: Optional[int],
+    current_user: Principal,
     factory: ServiceFactory,
     comment_text: Optional[str] = None
 ) -> None:
-    """Notify card assignee about changes or comments."""
-    if not card.assignee_id or card.assignee_id == current_user.id:
-        return
-
-    user_service = factory.create_user_service()
-    if not (assignee := await user_service.get_user_by_id(card.assignee_id)):
+    """
+    Notify card assignee about changes or comments.
+    Must be called before the change is committed: the notification is written to the outbox
+    in the same transaction and published by the outbox relay after the commit.
+    """
+    if not assignee_id or assignee_id == current_user.id:
         return
 
-    notification_data = {
-        "email": assignee.email,
-        "username": assignee.username,
-        "card_title": card.title,
-        "task_id": formatted_id,
-        "editor_username": current_user.username,
-        "board_id": board_id,
-    }
-
-    if comment_text:
-        send_comment_notification.delay(**notification_data, comment_text=comment_text)
-    else:
-        send_email.delay(**notification_data)
+    factory.create_outbox_service().enqueue_card_notification(
+        card_id, current_user.id, current_user.username, comment_text
+    )
 
 
 async def get_card_with_assignee(
@@ -97,87 +125,183 @@ async def get_card_with_assignee(
 
 @router.get("/", response_model=List[CardWithAssignee])
 async def get_cards(
+    request: Request,
     list_id: int = Query(..., description="ID of the list"),
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
     factory: ServiceFactory = Depends(deps.get_sqlalchemy_service_factory),
-) -> list[CardWithAssignee]:
-    """Get all cards in a list."""
+) -> Any:
+    """
+    Get all cards in a list (304 when If-None-Match has the board's current ETag).
+    Cards are encoded by card_list_serializer directly, without response_model validation.
+    """
     list_service = factory.create_list_service()
-    board_service = factory.create_board_service()
     card_service = factory.create_card_service()
-    board_share_service = factory.create_board_share_service()
-    if not (list_obj := await list_service.get_list(list_id)):
+    if not (board := await list_service.get_list_board_version(list_id, current_user.id)):
         raise HTTPException(status_code=404, detail="List not found")
 
-    if not (board := await board_service.get_board(list_obj.board_id)):
-        raise HTTPException(status_code=404, detail="Board not found")
-
-    await check_board_access(board, current_user, ["read", "write", "admin"], board_share_service)
+    check_access_type(board.access_type, ["read", "write", "admin"])
+    etag = board_etag(board.board_id, board.version, board.updated_at, board.access_type)
+    if etag_matches(request, etag):
+        return not_modified(etag)
 
     cards = await card_service.get_list_cards(list_id)
-    board_prefix = generate_board_prefix(board.title)
+    response = Response(serialize_cards(cards, board.title), media_type="application/json")
+    set_etag(response, etag)
+    return response
 
-    result = []
-    for card in cards:
-        result.append(CardWithAssignee(**card.__dict__, formatted_id=f"{board_prefix}-{card.card_id}"))
-    return result
+
+@router.get("/search", response_model=List[CardSearchResult])
+async def search_cards(
+    q: str = Query(..., min_length=1, description="Search query (websearch syntax: words, \"phrases\", -excluded)"),
+    after: Optional[int] = Query(None, description="Return results following the card with this id"),
+    limit: int = Query(20, ge=1, le=100, description="Page size"),
+    current_user: Principal = Depends(deps.get_current_active_user),
+    factory: ServiceFactory = Depends(deps.get_sqlalchemy_service_factory),
+) -> Any:
+    """
+    Full-text search over titles and descriptions of cards on the boards the user owns or is shared on.
+    Results are ranked; pass the id of the last card as `after` to get the next page.
+    """
+    card_service = factory.create_card_service()
+    return [
+        CardSearchResult(
+            **card.__dict__,
+            formatted_id=format_task_id(board.title, card.card_id),
+            board_id=board.id,
+            board_title=board.title,
+        )
+        for card, board in await card_service.search_cards(current_user.id, q, limit, after)
+    ]
 
 
 @router.post("/", response_model=CardWithAssignee)
 async def create_card(
     card_in: CardCreate,
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
     factory: ServiceFactory = Depends(deps.get_sqlalchemy_service_factory),
 ) -> CardWithAssignee:
     """Create a new card."""
     list_service = factory.create_list_service()
-    board_service = factory.create_board_service()
     card_service = factory.create_card_service()
-    board_share_service = factory.create_board_share_service()
-    
-    if not (list_obj := await list_service.get_list(card_in.list_id)):
+
+    if not (list_context := await list_service.get_list_with_access(card_in.list_id, current_user.id)):
         raise HTTPException(status_code=404, detail="List not found")
 
-    if not (board := await board_service.get_board(list_obj.board_id)):
-        raise HTTPException(status_code=404, detail="Board not found")
+    _, board, access_type = list_context
+    check_access_type(access_type, ["write", "admin"])
 
-    await check_board_access(board, current_user, ["write", "admin"], board_share_service)
+    async with factory.unit_of_work():
+        card = await card_service.create_card(card_in, board.id)
+    formatted_id = format_task_id(board.title, card.card_id)
 
-    card = await card_service.create_card(card_in)
-    formatted_id = f"{generate_board_prefix(board.title)}-{card.card_id}"
-    
-    return await get_card_with_assignee(card, formatted_id, factory)
+    result = await get_card_with_assignee(card, formatted_id, factory)
+    await publish_board_event(board.id, "card.created", result.model_dump(mode="json"))
+    return result
+
+
+@router.post("/batch", response_model=List[CardWithAssignee])
+async def batch_create_cards(
+    cards_in: BatchCreateCards,
+    current_user: Principal = Depends(deps.get_current_active_user),
+    factory: ServiceFactory = Depends(deps.get_sqlalchemy_service_factory),
+) -> Any:
+    """Create cards of one board (imports) with one INSERT, appended to their lists in the order given."""
+    card_service = factory.create_card_service()
+    board = await get_board_context(cards_in.board_id, factory, current_user, ["write", "admin"])
+    await check_board_lists(board.id, {card_in.list_id for card_in in cards_in.cards}, factory)
+
+    async with factory.unit_of_work():
+        cards = await card_service.create_cards(cards_in.cards, board.id)
+
+    payload = serialize_cards(cards, board.title)
+    await publish_board_event(board.id, "cards.created", {"cards": orjson.loads(payload)})
+    return Response(payload, media_type="application/json")
+
+
+@router.put("/batch", response_model=List[CardWithAssignee])
+async def batch_update_cards(
+    cards_in: BatchUpdateCards,
+    current_user: Principal = Depends(deps.get_current_active_user),
+    factory: ServiceFactory = Depends(deps.get_sqlalchemy_service_factory),
+) -> Any:
+    """Update several cards of one board in one transaction."""
+    card_service = factory.create_card_service()
+    board = await get_board_context(cards_in.board_id, factory, current_user, ["write", "admin"])
+
+    board_cards = await get_board_cards(board.id, {card_in.id for card_in in cards_in.cards}, factory)
+    assignee_ids = {card_in.assignee_id for card_in in cards_in.cards if card_in.assignee_id is not None}
+    if assignee_ids:
+        await check_board_members(board.id, assignee_ids, factory)
+
+    async with factory.unit_of_work():
+        for card_in in cards_in.cards:
+            assignee_id = (
+                card_in.assignee_id
+                if "assignee_id" in card_in.model_fields_set
+                else board_cards[card_in.id].assignee_id
+            )
+            notify_assignee(card_in.id, assignee_id, current_user, factory)
+        cards = await card_service.update_cards(cards_in.cards, board.id)
+
+    payload = serialize_cards(cards, board.title)
+    await publish_board_event(board.id, "cards.updated", {"cards": orjson.loads(payload)})
+    return Response(payload, media_type="application/json")
+
+
+@router.post("/batch-delete")
+async def batch_delete_cards(
+    cards_in: BatchDeleteCards,
+    current_user: Principal = Depends(deps.get_current_active_user),
+    factory: ServiceFactory = Depends(deps.get_sqlalchemy_service_factory),
+) -> dict:
+    """Delete several cards of one board in one transaction."""
+    card_service = factory.create_card_service()
+    board = await get_board_context(cards_in.board_id, factory, current_user, ["write", "admin"])
+    board_cards = await get_board_cards(board.id, set(cards_in.card_ids), factory)
+
+    async with factory.unit_of_work():
+        await card_service.delete_cards(set(board_cards), board.id)
+    deleted = [{"id": card.id, "list_id": card.list_id} for card in board_cards.values()]
+    await publish_board_event(board.id, "cards.deleted", {"cards": deleted})
+    return {"message": "Cards deleted successfully"}
 
 
 @router.put("/{card_id}", response_model=CardWithAssignee)
 async def update_card(
     card_id: int,
     card_in: CardUpdate,
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
     factory: ServiceFactory = Depends(deps.get_sqlalchemy_service_factory),
 ) -> CardWithAssignee:
     """Update an existing card."""
     card_service = factory.create_card_service()
-    card, _, board, formatted_id = await get_card_context(
+    card, _, board, formatted_id, _ = await get_card_context(
         card_id, factory, current_user, ["write", "admin"]
     )
 
-    card = await card_service.update_card(card, card_in)
-    await notify_assignee(card, formatted_id, current_user, board.id, factory)
-    
-    return await get_card_with_assignee(card, formatted_id, factory)
+    assignee_id = card_in.assignee_id if "assignee_id" in card_in.model_fields_set else card.assignee_id
+    async with factory.unit_of_work():
+        notify_assignee(card.id, assignee_id, current_user, factory)
+        card = await card_service.update_card(card, card_in)
+
+    result = await get_card_with_assignee(card, formatted_id, factory)
+    await publish_board_event(board.id, "card.updated", result.model_dump(mode="json"))
+    return result
 
 
 @router.delete("/{card_id}")
 async def delete_card(
     card_id: int,
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
     factory: ServiceFactory = Depends(deps.get_sqlalchemy_service_factory),
 ) -> dict:
     """Delete a card."""
     card_service = factory.create_card_service()
-    await get_card_context(card_id, factory, current_user, ["write", "admin"])
-    await card_service.delete_card(card_id)
+    card, _, board, _, _ = await get_card_context(card_id, factory, current_user, ["write", "admin"])
+    list_id = card.list_id
+    async with factory.unit_of_work():
+        await card_service.delete_card(card_id)
+    await publish_board_event(board.id, "card.deleted", {"id": card_id, "list_id": list_id})
     return {"message": "Card deleted successfully"}
 
 
@@ -185,14 +309,14 @@ async def delete_card(
 async def move_card(
     card_id: int,
     move_data: MoveCard,
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
     factory: ServiceFactory = Depends(deps.get_sqlalchemy_service_factory),
 ) -> CardWithAssignee:
     """Move a card to a different list."""
     card_service = factory.create_card_service()
     list_service = factory.create_list_service()
     
-    card, source_list, board, formatted_id = await get_card_context(
+    card, source_list, board, formatted_id, _ = await get_card_context(
         card_id, factory, current_user, ["write", "admin"]
     )
 
@@ -202,57 +326,87 @@ async def move_card(
     if source_list.board_id != target_list.board_id:
         raise HTTPException(status_code=400, detail="Cannot move card between different boards")
 
-    if card.list_id != move_data.target_list_id:
-        await notify_assignee(card, formatted_id, current_user, board.id, factory)
+    async with factory.unit_of_work():
+        if card.list_id != move_data.target_list_id:
+            notify_assignee(card.id, card.assignee_id, current_user, factory)
+
+        card = await card_service.move_card(
+            card_id=card_id,
+            target_list_id=move_data.target_list_id,
+            new_position=move_data.new_position,
+        )
+
+    result = await get_card_with_assignee(card, formatted_id, factory)
+    await publish_board_event(board.id, "card.moved", result.model_dump(mode="json"))
+    return result
 
-    card = await card_service.move_card(
-        card_id=card_id,
-        target_list_id=move_data.target_list_id,
-        new_position=move_data.new_position,
-    )
-    
-    return await get_card_with_assignee(card, formatted_id, factory)
+
+@router.post("/batch-move", response_model=List[CardWithAssignee])
+async def batch_move_cards(
+    move_data: BatchMoveCards,
+    current_user: Principal = Depends(deps.get_current_active_user),
+    factory: ServiceFactory = Depends(deps.get_sqlalchemy_service_factory),
+) -> Any:
+    """Apply several card moves of one board (multi-select drag, list sorting) in one transaction."""
+    card_service = factory.create_card_service()
+    board = await get_board_context(move_data.board_id, factory, current_user, ["write", "admin"])
+
+    board_cards = await get_board_cards(board.id, {move.card_id for move in move_data.moves}, factory)
+    card_lists = {card_id: card.list_id for card_id, card in board_cards.items()}
+    target_list_ids = {move.target_list_id for move in move_data.moves}
+    await check_board_lists(board.id, target_list_ids, factory, "Target list not found")
+
+    final_lists = {move.card_id: move.target_list_id for move in move_data.moves}
+    async with factory.unit_of_work():
+        for card_id, list_id in final_lists.items():
+            if list_id != card_lists[card_id]:
+                notify_assignee(card_id, board_cards[card_id].assignee_id, current_user, factory)
+
+        cards = await card_service.batch_move_cards(move_data.moves, card_lists)
+
+    payload = serialize_cards(cards, board.title)
+    await publish_board_event(board.id, "cards.moved", {"cards": orjson.loads(payload)})
+    return Response(payload, media_type="application/json")
 
 
 @router.get("/{card_id}/comments", response_model=List[CommentWithUser])
 async def get_card_comments(
     card_id: int,
-    current_user: User = Depends(deps.get_current_active_user),
+    before: Optional[int] = Query(None, description="Return comments preceding the comment with this id"),
+    after: Optional[int] = Query(None, description="Return comments following the comment with this id"),
+    limit: int = Query(50, ge=1, le=200, description="Page size"),
+    current_user: Principal = Depends(deps.get_current_active_user),
     factory: ServiceFactory = Depends(deps.get_sqlalchemy_service_factory),
 ) -> List[CommentWithUser]:
-    """Get all comments for a card."""
-    user_service = factory.create_user_service()
+    """Get a page of card comments with their authors, ordered by creation time."""
     comment_service = factory.create_comment_service()
-    
-    await get_card_context(card_id, factory, current_user, ["read", "write", "admin"])
-    comments = await comment_service.get_card_comments(card_id)
-
-    for comment in comments:
-        comment.user = await user_service.get_user_by_id(comment.user_id)
+    if before is not None and after is not None:
+        raise HTTPException(status_code=400, detail="Use either before or after")
 
-    return comments
+    await get_card_context(card_id, factory, current_user, ["read", "write", "admin"])
+    return await comment_service.get_card_comments(card_id, limit, before, after)
 
 
 @router.post("/{card_id}/comments", response_model=CommentWithUser)
 async def create_comment(
     card_id: int,
     comment_in: CommentCreate,
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
     factory: ServiceFactory = Depends(deps.get_sqlalchemy_service_factory),
 ) -> CommentWithUser:
     """Create a new comment for a card."""
-    user_service = factory.create_user_service()
     comment_service = factory.create_comment_service()
 
-    card, _, board, formatted_id = await get_card_context(
-        card_id, factory, current_user, ["write", "admin"]
-    )
+    card, _, board, _, _ = await get_card_context(card_id, factory, current_user, ["write", "admin"])
 
-    comment = await comment_service.create_comment(comment_in, current_user.id)
-    comment.user = await user_service.get_user_by_id(comment.user_id)
-    
-    await notify_assignee(card, formatted_id, current_user, board.id, factory, comment_in.text)
-    return comment
+    async with factory.unit_of_work():
+        notify_assignee(card.id, card.assignee_id, current_user, factory, comment_in.text)
+        comment = await comment_service.create_comment(comment_in, current_user.id)
+    result = CommentWithUser(
+        **CommentInDBBase.model_validate(comment).model_dump(), user=UserInDBBase.model_validate(current_user)
+    )
+    await publish_board_event(board.id, "comment.created", result.model_dump(mode="json"))
+    return result
 
 
 @router.put("/{card_id}/comments/{comment_id}", response_model=CommentWithUser)
@@ -260,13 +414,11 @@ async def update_comment(
     card_id: int,
     comment_id: int,
     comment_in: CommentUpdate,
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
     factory: ServiceFactory = Depends(deps.get_sqlalchemy_service_factory),
 ) -> CommentWithUser:
-    user_service = factory.create_user_service()
     comment_service = factory.create_comment_service()
-    board_share_service = factory.create_board_share_service()
-    card, _, board, _ = await get_card_context(card_id, factory, current_user, ["read"])
+    card, _, board, _, access_type = await get_card_context(card_id, factory, current_user, ["read"])
 
     if not (comment := await comment_service.get_comment(comment_id)):
         raise HTTPException(status_code=404, detail="Comment not found")
@@ -275,10 +427,15 @@ async def update_comment(
         raise HTTPException(status_code=400, detail="Comment does not belong to this card")
 
     if comment.user_id != current_user.id:
-        await check_board_access(board, current_user, ["write", "admin"], board_share_service)
-
-    comment = await comment_service.update_comment(comment, comment_in)
-    comment.user = await user_service.get_user_by_id(comment.user_id)
+        check_access_type(access_type, ["write", "admin"])
+
+    author = comment.user
+    async with factory.unit_of_work():
+        comment = await comment_service.update_comment(comment, comment_in)
+    comment.user = author
+    await publish_board_event(
+        board.id, "comment.updated", CommentWithUser.model_validate(comment).model_dump(mode="json")
+    )
     return comment
 
 
@@ -286,14 +443,13 @@ async def update_comment(
 async def delete_comment(
     card_id: int,
     comment_id: int,
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
     factory: ServiceFactory = Depends(deps.get_sqlalchemy_service_factory),
 ) -> dict:
     """Delete a comment."""
     comment_service = factory.create_comment_service()
-    board_share_service = factory.create_board_share_service()
-    
-    card, _, board, _ = await get_card_context(card_id, factory, current_user, ["read"])
+
+    card, _, board, _, access_type = await get_card_context(card_id, factory, current_user, ["read"])
 
     if not (comment := await comment_service.get_comment(comment_id)):
         raise HTTPException(status_code=404, detail="Comment not found")
@@ -302,7 +458,9 @@ async def delete_comment(
         raise HTTPException(status_code=400, detail="Comment does not belong to this card")
 
     if comment.user_id != current_user.id:
-        await check_board_access(board, current_user, ["write", "admin"], board_share_service)
+        check_access_type(access_type, ["write", "admin"])
 
-    await comment_service.delete_comment(comment)
+    async with factory.unit_of_work():
+        await comment_service.delete_comment(comment)
+    await publish_board_event(board.id, "comment.deleted", {"id": comment_id, "card_id": card.id})
     return {"success": True}
@@ -1,10 +1,13 @@
 from typing import Any, List
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core import deps
-from src.models.user import User
+from src.core.etag import board_etag, etag_matches, not_modified, set_etag
+from src.core.events import publish_board_event
+from src.core.principal import Principal
+from src.schemas.board import BatchCreateLists, BatchDeleteLists, BatchUpdateLists
 from src.schemas.list import BoardListBase, BoardListUpdate, NewBoardListPosition, ResponseBoardList
 from src.services import ServiceFactory
 
@@ -16,23 +19,27 @@ router = APIRouter()
 async def get_lists(
     *,
     board_id: int = Query(..., description="ID of the board"),
-    current_user: User = Depends(deps.get_current_active_user),
+    request: Request,
+    response: Response,
+    current_user: Principal = Depends(deps.get_current_active_user),
     service_factory: ServiceFactory = Depends(deps.get_sqlalchemy_service_factory),
 
 ) -> Any:
     """
-    Get all lists for a board.
+    Get all lists for a board (304 when If-None-Match has the board's current ETag).
     """
-    board_service = service_factory.create_board_service()
     list_service = service_factory.create_list_service()
-    board_share_service = service_factory.create_board_share_service()
-    
-    board = await board_service.get_board(board_id)
-    if not board:
+    board_service = service_factory.create_board_service()
+
+    if not (board_version := await board_service.get_board_version(board_id, current_user.id)):
         raise HTTPException(status_code=404, detail="Board not found")
 
-    await deps.check_board_access(board, current_user, ["read", "write", "admin"], board_share_service)
+    deps.check_access_type(board_version.access_type, ["read", "write", "admin"])
+    etag = board_etag(board_id, board_version.version, board_version.updated_at, board_version.access_type)
+    if etag_matches(request, etag):
+        return not_modified(etag)
 
+    set_etag(response, etag)
     return await list_service.get_board_lists(board_id)
 
 
@@ -40,48 +47,108 @@ async def get_lists(
 async def create_list(
     *,
     list_in: BoardListBase,
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
     service_factory: ServiceFactory = Depends(deps.get_sqlalchemy_service_factory),
 ) -> Any:
     """
     Create a new list.
     """
-    board_service = service_factory.create_board_service()
     list_service = service_factory.create_list_service()
-    board_share_service = service_factory.create_board_share_service()
-    
-    board = await board_service.get_board(list_in.board_id)
-    if not board:
-        raise HTTPException(status_code=404, detail="Board not found")
 
-    await deps.check_board_access(board, current_user, ["write", "admin"], board_share_service)
+    await deps.require_board_access(list_in.board_id, current_user, ["write", "admin"], service_factory)
 
-    list_obj = await list_service.create_list(list_in)
+    async with service_factory.unit_of_work():
+        list_obj = await list_service.create_list(list_in)
+    await publish_board_event(
+        list_obj.board_id, "list.created", ResponseBoardList.model_validate(list_obj).model_dump(mode="json")
+    )
     return list_obj
 
 
+@router.post("/batch", response_model=List[ResponseBoardList])
+async def batch_create_lists(
+    *,
+    lists_in: BatchCreateLists,
+    current_user: Principal = Depends(deps.get_current_active_user),
+    service_factory: ServiceFactory = Depends(deps.get_sqlalchemy_service_factory),
+) -> Any:
+    """
+    Create several lists of a board with one INSERT, appended in the order given.
+    """
+    list_service = service_factory.create_list_service()
+
+    await deps.require_board_access(lists_in.board_id, current_user, ["write", "admin"], service_factory)
+
+    async with service_factory.unit_of_work():
+        lists = await list_service.create_lists(lists_in.lists, lists_in.board_id)
+    payload = [ResponseBoardList.model_validate(list_obj).model_dump(mode="json") for list_obj in lists]
+    await publish_board_event(lists_in.board_id, "lists.created", {"lists": payload})
+    return lists
+
+
+@router.put("/batch", response_model=List[ResponseBoardList])
+async def batch_update_lists(
+    *,
+    lists_in: BatchUpdateLists,
+    current_user: Principal = Depends(deps.get_current_active_user),
+    service_factory: ServiceFactory = Depends(deps.get_sqlalchemy_service_factory),
+) -> Any:
+    """
+    Update titles and colors of several lists of a board in one transaction.
+    """
+    list_service = service_factory.create_list_service()
+
+    await deps.require_board_access(lists_in.board_id, current_user, ["write", "admin"], service_factory)
+    list_ids = {list_in.id for list_in in lists_in.lists}
+    if await list_service.get_board_list_ids(lists_in.board_id, list_ids) != list_ids:
+        raise HTTPException(status_code=404, detail="List not found")
+
+    async with service_factory.unit_of_work():
+        lists = await list_service.update_lists(lists_in.lists, lists_in.board_id)
+    payload = [ResponseBoardList.model_validate(list_obj).model_dump(mode="json") for list_obj in lists]
+    await publish_board_event(lists_in.board_id, "lists.updated", {"lists": payload})
+    return lists
+
+
+@router.post("/batch-delete")
+async def batch_delete_lists(
+    *,
+    lists_in: BatchDeleteLists,
+    current_user: Principal = Depends(deps.get_current_active_user),
+    service_factory: ServiceFactory = Depends(deps.get_sqlalchemy_service_factory),
+) -> Any:
+    """
+    Delete several lists of a board with their cards in one transaction.
+    """
+    list_service = service_factory.create_list_service()
+
+    await deps.require_board_access(lists_in.board_id, current_user, ["admin"], service_factory)
+    list_ids = set(lists_in.list_ids)
+    if await list_service.get_board_list_ids(lists_in.board_id, list_ids) != list_ids:
+        raise HTTPException(status_code=404, detail="List not found")
+
+    async with service_factory.unit_of_work():
+        await list_service.delete_lists(list_ids, lists_in.board_id)
+    await publish_board_event(lists_in.board_id, "lists.deleted", {"ids": sorted(list_ids)})
+    return {"message": "Lists deleted successfully"}
+
+
 @router.get("/{list_id}", response_model=BoardListBase)
 async def get_list(
     *,
     list_id: int,
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
     service_factory: ServiceFactory = Depends(deps.get_sqlalchemy_service_factory),
 ) -> Any:
     """
     Get a specific list by id.
     """
     list_service = service_factory.create_list_service()
-    board_service = service_factory.create_board_service()
-    board_share_service = service_factory.create_board_share_service()
     list_obj = await list_service.get_list(list_id)
     if not list_obj:
         raise HTTPException(status_code=404, detail="List not found")
 
-    board = await board_service.get_board(list_obj.board_id)
-    if not board:
-        raise HTTPException(status_code=404, detail="Board not found")
-
-    await deps.check_board_access(board, current_user, ["read", "write", "admin"], board_share_service)
+    await deps.require_board_access(list_obj.board_id, current_user, ["read", "write", "admin"], service_factory)
 
     return list_obj
 
@@ -91,23 +158,21 @@ async def update_list(
     *,
     list_id: int,
     list_in: BoardListUpdate,
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
     service_factory: ServiceFactory = Depends(deps.get_sqlalchemy_service_factory),
 ) -> Any:
     list_service = service_factory.create_list_service()
-    board_service = service_factory.create_board_service()
-    board_share_service = service_factory.create_board_share_service()
     list_obj = await list_service.get_list(list_id)
     if not list_obj:
         raise HTTPException(status_code=404, detail="List not found")
 
-    board = await board_service.get_board(list_obj.board_id)
-    if not board:
-        raise HTTPException(status_code=404, detail="Board not found")
+    await deps.require_board_access(list_obj.board_id, current_user, ["write", "admin"], service_factory)
 
-    await deps.check_board_access(board, current_user, ["write", "admin"], board_share_service)
-
-    list_obj = await list_service.update_list(list_obj, list_in)
+    async with service_factory.unit_of_work():
+        list_obj = await list_service.update_list(list_obj, list_in)
+    await publish_board_event(
+        list_obj.board_id, "list.updated", ResponseBoardList.model_validate(list_obj).model_dump(mode="json")
+    )
     return list_obj
 
 
@@ -115,28 +180,21 @@ async def update_list(
 async def delete_list(
     *,
     list_id: int,
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
     service_factory: ServiceFactory = Depends(deps.get_sqlalchemy_service_factory),
 ) -> Any:
     list_service = service_factory.create_list_service()
-    board_service = service_factory.create_board_service()
-    board_share_service = service_factory.create_board_share_service()
     
     list_obj = await list_service.get_list(list_id)
     if not list_obj:
         raise HTTPException(status_code=404, detail="List not found")
 
-    board = await board_service.get_board(list_obj.board_id)
-    if not board:
-        raise HTTPException(status_code=404, detail="Board not found")
+    await deps.require_board_access(list_obj.board_id, current_user, ["admin"], service_factory)
 
-    board = await board_service.get_board(list_obj.board_id)
-    if not board:
-        raise HTTPException(status_code=404, detail="Board not found")
-
-    await deps.check_board_access(board, current_user, ["admin"], board_share_service)
-
-    await list_service.delete_list(list_obj)
+    board_id = list_obj.board_id
+    async with service_factory.unit_of_work():
+        await list_service.delete_list(list_id)
+    await publish_board_event(board_id, "list.deleted", {"id": list_id})
     return {"message": "List deleted successfully"}
 
 
@@ -145,21 +203,19 @@ async def reorder_list(
     *,
     list_id: int,
     position_in: NewBoardListPosition,
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
     service_factory: ServiceFactory = Depends(deps.get_sqlalchemy_service_factory),
 ) -> Any:
     list_service = service_factory.create_list_service()
-    board_service = service_factory.create_board_service()
-    board_share_service = service_factory.create_board_share_service()
     list_obj = await list_service.get_list(list_id)
     if not list_obj:
         raise HTTPException(status_code=404, detail="List not found")
 
-    board = await board_service.get_board(list_obj.board_id)
-    if not board:
-        raise HTTPException(status_code=404, detail="Board not found")
-
-    await deps.check_board_access(board, current_user, ["write", "admin"], board_share_service)
+    await deps.require_board_access(list_obj.board_id, current_user, ["write", "admin"], service_factory)
 
-    list_obj = await list_service.reorder_list(list_id, position_in.new_position)
+    async with service_factory.unit_of_work():
+        list_obj = await list_service.reorder_list(list_id, position_in.new_position)
+    await publish_board_event(
+        list_obj.board_id, "list.moved", ResponseBoardList.model_validate(list_obj).model_dump(mode="json")
+    )
     return list_obj
@@ -0,0 +1,86 @@
+import asyncio
+from typing import Optional
+
+import orjson
+from fastapi import APIRouter, Cookie, Depends, HTTPException, Query, WebSocket, WebSocketException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core import deps
+from src.core.events import BoardSubscription, board_events
+from src.db.session import get_db
+from src.core.principal import Principal
+from src.repositories import SQLAlchemyRepositoryFactory
+from src.services import ServiceFactory
+
+router = APIRouter()
+
+# Events after which a subscriber's access to the board is checked again
+ACCESS_EVENTS = {"share.updated", "share.deleted"}
+
+
+async def has_board_access(board_id: int, user: Principal, db: AsyncSession) -> bool:
+    """
+    Check read access to the board with require_board_access: one cached access-type lookup, the board is not loaded.
+    The session is closed afterwards so that an idle subscription does not hold a database connection.
+    """
+    factory = ServiceFactory(SQLAlchemyRepositoryFactory(db))
+    try:
+        await deps.require_board_access(board_id, user, ["read", "write", "admin"], factory)
+        return True
+    except HTTPException:
+        return False
+    finally:
+        await db.close()
+
+
+async def forward_events(
+    websocket: WebSocket, subscription: BoardSubscription, user: Principal, db: AsyncSession
+) -> int:
+    """Send board events to the client until the subscription ends; returns the close code."""
+    async for event in subscription:
+        if event["type"] in ACCESS_EVENTS and event["data"].get("user_id") == user.id:
+            if not await has_board_access(subscription.board_id, user, db):
+                return status.WS_1008_POLICY_VIOLATION
+
+        await websocket.send_text(orjson.dumps(event).decode())
+
+        if event["type"] == "board.deleted":
+            return status.WS_1000_NORMAL_CLOSURE
+    # The client fell behind and lost events: it has to reconnect and reload the board
+    return status.WS_1013_TRY_AGAIN_LATER
+
+
+async def wait_for_disconnect(websocket: WebSocket) -> None:
+    """Messages from the client are ignored; they are read only to notice the disconnect."""
+    while (await websocket.receive())["type"] != "websocket.disconnect":
+        pass
+
+
+@router.websocket("/boards/{board_id}")
+async def board_events_ws(
+    websocket: WebSocket,
+    board_id: int,
+    access_token: Optional[str] = Cookie(None),
+    token: Optional[str] = Query(None, description="Access token, for clients that cannot send the cookie"),
+    db: AsyncSession = Depends(get_db),
+) -> None:
+    """
+    Push card, list, comment and board changes of the board to the client as JSON messages
+    {"type": "card.updated", "board_id": ..., "data": {...}}.
+    """
+    user = None
+    if token := token or access_token:
+        user = await deps.get_user_from_access_token(token, ServiceFactory(SQLAlchemyRepositoryFactory(db)))
+    if not user or not user.is_active or not await has_board_access(board_id, user, db):
+        raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION)
+
+    await websocket.accept()
+    async with board_events.subscribe(board_id) as subscription:
+        sender = asyncio.create_task(forward_events(websocket, subscription, user, db))
+        receiver = asyncio.create_task(wait_for_disconnect(websocket))
+        done, pending = await asyncio.wait({sender, receiver}, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+
+        if sender in done and sender.exception() is None:
+            await websocket.close(code=sender.result())
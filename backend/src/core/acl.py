@@ -0,0 +1,39 @@
+from src.core.cache import BaseCache, create_cache
+from src.core.config import settings
+
+
+# Закэшированное отсутствие доступа (доска существует, но пользователю недоступна)
+NO_ACCESS = ""
+
+
+class BoardAccessCache:
+    """
+    Кэш эффективного доступа пользователя к доске по ключу (user_id, board_id).
+
+    Ключи содержат версию доски: изменение доступа увеличивает версию, и все
+    записи доски перестают читаться. Значение, вычисленное по старой версии
+    во время изменения, записывается под старую версию и тоже не читается.
+    """
+
+    def __init__(self, cache: BaseCache):
+        self.cache = cache
+
+    @staticmethod
+    def _version_key(board_id: int) -> str:
+        return f"acl:version:{board_id}"
+
+    async def get(self, board_id: int, user_id: int) -> tuple[int, str | None]:
+        """Вернуть текущую версию доски и закэшированный доступ (None, если записи нет)"""
+        version = await self.cache.get(self._version_key(board_id)) or 0
+        return version, await self.cache.get(f"acl:{board_id}:{version}:{user_id}")
+
+    async def set(self, board_id: int, user_id: int, version: int, access_type: str) -> None:
+        await self.cache.set(f"acl:{board_id}:{version}:{user_id}", access_type)
+
+    async def invalidate_board(self, board_id: int) -> None:
+        await self.cache.incr(self._version_key(board_id))
+
+
+board_access_cache = BoardAccessCache(
+    create_cache(settings.ACL_CACHE_BACKEND, settings.ACL_CACHE_TTL, settings.ACL_CACHE_MAX_SIZE, prefix="trello:")
+)
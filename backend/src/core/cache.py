@@ -0,0 +1,145 @@
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any
+
+import orjson
+from redis import asyncio as aioredis
+
+
+class BaseCache(ABC):
+    @abstractmethod
+    async def get(self, key: str) -> Any | None:
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: int | None = None) -> None:
+        pass
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        pass
+
+    @abstractmethod
+    async def incr(self, key: str) -> int:
+        pass
+
+
+class MemoryCache(BaseCache):
+    """
+    Кэш в памяти процесса с TTL и вытеснением по LRU.
+    Счетчики (incr) хранятся отдельно и не вытесняются, так как на них держатся версии.
+    """
+
+    def __init__(self, ttl: int = 30, max_size: int = 10000):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._counters: dict[str, int] = {}
+
+    async def get(self, key: str) -> Any | None:
+        if key in self._counters:
+            return self._counters[key]
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: int | None = None) -> None:
+        self._data[key] = (time.monotonic() + (ttl or self.ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+        self._counters.pop(key, None)
+
+    async def incr(self, key: str) -> int:
+        self._counters[key] = self._counters.get(key, 0) + 1
+        return self._counters[key]
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._counters.clear()
+
+
+class RedisCache(BaseCache):
+    """
+    Кэш в Redis, общий для всех воркеров. Значения сериализуются в JSON,
+    с raw=True хранятся как есть (уже закодированные bytes).
+    """
+
+    def __init__(self, url: str, ttl: int = 30, prefix: str = "cache:", raw: bool = False):
+        self.ttl = ttl
+        self.prefix = prefix
+        self.raw = raw
+        self.redis = aioredis.from_url(url)
+
+    async def get(self, key: str) -> Any | None:
+        value = await self.redis.get(self.prefix + key)
+        return value if value is None or self.raw else orjson.loads(value)
+
+    async def set(self, key: str, value: Any, ttl: int | None = None) -> None:
+        await self.redis.set(self.prefix + key, value if self.raw else orjson.dumps(value), ex=ttl or self.ttl)
+
+    async def delete(self, key: str) -> None:
+        await self.redis.delete(self.prefix + key)
+
+    async def incr(self, key: str) -> int:
+        return await self.redis.incr(self.prefix + key)
+
+
+class TieredCache(BaseCache):
+    """
+    Кэш в памяти процесса перед общим кэшем (обычно Redis).
+    Локальный TTL короче общего: он ограничивает, как долго воркер может не видеть
+    изменений, сделанных другими воркерами.
+    """
+
+    def __init__(self, local: BaseCache, shared: BaseCache, local_ttl: int):
+        self.local = local
+        self.shared = shared
+        self.local_ttl = local_ttl
+
+    async def get(self, key: str) -> Any | None:
+        value = await self.local.get(key)
+        if value is None:
+            value = await self.shared.get(key)
+            if value is not None:
+                await self.local.set(key, value, self.local_ttl)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: int | None = None) -> None:
+        await self.shared.set(key, value, ttl)
+        await self.local.set(key, value, min(ttl or self.local_ttl, self.local_ttl))
+
+    async def delete(self, key: str) -> None:
+        await self.shared.delete(key)
+        await self.local.delete(key)
+
+    async def incr(self, key: str) -> int:
+        value = await self.shared.incr(key)
+        await self.local.set(key, value, self.local_ttl)
+        return value
+
+
+def create_cache(
+    backend: str, ttl: int, max_size: int, prefix: str, local_ttl: int | None = None, raw: bool = False
+) -> BaseCache:
+    if backend in ("redis", "tiered"):
+        from src.core.config import settings
+
+        shared = RedisCache(settings.REDIS_DSN, ttl=ttl, prefix=prefix, raw=raw)
+        if backend == "redis":
+            return shared
+        local_ttl = local_ttl or ttl
+        return TieredCache(MemoryCache(ttl=local_ttl, max_size=max_size), shared, local_ttl)
+    if backend == "memory":
+        return MemoryCache(ttl=ttl, max_size=max_size)
+    raise ValueError(f"Unknown cache backend: {backend}")
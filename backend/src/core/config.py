@@ -38,8 +38,53 @@ class Settings(BaseSettings):
     SMTP_PASSWORD: str
     SMTP_HOST: str
     SMTP_PORT: int
+    SMTP_STARTTLS: bool = True
+    # Logged-in connections kept per worker process; idle ones older than SMTP_KEEPALIVE seconds are checked with NOOP
+    SMTP_POOL_SIZE: int = 2
+    SMTP_KEEPALIVE: int = 30
+
+    # Card notifications per (assignee, card) are collected for this many seconds into one digest (0 = no delay).
+    # They wait in outbox_message, so a window survives relay restarts
+    NOTIFICATION_DIGEST_WINDOW: int = 60
+
+    # Outbox relay (python -m src.outbox_relay): messages per transaction and idle poll interval, seconds
+    OUTBOX_RELAY_BATCH_SIZE: int = 500
+    OUTBOX_RELAY_POLL_INTERVAL: float = 1.0
+
+    # Board change events for /ws/boards/{id}: "memory" (single worker) or "redis" (pub/sub between workers)
+    EVENT_BROKER_BACKEND: str = "memory"
+    # Events buffered per subscriber; a client that falls this far behind is disconnected and has to resync
+    EVENT_SUBSCRIBER_QUEUE_SIZE: int = 100
 
     FRONTEND_URL: str
+    # Directory for compiled email templates shared by worker processes (None = compile in memory only)
+    EMAIL_TEMPLATE_BYTECODE_CACHE_DIR: Optional[str] = None
+
+    # Task numbers reserved per round trip to board_task_counter (1 = gap-free numbering)
+    TASK_NUMBER_BLOCK_SIZE: int = 1
+
+    # Board access cache: "memory" (per worker, revocations elsewhere wait for the TTL) or "redis"
+    ACL_CACHE_BACKEND: str = "memory"
+    ACL_CACHE_TTL: int = 30
+    ACL_CACHE_MAX_SIZE: int = 10000
+
+    # Authenticated user cache: "memory", "redis" or "tiered" (in-process tier in front of redis)
+    PRINCIPAL_CACHE_BACKEND: str = "memory"
+    PRINCIPAL_CACHE_TTL: int = 30
+    PRINCIPAL_CACHE_LOCAL_TTL: int = 5
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10000
+
+    # Encoded GET /boards/{id} snapshots by (board, version): "memory", "redis" or "tiered" (LRU in front of redis)
+    BOARD_SNAPSHOT_CACHE_BACKEND: str = "memory"
+    BOARD_SNAPSHOT_CACHE_TTL: int = 300
+    BOARD_SNAPSHOT_CACHE_LOCAL_TTL: int = 60
+    BOARD_SNAPSHOT_CACHE_MAX_SIZE: int = 1000
+    # Concurrent misses of one board version wait this many seconds for the load already in flight
+    BOARD_SNAPSHOT_COALESCE_TIMEOUT: float = 5.0
+
+    # bcrypt runs in a thread pool: pool size and max hash jobs in flight per worker
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_CONCURRENCY: int = 16
 
     @property
     def SQLALCHEMY_DATABASE_URI(self) -> str:
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import AsyncIterator, Optional
 
 from fastapi import Cookie, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
@@ -8,7 +8,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from services import UserService, BoardShareService
 from src.repositories import SQLAlchemyRepositoryFactory
 from src.services import ServiceFactory
+from src.services.board import BoardService
+from src.core.acl import NO_ACCESS, board_access_cache
 from src.core.config import settings
+from src.core.principal import Principal
 from src.db.session import get_db
 from src.models.board import Board
 from src.models.user import User
@@ -21,14 +24,22 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login
 
 async def get_sqlalchemy_repository_factory(
     db: AsyncSession = Depends(get_db),
-) -> SQLAlchemyRepositoryFactory:
-    return SQLAlchemyRepositoryFactory(db)
+) -> AsyncIterator[SQLAlchemyRepositoryFactory]:
+    factory = SQLAlchemyRepositoryFactory(db)
+    async with factory.uow.request_scope():
+        yield factory
 
 
-def get_sqlalchemy_service_factory(
+async def get_sqlalchemy_service_factory(
     db: AsyncSession = Depends(get_db),
-) -> ServiceFactory:
-    return ServiceFactory(SQLAlchemyRepositoryFactory(db))
+) -> AsyncIterator[ServiceFactory]:
+    """
+    Фабрика сервисов запроса. Изменения, не закоммиченные явным factory.unit_of_work(),
+    коммитятся одним коммитом после эндпоинта (до отправки ответа) и откатываются при ошибке.
+    """
+    factory = SQLAlchemyRepositoryFactory(db)
+    async with factory.uow.request_scope():
+        yield ServiceFactory(factory)
 
 
 async def get_token_from_cookie_or_header(
@@ -52,27 +63,30 @@ async def get_token_from_cookie_or_header(
     )
 
 
-async def get_current_user(
-    factory: ServiceFactory = Depends(get_sqlalchemy_service_factory),
-    token: str = Depends(get_token_from_cookie_or_header),
-) -> User:
-    service = factory.create_user_service()
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+async def get_user_from_access_token(token: str, factory: ServiceFactory) -> Principal | None:
+    """User of a valid access token (HTTP requests and WebSocket handshakes), None if the token is invalid."""
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         token_data = TokenPayload(**payload)
-        if token_data.sub is None or token_data.type != TokenType.ACCESS:
-            raise credentials_exception
     except JWTError:
-        raise credentials_exception
+        return None
+    if token_data.sub is None or token_data.type != TokenType.ACCESS:
+        return None
 
-    user = await service.get_user_by_id(token_data.sub)
+    return await factory.create_user_service().get_authenticated_user(token_data.sub)
+
+
+async def get_current_user(
+    factory: ServiceFactory = Depends(get_sqlalchemy_service_factory),
+    token: str = Depends(get_token_from_cookie_or_header),
+) -> Principal:
+    user = await get_user_from_access_token(token, factory)
     if not user:
-        raise credentials_exception
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     return user
 
 
@@ -113,16 +127,16 @@ async def get_user_from_refresh_token(
 
 
 async def get_current_active_user(
-    current_user: User = Depends(get_current_user),
-) -> User:
+    current_user: Principal = Depends(get_current_user),
+) -> Principal:
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
 
 
 async def get_current_active_superuser(
-    current_user: User = Depends(get_current_user),
-) -> User:
+    current_user: Principal = Depends(get_current_user),
+) -> Principal:
     if not current_user.is_superuser:
         raise HTTPException(status_code=400, detail="The user doesn't have enough privileges")
     return current_user
@@ -130,11 +144,48 @@ async def get_current_active_superuser(
 
 async def check_board_access(
     board: Board,
-    current_user: User,
+    current_user: Principal,
     access_type: list[str],
     service: BoardShareService
 ):
     if board.owner_id != current_user.id:
-        board_share = await service.get_board_share(board.id, current_user.id)
-        if not board_share or board_share.access_type not in access_type:
+        version, share_access = await board_access_cache.get(board.id, current_user.id)
+        if share_access is None:
+            board_share = await service.get_board_share(board.id, current_user.id)
+            share_access = board_share.access_type if board_share else NO_ACCESS
+            await board_access_cache.set(board.id, current_user.id, version, share_access)
+        if share_access not in access_type:
             raise HTTPException(status_code=403, detail="Not enough permissions")
+
+
+async def get_board_access_type(board_id: int, user_id: int, board_service: BoardService) -> str | None:
+    """
+    Effective access type of the user to the board ("owner", share access type or None).
+    Served from board_access_cache; on a miss resolved by one query without loading the board.
+    """
+    version, access_type = await board_access_cache.get(board_id, user_id)
+    if access_type is None:
+        row = await board_service.get_access_type(board_id, user_id)
+        if row is None:
+            raise HTTPException(status_code=404, detail="Board not found")
+        access_type = row[1] or NO_ACCESS
+        await board_access_cache.set(board_id, user_id, version, access_type)
+    return access_type or None
+
+
+async def require_board_access(
+    board_id: int,
+    current_user: Principal,
+    required_access: list[str],
+    service_factory: ServiceFactory,
+) -> str:
+    """Check access for routes that only need the board id, not the board itself."""
+    access_type = await get_board_access_type(board_id, current_user.id, service_factory.create_board_service())
+    check_access_type(access_type, required_access)
+    return access_type
+
+
+def check_access_type(access_type: str | None, required_access: list[str]) -> None:
+    """Check an access type already resolved together with the board (see board_access_type)."""
+    if access_type != "owner" and access_type not in required_access:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
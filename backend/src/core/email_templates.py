@@ -0,0 +1,115 @@
+import logging
+import os
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from typing import Iterable
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template
+
+from src.core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "templates")
+NOTIFICATION_TEMPLATE = "email_notification.html"
+
+
+class EmailRenderer:
+    """
+    Шаблоны писем, скомпилированные один раз на процесс, и сборка писем из них.
+
+    Шаблоны загружаются при создании (до fork воркеров Celery) и не перепроверяются на диске
+    при каждом письме. Bytecode cache ускоряет компиляцию при старте новых процессов.
+    """
+
+    def __init__(
+        self,
+        template_dir: str = TEMPLATE_DIR,
+        templates: Iterable[str] = (NOTIFICATION_TEMPLATE,),
+        bytecode_cache_dir: str | None = None,
+    ):
+        self.env = Environment(
+            loader=FileSystemLoader(template_dir),
+            auto_reload=False,
+            bytecode_cache=FileSystemBytecodeCache(bytecode_cache_dir) if bytecode_cache_dir else None,
+        )
+        self.templates: dict[str, Template] = {name: self.env.get_template(name) for name in templates}
+
+    def render(self, template_name: str, **context) -> str:
+        template = self.templates.get(template_name) or self.env.get_template(template_name)
+        return template.render(frontend_url=settings.FRONTEND_URL, **context)
+
+    @staticmethod
+    def build_message(email: str, subject: str, html_content: str) -> MIMEMultipart:
+        msg = MIMEMultipart()
+        msg["From"] = settings.SMTP_LOGIN
+        msg["To"] = email
+        msg["Subject"] = subject
+
+        msg.attach(MIMEText(html_content, "html", "utf-8"))
+        return msg
+
+    def build_notification(
+        self,
+        email: str,
+        username: str,
+        card_title: str,
+        task_id: str = "Задача",
+        editor_username: str = "пользователь",
+        board_id: int = 1,
+        comment_text: str | None = None,
+    ) -> MIMEMultipart:
+        """
+        Письмо-уведомление об изменении карточки или о новом комментарии (если передан comment_text)
+        """
+        context = dict(
+            username=username,
+            card_title=card_title,
+            task_id=task_id,
+            editor_username=editor_username,
+            board_id=board_id,
+        )
+        if comment_text is None:
+            subject = f"Обновление карточки '{card_title}' в TaskFlow"
+        else:
+            subject = f"Новый комментарий к карточке '{card_title}' в TaskFlow"
+            context.update(notification_type="comment", comment_text=comment_text)
+        return self.build_message(email, subject, self.render(NOTIFICATION_TEMPLATE, **context))
+
+    def build_digest(self, notifications: list[dict]) -> MIMEMultipart:
+        """
+        Одно письмо по нескольким уведомлениям об одной карточке для одного получателя.
+        Данные карточки берутся из последнего уведомления (название могло измениться).
+        """
+        if len(notifications) == 1:
+            return self.build_notification(**notifications[0])
+
+        latest = notifications[-1]
+        comments = [n for n in notifications if n.get("comment_text")]
+        html_content = self.render(
+            NOTIFICATION_TEMPLATE,
+            username=latest["username"],
+            card_title=latest["card_title"],
+            task_id=latest["task_id"],
+            board_id=latest["board_id"],
+            notification_type="digest",
+            editors=list(dict.fromkeys(n["editor_username"] for n in notifications)),
+            changes_count=len(notifications) - len(comments),
+            comments=comments,
+        )
+        subject = f"Изменения карточки '{latest['card_title']}' в TaskFlow ({len(notifications)})"
+        return self.build_message(latest["email"], subject, html_content)
+
+    def build_many(self, notifications: list[dict]) -> list[MIMEMultipart]:
+        """Письма по аргументам build_notification; уведомления, которые не удалось отрисовать, пропускаются"""
+        messages = []
+        for notification in notifications:
+            try:
+                messages.append(self.build_notification(**notification))
+            except Exception as e:
+                logger.error(f"Error rendering notification for {notification.get('email')}: {e}")
+        return messages
+
+
+email_renderer = EmailRenderer(bytecode_cache_dir=settings.EMAIL_TEMPLATE_BYTECODE_CACHE_DIR)
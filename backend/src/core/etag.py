@@ -0,0 +1,36 @@
+import hashlib
+from datetime import datetime
+
+from fastapi import Request, Response
+
+# Clients may keep the response but must revalidate it with If-None-Match before every use
+CACHE_CONTROL = "private, no-cache"
+
+
+def board_etag(board_id: int, version: int, updated_at: datetime, access_type: str) -> str:
+    """
+    Strong ETag of a board read (board snapshot, its lists, cards of a list).
+    Changes with every list/card/comment change (version), board edit (updated_at) and with the caller's access.
+    """
+    key = f"{board_id}:{version}:{updated_at.isoformat()}:{access_type}"
+    return f'"{hashlib.blake2b(key.encode(), digest_size=12).hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match check (weak comparison, as RFC 9110 requires for this header)."""
+    if not (header := request.headers.get("if-none-match")):
+        return False
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+def set_etag(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+
+
+def not_modified(etag: str) -> Response:
+    response = Response(status_code=304)
+    set_etag(response, etag)
+    return response
@@ -0,0 +1,147 @@
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+import orjson
+from redis import asyncio as aioredis
+
+from src.core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+class BoardSubscription:
+    """
+    Очередь событий одной доски для одного подписчика.
+
+    Очередь ограничена: подписчик, который не успевает читать, отключается (overflowed),
+    а не копит события в памяти воркера; клиент переподключается и перечитывает доску.
+    """
+
+    def __init__(self, board_id: int, queue_size: int):
+        self.board_id = board_id
+        self.overflowed = False
+        self._queue: asyncio.Queue[dict | None] = asyncio.Queue(queue_size)
+
+    def put(self, event: dict) -> None:
+        if self.overflowed:
+            return
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._queue.put_nowait(None)
+
+    async def __aiter__(self) -> AsyncIterator[dict]:
+        while (event := await self._queue.get()) is not None:
+            yield event
+
+
+class BaseEventBroker(ABC):
+    """Рассылка событий доски подписчикам (WebSocket-соединениям) этого процесса"""
+
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self._subscriptions: dict[int, set[BoardSubscription]] = {}
+
+    @abstractmethod
+    async def publish(self, board_id: int, event: dict) -> None:
+        pass
+
+    async def _on_first_subscriber(self, board_id: int) -> None:
+        pass
+
+    async def _on_last_unsubscribe(self, board_id: int) -> None:
+        pass
+
+    def _deliver(self, board_id: int, event: dict) -> None:
+        for subscription in list(self._subscriptions.get(board_id, ())):
+            subscription.put(event)
+
+    @asynccontextmanager
+    async def subscribe(self, board_id: int) -> AsyncIterator[BoardSubscription]:
+        subscription = BoardSubscription(board_id, self.queue_size)
+        subscriptions = self._subscriptions.setdefault(board_id, set())
+        subscriptions.add(subscription)
+        try:
+            if len(subscriptions) == 1:
+                await self._on_first_subscriber(board_id)
+            yield subscription
+        finally:
+            subscriptions.discard(subscription)
+            if not subscriptions and self._subscriptions.get(board_id) is subscriptions:
+                del self._subscriptions[board_id]
+                await self._on_last_unsubscribe(board_id)
+
+
+class MemoryEventBroker(BaseEventBroker):
+    """Брокер в памяти процесса (один воркер, тесты)"""
+
+    async def publish(self, board_id: int, event: dict) -> None:
+        self._deliver(board_id, event)
+
+
+class RedisEventBroker(BaseEventBroker):
+    """
+    Брокер поверх Redis pub/sub для нескольких воркеров: событие публикуется в канал доски,
+    каждый процесс подписан (одним соединением) только на доски, открытые его клиентами,
+    и раздает полученные события своим подписчикам.
+    """
+
+    def __init__(self, url: str, queue_size: int, prefix: str = "trello:board-events:"):
+        super().__init__(queue_size)
+        self.redis = aioredis.from_url(url)
+        self.pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+        self.prefix = prefix
+        self._reader: asyncio.Task | None = None
+
+    async def publish(self, board_id: int, event: dict) -> None:
+        await self.redis.publish(f"{self.prefix}{board_id}", orjson.dumps(event))
+
+    async def _on_first_subscriber(self, board_id: int) -> None:
+        await self.pubsub.subscribe(f"{self.prefix}{board_id}")
+        if self._reader is None or self._reader.done():
+            self._reader = asyncio.create_task(self._read())
+
+    async def _on_last_unsubscribe(self, board_id: int) -> None:
+        await self.pubsub.unsubscribe(f"{self.prefix}{board_id}")
+
+    async def _read(self) -> None:
+        while self.pubsub.subscribed:
+            try:
+                message = await self.pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            except Exception as e:
+                # Соединение восстанавливается при следующем чтении, подписки повторяются автоматически
+                logger.error(f"Error reading board events: {e}")
+                await asyncio.sleep(1)
+                continue
+            if message and message["type"] == "message":
+                board_id = int(message["channel"].decode()[len(self.prefix):])
+                self._deliver(board_id, orjson.loads(message["data"]))
+
+
+def create_event_broker(backend: str, queue_size: int) -> BaseEventBroker:
+    if backend == "redis":
+        return RedisEventBroker(settings.REDIS_DSN, queue_size)
+    if backend == "memory":
+        return MemoryEventBroker(queue_size)
+    raise ValueError(f"Unknown event broker backend: {backend}")
+
+
+board_events = create_event_broker(settings.EVENT_BROKER_BACKEND, settings.EVENT_SUBSCRIBER_QUEUE_SIZE)
+
+
+async def publish_board_event(board_id: int, event_type: str, data: dict) -> None:
+    """
+    Опубликовать событие доски после коммита изменения.
+    Ошибка публикации не отменяет уже закоммиченный запрос: клиенты дочитают изменения при переподключении.
+    """
+    try:
+        await board_events.publish(board_id, {"type": event_type, "board_id": board_id, "data": data})
+    except Exception as e:
+        logger.error(f"Error publishing {event_type} for board {board_id}: {e}")
@@ -0,0 +1,13 @@
+def generate_board_prefix(board_title: str) -> str:
+    """
+    Generate board prefix from board title by taking first letter of each word.
+    Example: "Awesome Board" -> "AB"
+    """
+    if not board_title or not (words := board_title.split()):
+        return "TA"
+    return "".join(word[0].upper() for word in words)
+
+
+def format_task_id(board_title: str, task_number: int) -> str:
+    """Task id shown to users, e.g. "AB-42" for task 42 of "Awesome Board"."""
+    return f"{generate_board_prefix(board_title)}-{task_number}"
@@ -0,0 +1,30 @@
+from src.tasks import send_card_digest, send_emails_batch
+
+
+class NotificationCoalescer:
+    """
+    Отправляет уведомления об изменениях карточки, собранные за окно window секунд, одним письмом-сводкой
+    на пару (исполнитель, карточка): одна задача Celery вместо задачи на каждое изменение.
+
+    Буфером окна служит сам outbox: relay забирает уведомления карточки, только когда старейшему из них
+    исполнилось window секунд (OutboxRepository.claim_batch), и удаляет их в одной транзакции с постановкой
+    сводки в очередь. Поэтому остановка или падение relay посреди окна ничего не теряет: строки остаются
+    в outbox, и сводку отправит любой relay (at-least-once).
+    """
+
+    def __init__(self, window: float):
+        self.window = window
+
+    def send(self, notifications: list[tuple[int, int, dict]]) -> None:
+        """Отправить пачку (assignee_id, card_id, notification) в порядке поступления"""
+        if not notifications:
+            return
+        if self.window <= 0:
+            send_emails_batch.delay([notification for _, _, notification in notifications])
+            return
+
+        digests: dict[tuple[int, int], list[dict]] = {}
+        for assignee_id, card_id, notification in notifications:
+            digests.setdefault((assignee_id, card_id), []).append(notification)
+        for digest in digests.values():
+            send_card_digest.delay(digest)
@@ -0,0 +1,90 @@
+from dataclasses import dataclass, fields
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import DateTime
+
+from src.core.cache import BaseCache, create_cache
+from src.core.config import settings
+from src.models import User
+
+
+# Поля, которые не должны попадать в кэш
+_EXCLUDED_FIELDS = {"hashed_password"}
+_DATETIME_FIELDS = {column.key for column in User.__table__.columns if isinstance(column.type, DateTime)}
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """
+    Аутентифицированный пользователь запроса (current_user), не привязанный к сессии.
+
+    Собирается из principal_cache или из загруженного User, поэтому у него нет ни ленивых
+    отношений, ни hashed_password: для изменения пользователя загрузите его (UserRepository.get_fresh).
+    """
+
+    id: int
+    email: str
+    username: str
+    full_name: str | None
+    is_active: bool
+    is_superuser: bool
+    created_at: datetime
+    updated_at: datetime
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Principal":
+        return cls(**{field.name: data[field.name] for field in fields(cls)})
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(**{field.name: getattr(user, field.name) for field in fields(cls)})
+
+
+class PrincipalCache:
+    """
+    Кэш аутентифицированных пользователей по ключу (user_id, security stamp).
+
+    Security stamp увеличивается при изменении профиля, пароля и деактивации:
+    старые записи перестают читаться, и следующий запрос загружает пользователя заново.
+    """
+
+    def __init__(self, cache: BaseCache):
+        self.cache = cache
+
+    @staticmethod
+    def _stamp_key(user_id: int) -> str:
+        return f"principal:stamp:{user_id}"
+
+    async def get(self, user_id: int) -> tuple[int, dict[str, Any] | None]:
+        """Вернуть текущий stamp пользователя и закэшированные поля (None, если записи нет)"""
+        stamp = await self.cache.get(self._stamp_key(user_id)) or 0
+        data = await self.cache.get(f"principal:{user_id}:{stamp}")
+        if data is not None:
+            data = {
+                key: datetime.fromisoformat(value) if key in _DATETIME_FIELDS and isinstance(value, str) else value
+                for key, value in data.items()
+            }
+        return stamp, data
+
+    async def set(self, user: User, stamp: int) -> None:
+        data = {
+            column.key: getattr(user, column.key)
+            for column in User.__table__.columns
+            if column.key not in _EXCLUDED_FIELDS
+        }
+        await self.cache.set(f"principal:{user.id}:{stamp}", data)
+
+    async def bump_stamp(self, user_id: int) -> None:
+        await self.cache.incr(self._stamp_key(user_id))
+
+
+principal_cache = PrincipalCache(
+    create_cache(
+        settings.PRINCIPAL_CACHE_BACKEND,
+        settings.PRINCIPAL_CACHE_TTL,
+        settings.PRINCIPAL_CACHE_MAX_SIZE,
+        prefix="trello:",
+        local_ttl=settings.PRINCIPAL_CACHE_LOCAL_TTL,
+    )
+)
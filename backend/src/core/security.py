@@ -1,4 +1,6 @@
+import asyncio
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Any, Optional, Union
 
@@ -11,6 +13,14 @@ from src.schemas.token import TokenType
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt releases the GIL while hashing, so a thread pool runs hashes in parallel
+# without blocking the event loop. The semaphore bounds how many hash jobs a worker
+# accepts at once, so a login storm queues here instead of growing the pool backlog.
+_password_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+)
+_password_semaphore = asyncio.Semaphore(settings.PASSWORD_HASH_MAX_CONCURRENCY)
+
 logger = logging.getLogger(__name__)
 
 
@@ -92,3 +102,18 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
+
+
+async def _run_password_job(func, *args):
+    async with _password_semaphore:
+        return await asyncio.get_running_loop().run_in_executor(_password_executor, func, *args)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password in the password hashing pool, without blocking the event loop."""
+    return await _run_password_job(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash in the password hashing pool, without blocking the event loop."""
+    return await _run_password_job(get_password_hash, password)
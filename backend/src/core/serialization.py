@@ -0,0 +1,46 @@
+from typing import Any, Iterable
+
+import orjson
+from pydantic import BaseModel
+
+
+class SchemaSerializer:
+    """
+    JSON-сериализатор ORM-объектов по полям pydantic-схемы ответа, собранный один раз при импорте.
+
+    Для больших списков (карточки списка) вместо Schema(**obj.__dict__) на каждый объект и повторной
+    валидации response_model: значения читаются атрибутами по заранее вычисленному списку полей
+    (отсутствующий атрибут - default поля, как при from_attributes) и кодируются orjson одним вызовом.
+    Данные пришли из БД и уже валидировались при записи, поэтому повторно не проверяются (EmailStr
+    у вложенного пользователя - самая дорогая часть валидации).
+
+    nested - поля со вложенной схемой (None остается None), unloaded - отношения, которые не загружаются
+    запросом и всегда отдаются как null. Вычисляемые при ответе поля (formatted_id) передаются в to_dict
+    явно, а не присваиваются ORM-объекту.
+    """
+
+    def __init__(
+        self,
+        schema: type[BaseModel],
+        nested: dict[str, "SchemaSerializer"] | None = None,
+        unloaded: Iterable[str] = (),
+    ):
+        self.nested = nested or {}
+        self.unloaded = tuple(unloaded)
+        self.fields = tuple(
+            (name, field.get_default(call_default_factory=True))
+            for name, field in schema.model_fields.items()
+            if name not in self.nested and name not in self.unloaded
+        )
+
+    def to_dict(self, obj: Any, **values: Any) -> dict:
+        data = {name: values[name] if name in values else getattr(obj, name, default) for name, default in self.fields}
+        for name, serializer in self.nested.items():
+            value = getattr(obj, name, None)
+            data[name] = serializer.to_dict(value) if value is not None else None
+        for name in self.unloaded:
+            data[name] = None
+        return data
+
+    def dumps(self, objs: Iterable[Any]) -> bytes:
+        return orjson.dumps([self.to_dict(obj) for obj in objs])
@@ -0,0 +1,176 @@
+import logging
+import smtplib as smtp
+import threading
+import time
+from contextlib import contextmanager
+from email.message import Message
+from typing import Iterator, Sequence
+
+from src.core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+def is_connection_error(error: Exception) -> bool:
+    """Ошибка, после которой соединение больше нельзя использовать (SMTPException тоже наследует OSError)"""
+    if isinstance(error, smtp.SMTPServerDisconnected):
+        return True
+    if isinstance(error, smtp.SMTPResponseException):
+        return error.smtp_code == 421
+    return isinstance(error, OSError) and not isinstance(error, smtp.SMTPException)
+
+
+class SMTPConnectionPool:
+    """
+    Пул SMTP-соединений, уже прошедших STARTTLS и логин.
+
+    Соединения открываются лениво, поэтому пул можно создать до fork воркеров Celery.
+    Соединение, простоявшее дольше keepalive секунд, перед выдачей проверяется NOOP.
+    При разрыве соединения отправка один раз повторяется через новое соединение.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        login: str | None = None,
+        password: str | None = None,
+        starttls: bool = True,
+        size: int = 2,
+        keepalive: float = 30,
+        timeout: float = 30,
+    ):
+        self.host = host
+        self.port = port
+        self.login = login
+        self.password = password
+        self.starttls = starttls
+        self.size = size
+        self.keepalive = keepalive
+        self.timeout = timeout
+        self._idle: list[tuple[smtp.SMTP, float]] = []
+        self._lock = threading.Lock()
+
+    def _connect(self) -> smtp.SMTP:
+        server = smtp.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            server.ehlo()
+            if self.starttls:
+                server.starttls()
+                server.ehlo()
+            if self.login:
+                server.login(self.login, self.password)
+        except Exception:
+            self._close(server)
+            raise
+        return server
+
+    @staticmethod
+    def _close(server: smtp.SMTP) -> None:
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+
+    def _is_alive(self, server: smtp.SMTP) -> bool:
+        try:
+            return server.noop()[0] == 250
+        except OSError:
+            return False
+
+    def _acquire(self) -> smtp.SMTP:
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                server, released_at = self._idle.pop()
+            if time.monotonic() - released_at < self.keepalive or self._is_alive(server):
+                return server
+            server.close()
+        return self._connect()
+
+    def _release(self, server: smtp.SMTP) -> None:
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append((server, time.monotonic()))
+                return
+        self._close(server)
+
+    @contextmanager
+    def connection(self) -> Iterator[smtp.SMTP]:
+        """Выдать соединение из пула; после ошибки соединения оно закрывается, а не возвращается в пул"""
+        server = self._acquire()
+        try:
+            yield server
+        except Exception as e:
+            if is_connection_error(e):
+                server.close()
+                raise
+            # Ошибка протокола (например, отклоненный получатель): сбрасываем транзакцию
+            try:
+                server.rset()
+            except OSError:
+                server.close()
+                raise e
+            self._release(server)
+            raise
+        else:
+            self._release(server)
+
+    def send(self, message: Message) -> None:
+        self.send_many([message], raise_errors=True)
+
+    def send_many(self, messages: Sequence[Message], raise_errors: bool = False) -> list[bool]:
+        """
+        Отправить письма через одно соединение. Возвращает признак успеха для каждого письма.
+        При разрыве соединения отправка продолжается через новое; если и оно не удалось,
+        сервер считается недоступным и оставшиеся письма не отправляются.
+        """
+        results: list[bool] = []
+        reconnected = False
+        while len(results) < len(messages):
+            try:
+                with self.connection() as server:
+                    while len(results) < len(messages):
+                        message = messages[len(results)]
+                        try:
+                            server.send_message(message)
+                        except (smtp.SMTPRecipientsRefused, smtp.SMTPSenderRefused, smtp.SMTPDataError) as e:
+                            if raise_errors or is_connection_error(e):
+                                raise
+                            logger.error(f"Error sending email to {message['To']}: {e}")
+                            results.append(False)
+                            server.rset()
+                            continue
+                        results.append(True)
+                        reconnected = False
+            except Exception as e:
+                if not is_connection_error(e):
+                    raise
+                if reconnected:
+                    if raise_errors:
+                        raise
+                    logger.error(f"SMTP server unavailable, {len(messages) - len(results)} emails not sent: {e}")
+                    results.extend([False] * (len(messages) - len(results)))
+                else:
+                    logger.warning(f"SMTP connection lost, reconnecting: {e}")
+                    reconnected = True
+        return results
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for server, _ in idle:
+            self._close(server)
+
+
+smtp_pool = SMTPConnectionPool(
+    settings.SMTP_HOST,
+    settings.SMTP_PORT,
+    login=settings.SMTP_LOGIN,
+    password=settings.SMTP_PASSWORD,
+    starttls=settings.SMTP_STARTTLS,
+    size=settings.SMTP_POOL_SIZE,
+    keepalive=settings.SMTP_KEEPALIVE,
+)
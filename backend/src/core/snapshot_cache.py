@@ -0,0 +1,119 @@
+import asyncio
+import time
+from typing import Awaitable, Callable
+
+import orjson
+
+from src.core.cache import BaseCache, create_cache
+from src.core.config import settings
+
+
+# Результат загрузки, которая завершилась ошибкой или была отменена: ожидающие загружают снимок сами
+_FAILED = object()
+
+
+class CacheStats:
+    """
+    Счетчики попаданий и суммарное время ответа из кэша и с загрузкой из БД.
+    coalesced - промахи, дождавшиеся чужой загрузки той же версии вместо своей.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.hit_time = 0.0
+        self.miss_time = 0.0
+
+    def as_dict(self) -> dict:
+        requests = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": self.hits / requests if requests else 0.0,
+            "avg_hit_ms": self.hit_time / self.hits * 1000 if self.hits else 0.0,
+            "avg_miss_ms": self.miss_time / self.misses * 1000 if self.misses else 0.0,
+        }
+
+
+class BoardSnapshotCache:
+    """
+    Закодированный в JSON снимок доски (GET /boards/{id}) по ключу (board_id, version).
+
+    Версия доски увеличивается при любом изменении ее списков, карточек, комментариев и самой доски
+    (repositories.board_version), поэтому запись устаревшей версии больше не читается; при изменении
+    она еще и удаляется (invalidate), чтобы не занимать место до истечения TTL.
+    Снимок хранится без access_type, который у каждого пользователя свой и подставляется при ответе.
+
+    Одновременные промахи по одной версии в процессе объединяются (single-flight): загружает первый
+    запрос, остальные ждут его результат не дольше coalesce_timeout секунд и потом загружают сами.
+    Доступ каждого пользователя проверяется до обращения к кэшу, общий снимок от пользователя не зависит.
+    """
+
+    def __init__(self, cache: BaseCache, coalesce_timeout: float = 5.0):
+        self.cache = cache
+        self.coalesce_timeout = coalesce_timeout
+        self.stats = CacheStats()
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    @staticmethod
+    def _key(board_id: int, version: int) -> str:
+        return f"board-snapshot:{board_id}:{version}"
+
+    async def get_or_load(
+        self, board_id: int, version: int, load: Callable[[], Awaitable[bytes | None]]
+    ) -> bytes | None:
+        """Снимок версии version из кэша, при промахе - из load() (None, если доски нет)"""
+        started = time.perf_counter()
+        if (payload := await self.cache.get(self._key(board_id, version))) is not None:
+            self.stats.hits += 1
+            self.stats.hit_time += time.perf_counter() - started
+            return payload
+
+        payload = await self._load_once(self._key(board_id, version), load)
+        self.stats.misses += 1
+        self.stats.miss_time += time.perf_counter() - started
+        return payload
+
+    async def _load_once(self, key: str, load: Callable[[], Awaitable[bytes | None]]) -> bytes | None:
+        if (inflight := self._inflight.get(key)) is not None:
+            try:
+                payload = await asyncio.wait_for(asyncio.shield(inflight), self.coalesce_timeout)
+            except asyncio.TimeoutError:
+                payload = _FAILED
+            if payload is not _FAILED:
+                self.stats.coalesced += 1
+                return payload
+            return await load()
+
+        inflight = self._inflight[key] = asyncio.get_running_loop().create_future()
+        payload = _FAILED
+        try:
+            if (payload := await load()) is not None:
+                await self.cache.set(key, payload)
+            return payload
+        finally:
+            inflight.set_result(payload)
+            del self._inflight[key]
+
+    async def invalidate(self, board_id: int, version: int) -> None:
+        await self.cache.delete(self._key(board_id, version))
+
+    @staticmethod
+    def with_access_type(payload: bytes, access_type: str) -> bytes:
+        """Добавить access_type пользователя в начало закэшированного JSON-объекта без повторной сериализации"""
+        return b'{"access_type":' + orjson.dumps(access_type) + b"," + payload[1:]
+
+
+board_snapshot_cache = BoardSnapshotCache(
+    create_cache(
+        settings.BOARD_SNAPSHOT_CACHE_BACKEND,
+        settings.BOARD_SNAPSHOT_CACHE_TTL,
+        settings.BOARD_SNAPSHOT_CACHE_MAX_SIZE,
+        prefix="trello:",
+        local_ttl=settings.BOARD_SNAPSHOT_CACHE_LOCAL_TTL,
+        raw=True,
+    ),
+    coalesce_timeout=settings.BOARD_SNAPSHOT_COALESCE_TIMEOUT,
+)
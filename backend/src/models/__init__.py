@@ -2,8 +2,22 @@ from .base import Base
 from .board import Board
 from .board_list import BoardList
 from .board_share import BoardShare
+from .board_task_counter import BoardTaskCounter
+from .board_tombstone import BoardTombstone
 from .card import Card
 from .comment import Comment
+from .outbox_message import OutboxMessage
 from .user import User
 
-__all__ = ["Base", "User", "Board", "Card", "BoardList", "BoardShare", "Comment"]
+__all__ = [
+    "Base",
+    "User",
+    "Board",
+    "Card",
+    "BoardList",
+    "BoardShare",
+    "BoardTaskCounter",
+    "BoardTombstone",
+    "Comment",
+    "OutboxMessage",
+]
@@ -1,15 +1,21 @@
-from sqlalchemy import Column, ForeignKey, Integer, String
+from sqlalchemy import Column, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
 
 from .base import Base
 
 
 class Board(Base):
+    __table_args__ = (Index("ix_board_owner_id", "owner_id", postgresql_include=["id"]),)
+
     title = Column(String, nullable=False)
     description = Column(String)
     background_color = Column(String, nullable=True)
     owner_id = Column(Integer, ForeignKey("user.id"), nullable=False)
+    # Номер последнего изменения списков, карточек и комментариев доски (см. repositories.board_version)
+    version = Column(Integer, nullable=False, default=0, server_default="0")
 
     owner = relationship("User", backref="boards")
-    lists = relationship("BoardList", back_populates="board", cascade="all, delete-orphan")
+    lists = relationship(
+        "BoardList", back_populates="board", cascade="all, delete-orphan", order_by="BoardList.position"
+    )
     shared_with = relationship("BoardShare", back_populates="board", cascade="all, delete-orphan")
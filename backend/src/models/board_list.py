@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, Integer, String
+from sqlalchemy import Column, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
 
 from .base import Base
@@ -6,11 +6,16 @@ from .base import Base
 
 class BoardList(Base):
     __tablename__ = "list"
+    __table_args__ = (
+        Index("ix_list_board_id_version", "board_id", "version"),
+        Index("ix_list_board_id_position", "board_id", "position"),
+    )
 
     title = Column(String, nullable=False)
     position = Column(Integer, nullable=False)
     board_id = Column(Integer, ForeignKey("board.id"), nullable=False)
     list_color = Column(String, nullable=True)  # Цвет списка в формате CSS-градиента
+    version = Column(Integer, nullable=False, default=0, server_default="0")  # Версия доски при последнем изменении
 
     board = relationship("Board", back_populates="lists")
     cards = relationship("Card", back_populates="list", cascade="all, delete-orphan")
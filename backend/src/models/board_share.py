@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, Integer, String, UniqueConstraint
+from sqlalchemy import Column, ForeignKey, Index, Integer, String, UniqueConstraint
 from sqlalchemy.orm import relationship
 
 from .base import Base
@@ -19,5 +19,8 @@ class BoardShare(Base):
     board = relationship("Board", back_populates="shared_with")
     user = relationship("User", back_populates="shared_boards")
 
-    # Ограничение уникальности
-    __table_args__ = (UniqueConstraint("board_id", "user_id", name="uix_board_user"),)
+    # Ограничение уникальности (заодно индекс поиска по board_id) и покрывающий индекс досок пользователя
+    __table_args__ = (
+        UniqueConstraint("board_id", "user_id", name="uix_board_user"),
+        Index("ix_board_share_user_id", "user_id", postgresql_include=["board_id", "access_type"]),
+    )
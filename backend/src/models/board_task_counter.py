@@ -0,0 +1,14 @@
+from sqlalchemy import Column, ForeignKey, Integer
+
+from .base import Base
+
+
+class BoardTaskCounter(Base):
+    """
+    Последний выданный номер задачи (card.card_id) на доске
+    """
+
+    __tablename__ = "board_task_counter"
+
+    board_id = Column(Integer, ForeignKey("board.id", ondelete="CASCADE"), nullable=False, unique=True)
+    last_value = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, ForeignKey, Index, Integer, String
+
+from .base import Base
+
+
+class BoardTombstone(Base):
+    """
+    Запись об удалении списка, карточки или комментария доски для /boards/{id}/changes.
+    Удаление списка подразумевает удаление его карточек, удаление карточки - ее комментариев.
+    """
+
+    __tablename__ = "board_tombstone"
+    __table_args__ = (Index("ix_board_tombstone_board_id_version", "board_id", "version"),)
+
+    board_id = Column(Integer, ForeignKey("board.id", ondelete="CASCADE"), nullable=False)
+    entity_type = Column(String, nullable=False)  # "list", "card" или "comment"
+    entity_id = Column(Integer, nullable=False)
+    version = Column(Integer, nullable=False)
@@ -1,17 +1,35 @@
-from sqlalchemy import Column, ForeignKey, Integer, String, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Computed, Float, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 
 from .base import Base
 
+# Поисковый вектор карточки (см. repositories.card.search_cards): заголовок весомее описания.
+# Конфигурация 'simple' без стемминга - карточки пишут и по-русски, и по-английски.
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'B')"
+)
+
 
 class Card(Base):
+    __table_args__ = (
+        Index("ix_card_list_id_version", "list_id", "version"),
+        Index("ix_card_list_id_position", "list_id", "position", "id"),
+        Index("ix_card_assignee_id", "assignee_id"),
+        Index("ix_card_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
     card_id = Column(Integer, nullable=False, unique=False, autoincrement=False)
     title = Column(String, nullable=False)
     description = Column(Text)
-    position = Column(Integer, nullable=False)
+    position = Column(Float, nullable=False)  # Дробная позиция, см. repositories.card.position_between
     list_id = Column(Integer, ForeignKey("list.id"), nullable=False)
     card_color = Column(String, nullable=True)  # Цвет карточки в формате CSS-градиента
     assignee_id = Column(Integer, ForeignKey("user.id"), nullable=True)  # ID пользователя, ответственного за карточку
+    version = Column(Integer, nullable=False, default=0, server_default="0")  # Версия доски при последнем изменении
+    # Вычисляется БД при записи; отложен, чтобы не попадать в обычные выборки и RETURNING
+    search_vector = deferred(Column(TSVECTOR, Computed(SEARCH_VECTOR, persisted=True)))
 
     list = relationship("BoardList", back_populates="cards")
     assignee = relationship("User", backref="assigned_cards")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -6,9 +6,15 @@ from .base import Base
 
 
 class Comment(Base):
+    __table_args__ = (
+        Index("ix_comment_card_id_version", "card_id", "version"),
+        Index("ix_comment_card_id_created_at", "card_id", "created_at", "id"),
+    )
+
     text = Column(Text, nullable=False)
     card_id = Column(Integer, ForeignKey("card.id"), nullable=False)
     user_id = Column(Integer, ForeignKey("user.id"), nullable=False)
+    version = Column(Integer, nullable=False, default=0, server_default="0")  # Версия доски при последнем изменении
 
     card = relationship("Card", back_populates="comments")
     user = relationship("User", back_populates="comments")
@@ -0,0 +1,15 @@
+from sqlalchemy import JSON, Column, String
+
+from .base import Base
+
+
+class OutboxMessage(Base):
+    """
+    Сообщение для публикации, записанное в одной транзакции с изменением данных.
+    Публикуется и удаляется процессом src.outbox_relay.
+    """
+
+    __tablename__ = "outbox_message"
+
+    topic = Column(String, nullable=False)
+    payload = Column(JSON, nullable=False)
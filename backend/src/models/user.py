@@ -1,10 +1,18 @@
-from sqlalchemy import Boolean, Column, String
+from sqlalchemy import Boolean, Column, Index, String
 from sqlalchemy.orm import relationship
 
 from .base import Base
 
+# Колонки поиска пользователей (repositories.user.search_users) с триграммными GIN-индексами
+SEARCH_COLUMNS = ("username", "email", "full_name")
+
 
 class User(Base):
+    __table_args__ = tuple(
+        Index(f"ix_user_{name}_trgm", name, postgresql_using="gin", postgresql_ops={name: "gin_trgm_ops"})
+        for name in SEARCH_COLUMNS
+    )
+
     email = Column(String, unique=True, index=True, nullable=False)
     username = Column(String, unique=True, index=True, nullable=False)
     hashed_password = Column(String, nullable=False)
@@ -0,0 +1,95 @@
+"""
+Outbox relay: publishes messages that requests wrote to outbox_message in the same
+transaction as their card and comment changes.
+
+Card notifications stay in outbox_message for the digest window (NOTIFICATION_DIGEST_WINDOW):
+each iteration locks the notifications of cards whose window has closed (FOR UPDATE SKIP LOCKED,
+so several relays can run side by side), resolves them with one query, queues one digest per
+(assignee, card) and deletes the messages in the same transaction. Nothing is buffered in the
+relay process, so a crash or redeploy at any point publishes the messages again (at-least-once).
+
+    python -m src.outbox_relay
+"""
+import asyncio
+import logging
+import signal
+
+from src.core.config import settings
+from src.core.formatting import format_task_id
+from src.core.notifications import NotificationCoalescer
+from src.db.session import AsyncSessionLocal
+from src.repositories import SQLAlchemyRepositoryFactory
+from src.services import ServiceFactory
+from src.services.outbox import CARD_NOTIFICATION
+
+
+logger = logging.getLogger(__name__)
+
+
+async def relay_batch(factory: ServiceFactory, coalescer: NotificationCoalescer, batch_size: int) -> int:
+    """Publish one batch of outbox messages; returns the number of messages processed."""
+    outbox_service = factory.create_outbox_service()
+    card_service = factory.create_card_service()
+
+    messages = await outbox_service.claim_batch(batch_size, coalescer.window)
+    if not messages:
+        return 0
+
+    payloads = [message.payload for message in messages if message.topic == CARD_NOTIFICATION]
+    targets = await card_service.get_notification_targets({payload["card_id"] for payload in payloads})
+    notifications = []
+    for payload in payloads:
+        # The card may have been deleted or reassigned since the change was committed
+        target = targets.get(payload["card_id"])
+        if target is None or target.assignee_id == payload["editor_id"]:
+            continue
+        notification = {
+            "email": target.email,
+            "username": target.username,
+            "card_title": target.title,
+            "task_id": format_task_id(target.board_title, target.card_id),
+            "editor_username": payload["editor_username"],
+            "board_id": target.board_id,
+        }
+        if payload.get("comment_text"):
+            notification["comment_text"] = payload["comment_text"]
+        notifications.append((target.assignee_id, target.id, notification))
+
+    coalescer.send(notifications)
+    await outbox_service.delete_batch(messages)
+    return len(messages)
+
+
+async def run(batch_size: int, poll_interval: float) -> None:
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    coalescer = NotificationCoalescer(settings.NOTIFICATION_DIGEST_WINDOW)
+    logger.info("Outbox relay started")
+    try:
+        while not stop.is_set():
+            try:
+                async with AsyncSessionLocal() as session:
+                    factory = ServiceFactory(SQLAlchemyRepositoryFactory(session))
+                    async with factory.unit_of_work():
+                        processed = await relay_batch(factory, coalescer, batch_size)
+            except Exception as e:
+                logger.error(f"Error relaying outbox messages: {e}")
+                processed = 0
+            if processed < batch_size:
+                try:
+                    await asyncio.wait_for(stop.wait(), poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+    finally:
+        logger.info("Outbox relay stopped")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    asyncio.run(run(settings.OUTBOX_RELAY_BATCH_SIZE, settings.OUTBOX_RELAY_POLL_INTERVAL))
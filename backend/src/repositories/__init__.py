@@ -3,7 +3,10 @@ from .user import UserRepository
 from .base import BaseRepository
 from .board import BoardRepository
 from .board_share import BoardShareReository
+from .board_task_counter import BoardTaskCounterRepository
 from .list import ListRepository
 from .card import CardRepository
 from .comment import CommentRepository
+from .outbox import OutboxRepository
 from .factory import SQLAlchemyRepositoryFactory, BaseRepositoryFactory
+from .unit_of_work import UnitOfWork
@@ -1,11 +1,13 @@
 from abc import ABC, abstractmethod
 from http.client import HTTPException
-from typing import Any, Sequence
+from typing import Any, Awaitable, Callable, Sequence
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import delete, insert, select, update
 from fastapi import HTTPException
 
+from .unit_of_work import after_commit
+
 
 class BaseRepository(ABC):
     @abstractmethod
@@ -25,6 +27,10 @@ class SqlAlchemyRepository(BaseRepository):
     def __init__(self, model: Any, session: AsyncSession):
         self.model = model
         self.session = session
+
+    async def after_commit(self, callback: Callable[[], Awaitable[None]]) -> None:
+        """Выполнить callback после коммита unit of work сессии (см. unit_of_work.after_commit)"""
+        await after_commit(self.session, callback)
     
     async def get_all(self, **kwargs) -> Sequence[Any]:
         """
@@ -51,8 +57,7 @@ class SqlAlchemyRepository(BaseRepository):
         try:
             model = self.model(**data)
             self.session.add(model)
-            await self.session.commit()
-            await self.session.refresh(model)
+            await self.session.flush()
             return model
         except Exception as e:
             raise HTTPException(status_code=400, detail=f"Invalid data: {e}")
@@ -61,8 +66,43 @@ class SqlAlchemyRepository(BaseRepository):
         try:
             for field, value in update_data.items():
                 setattr(model, field, value)
-            await self.session.commit()
-            await self.session.refresh(model)
+            await self.session.flush()
             return model
         except Exception as e:
             raise HTTPException(status_code=400, detail=f"Invalid data: {e}")
+
+    async def create_many(self, rows: list[dict]) -> Sequence[Any]:
+        """
+        Создает записи многострочным INSERT ... RETURNING (SQLAlchemy разбивает большие наборы на пачки).
+        Записи возвращаются в порядке rows.
+        """
+        if not rows:
+            return []
+        try:
+            query = insert(self.model).returning(self.model, sort_by_parameter_order=True)
+            return (await self.session.scalars(query, rows)).all()
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Invalid data: {e}")
+
+    async def update_many(self, rows: list[dict]) -> None:
+        """
+        Обновляет записи по первичному ключу (executemany UPDATE); каждый словарь должен содержать id.
+        Загруженные в сессию объекты не обновляются - перечитайте их с populate_existing.
+        """
+        if not rows:
+            return
+        try:
+            await self.session.execute(update(self.model), rows)
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Invalid data: {e}")
+
+    async def delete_many(self, ids: set[int]) -> None:
+        """
+        Удаляет записи по id одним DELETE. Каскады ORM не выполняются: зависимые строки удаляет вызывающий.
+        """
+        if not ids:
+            return
+        try:
+            await self.session.execute(delete(self.model).where(self.model.id.in_(ids)))
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Invalid data: {e}")
@@ -1,12 +1,14 @@
-from typing import Sequence
+from typing import Literal, Sequence
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import Row, select, union
+from sqlalchemy.orm import contains_eager, joinedload, noload, selectinload
 from fastapi import HTTPException
 
-from src.models import Board
+from src.models import Board, BoardList, BoardShare, BoardTombstone, Card, Comment
 from .base import SqlAlchemyRepository
+from .board_share import board_access_type, board_share_join
+from .board_version import BoardVersionRepository
 
 
 class BoardRepository(SqlAlchemyRepository):
@@ -14,6 +16,7 @@ class BoardRepository(SqlAlchemyRepository):
 
     def __init__(self, session: AsyncSession):
         super().__init__(Board, session)
+        self.versions = BoardVersionRepository(session)
 
     async def get_boards_with_lists(self, user_id: int) -> Sequence[Board]:
         try:
@@ -22,6 +25,40 @@ class BoardRepository(SqlAlchemyRepository):
         except Exception as e:
             raise HTTPException(status_code=400, detail=f"Invalid filter: {e}")
 
+    async def get_user_boards(
+        self,
+        user_id: int,
+        skip: int = 0,
+        limit: int | None = None,
+        sort: Literal["updated_at", "-updated_at"] | None = None,
+    ) -> Sequence[tuple[Board, str]]:
+        """
+        Boards owned by or shared with the user, with their lists and the user's access type.
+        Owned and shared board ids are combined with UNION, lists are loaded by one selectin query.
+        """
+        try:
+            accessible = union(
+                select(Board.id.label("board_id")).where(Board.owner_id == user_id),
+                select(BoardShare.board_id).where(BoardShare.user_id == user_id),
+            ).subquery()
+            query = (
+                select(Board, board_access_type(user_id))
+                .join(accessible, accessible.c.board_id == Board.id)
+                .outerjoin(BoardShare, board_share_join(user_id))
+                .options(selectinload(Board.lists))
+            )
+            if sort == "updated_at":
+                query = query.order_by(Board.updated_at, Board.id)
+            elif sort == "-updated_at":
+                query = query.order_by(Board.updated_at.desc(), Board.id.desc())
+            else:
+                # Owned boards first, as before
+                query = query.order_by(Board.owner_id != user_id, Board.id)
+            query = query.offset(skip).limit(limit)
+            return (await self.session.execute(query)).tuples().all()
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Invalid filter: {e}")
+
     async def get_board_with_lists(self, board_id: int) -> Board | None:
         try:
             query = select(Board).where(Board.id == board_id).options(selectinload(Board.lists))
@@ -29,12 +66,132 @@ class BoardRepository(SqlAlchemyRepository):
         except Exception as e:
             raise HTTPException(status_code=400, detail=f"Invalid filter: {e}")
 
+    async def get_board_with_access(self, board_id: int, user_id: int) -> tuple[Board, str | None] | None:
+        """
+        Load the board together with the user's access type in a single statement.
+        """
+        try:
+            query = (
+                select(Board, board_access_type(user_id))
+                .outerjoin(BoardShare, board_share_join(user_id))
+                .where(Board.id == board_id)
+            )
+            row = (await self.session.execute(query)).first()
+            return (row[0], row[1]) if row else None
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Invalid filter: {e}")
+
+    async def get_access_type(self, board_id: int, user_id: int) -> tuple[int, str | None] | None:
+        """
+        Only the user's access type to the board, without loading the board itself.
+        Returns None when the board does not exist.
+        """
+        try:
+            query = (
+                select(Board.id, board_access_type(user_id))
+                .outerjoin(BoardShare, board_share_join(user_id))
+                .where(Board.id == board_id)
+            )
+            row = (await self.session.execute(query)).first()
+            return (row[0], row[1]) if row else None
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Invalid filter: {e}")
+
+    async def get_board_version(self, board_id: int, user_id: int) -> Row | None:
+        """
+        (version, updated_at, access_type) of the board: what its ETag is built from,
+        read by primary key without loading the board tree.
+        """
+        try:
+            query = (
+                select(Board.version, Board.updated_at, board_access_type(user_id))
+                .outerjoin(BoardShare, board_share_join(user_id))
+                .where(Board.id == board_id)
+            )
+            return (await self.session.execute(query)).first()
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Invalid filter: {e}")
+
+    async def get_board_snapshot(
+        self, board_id: int, user_id: int, include_cards: bool = True
+    ) -> tuple[Board, str | None] | None:
+        """
+        Load the board with its ordered lists (and cards with assignees) together with
+        the user's access type in a single statement.
+        """
+        try:
+            query = (
+                select(Board, board_access_type(user_id))
+                .outerjoin(BoardShare, board_share_join(user_id))
+                .outerjoin(Board.lists)
+                .where(Board.id == board_id)
+            )
+            if include_cards:
+                query = (
+                    query.outerjoin(BoardList.cards)
+                    .outerjoin(Card.assignee)
+                    .options(
+                        contains_eager(Board.lists)
+                        .contains_eager(BoardList.cards)
+                        .options(contains_eager(Card.assignee), noload(Card.comments))
+                    )
+                    .order_by(BoardList.position, Card.position, Card.id)
+                )
+            else:
+                query = query.options(contains_eager(Board.lists)).order_by(BoardList.position)
+            row = (await self.session.execute(query)).unique().first()
+            return (row[0], row[1]) if row else None
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Invalid filter: {e}")
+
+    async def get_board_changes(
+        self, board_id: int, since: int
+    ) -> tuple[Sequence[BoardList], Sequence[Card], Sequence[Comment], Sequence[BoardTombstone]]:
+        """
+        Lists, cards and comments of the board changed after version `since`, and tombstones of
+        those deleted after it. Each query is served by the (parent id, version) index of its table.
+        """
+        try:
+            lists = await self.session.execute(
+                select(BoardList)
+                .where(BoardList.board_id == board_id, BoardList.version > since)
+                .order_by(BoardList.position)
+            )
+            cards = await self.session.execute(
+                select(Card)
+                .join(BoardList, Card.list_id == BoardList.id)
+                .where(BoardList.board_id == board_id, Card.version > since)
+                .options(joinedload(Card.assignee), noload(Card.comments))
+                .order_by(Card.list_id, Card.position, Card.id)
+            )
+            comments = await self.session.execute(
+                select(Comment)
+                .join(Card, Comment.card_id == Card.id)
+                .join(BoardList, Card.list_id == BoardList.id)
+                .where(BoardList.board_id == board_id, Comment.version > since)
+                .options(joinedload(Comment.user))
+                .order_by(Comment.created_at, Comment.id)
+            )
+            tombstones = await self.session.execute(
+                select(BoardTombstone)
+                .where(BoardTombstone.board_id == board_id, BoardTombstone.version > since)
+                .order_by(BoardTombstone.version)
+            )
+            return (
+                lists.scalars().all(),
+                cards.scalars().all(),
+                comments.scalars().all(),
+                tombstones.scalars().all(),
+            )
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Invalid filter: {e}")
+
     async def update_board(self, board: Board, update_data: dict) -> Board:
         try:
+            board.version = await self.versions.bump(board.id)
             for field, value in update_data.items():
                 setattr(board, field, value)
-            await self.session.commit()
-            await self.session.refresh(board)
+            await self.session.flush()
             return board
         except Exception as e:
             raise HTTPException(status_code=400, detail=f"Invalid data: {e}")
@@ -44,6 +201,6 @@ class BoardRepository(SqlAlchemyRepository):
             db_board = await self.get_board_with_lists(board_id)
             if db_board:
                 await self.session.delete(db_board)
-                await self.session.commit()
+                await self.session.flush()
         except Exception as e:
             raise HTTPException(status_code=400, detail=f"Error when deleting board: {e}")
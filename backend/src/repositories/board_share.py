@@ -1,14 +1,28 @@
 from typing import Sequence
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import and_, case, select, union
 from sqlalchemy.orm import joinedload
 from fastapi import HTTPException
 
-from src.models import BoardShare
+from src.models import Board, BoardShare
 from .base import SqlAlchemyRepository
 
 
+def board_share_join(user_id: int):
+    """Условие outer join доски с записью о доступе конкретного пользователя"""
+    return and_(BoardShare.board_id == Board.id, BoardShare.user_id == user_id)
+
+
+def board_access_type(user_id: int):
+    """
+    Эффективный тип доступа пользователя к доске: "owner" для владельца,
+    иначе access_type из board_share (NULL, если доступа нет).
+    Используется вместе с outerjoin(BoardShare, board_share_join(user_id)).
+    """
+    return case((Board.owner_id == user_id, "owner"), else_=BoardShare.access_type).label("access_type")
+
+
 class BoardShareReository(SqlAlchemyRepository):
     model: BoardShare
 
@@ -19,10 +33,19 @@ class BoardShareReository(SqlAlchemyRepository):
         """Удалить доступ пользователя к доске"""
         try:
             await self.session.delete(db_board_share)
-            await self.session.commit()
+            await self.session.flush()
         except Exception as e:
             raise HTTPException(status_code=400, detail=f"Error when deleting board share: {e}")
 
+    async def get_board_member_ids(self, board_id: int, user_ids: set[int]) -> set[int]:
+        """Id из user_ids, у которых есть доступ к доске: владелец и пользователи с board_share"""
+        query = union(
+            select(Board.owner_id).where(Board.id == board_id, Board.owner_id.in_(user_ids)),
+            select(BoardShare.user_id).where(BoardShare.board_id == board_id, BoardShare.user_id.in_(user_ids)),
+        )
+        result = await self.session.execute(query)
+        return set(result.scalars().all())
+
     async def get_board_shares_with_user_info(self, board_id: int) -> Sequence[BoardShare]:
         """Получить список всех пользователей с доступом к доске, включая информацию о пользователях"""
         try:
@@ -0,0 +1,62 @@
+import asyncio
+from weakref import WeakValueDictionary
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import settings
+from src.models import BoardTaskCounter
+from .base import SqlAlchemyRepository
+
+# Task number blocks reserved by this process: board_id -> (next value, last reserved value)
+_task_number_blocks: dict[int, tuple[int, int]] = {}
+# Block refills of one board wait for each other; other boards are not blocked. A lock lives while someone holds it
+_task_number_locks: WeakValueDictionary[int, asyncio.Lock] = WeakValueDictionary()
+
+
+class BoardTaskCounterRepository(SqlAlchemyRepository):
+    model: BoardTaskCounter
+
+    def __init__(self, session: AsyncSession):
+        super().__init__(BoardTaskCounter, session)
+
+    async def allocate(self, board_id: int, count: int = 1) -> int:
+        """
+        Reserve `count` task numbers on the board with a single UPSERT ... RETURNING.
+        Returns the last reserved number.
+        """
+        stmt = (
+            insert(BoardTaskCounter)
+            .values(board_id=board_id, last_value=count)
+            .on_conflict_do_update(
+                index_elements=[BoardTaskCounter.board_id],
+                set_={"last_value": BoardTaskCounter.last_value + count, "updated_at": func.now()},
+            )
+            .returning(BoardTaskCounter.last_value)
+        )
+        return (await self.session.execute(stmt)).scalar_one()
+
+    async def next_task_number(self, board_id: int) -> int:
+        """
+        Next task number of the board.
+
+        With TASK_NUMBER_BLOCK_SIZE > 1 numbers are reserved in blocks committed in a separate
+        transaction and handed out from process memory; unused numbers of a block are lost on
+        restart, so numbering may have gaps.
+        """
+        block_size = settings.TASK_NUMBER_BLOCK_SIZE
+        if block_size <= 1:
+            return await self.allocate(board_id)
+
+        if (lock := _task_number_locks.get(board_id)) is None:
+            lock = _task_number_locks[board_id] = asyncio.Lock()
+        async with lock:
+            next_value, last_value = _task_number_blocks.get(board_id, (1, 0))
+            if next_value > last_value:
+                async with AsyncSession(bind=self.session.bind) as block_session:
+                    last_value = await BoardTaskCounterRepository(block_session).allocate(board_id, block_size)
+                    await block_session.commit()
+                next_value = last_value - block_size + 1
+            _task_number_blocks[board_id] = (next_value + 1, last_value)
+            return next_value
@@ -0,0 +1,96 @@
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.snapshot_cache import board_snapshot_cache
+from src.models import Board, BoardList, BoardTombstone, Card
+from .unit_of_work import after_commit
+
+
+class BoardVersionRepository:
+    """
+    Per-board change counter behind GET /boards/{id}/changes.
+
+    Every change of a list, card, comment or the board itself increments board.version within the same transaction
+    and stamps the changed rows (or a tombstone) with the new value. The UPDATE keeps the board row
+    locked until commit, so versions of one board become visible strictly in order and a client
+    that has seen version N never misses a change numbered N or lower.
+
+    The cached snapshot of the previous version is dropped after the commit (see unit_of_work.after_commit):
+    until then readers still see that version, and a snapshot cached meanwhile is removed by the callback.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def _bump(self, board_id) -> tuple[int, int]:
+        result = await self.session.execute(
+            update(Board)
+            .where(Board.id == board_id)
+            .values(version=Board.version + 1)
+            .returning(Board.id, Board.version)
+            .execution_options(synchronize_session=False)
+        )
+        board_id, version = result.one()
+        await after_commit(self.session, lambda: board_snapshot_cache.invalidate(board_id, version - 1))
+        return board_id, version
+
+    async def bump(self, board_id: int) -> int:
+        """Next version of the board."""
+        _, version = await self._bump(board_id)
+        return version
+
+    async def bump_for_list(self, list_id: int) -> tuple[int, int]:
+        """(board id, next version) of the board the list belongs to."""
+        return await self._bump(select(BoardList.board_id).where(BoardList.id == list_id).scalar_subquery())
+
+    async def bump_for_card(self, card_id: int) -> tuple[int, int]:
+        """(board id, next version) of the board the card belongs to."""
+        return await self._bump(
+            select(BoardList.board_id)
+            .join(Card, Card.list_id == BoardList.id)
+            .where(Card.id == card_id)
+            .scalar_subquery()
+        )
+
+    async def bump_for_assignee(self, user_id: int) -> None:
+        """
+        Bump every board with cards assigned to the user and stamp those cards with the new version,
+        so that snapshots and changes, which embed the assignee's username and email, pick up a profile change.
+        Boards are bumped in id order to keep the row locks of concurrent calls in one order.
+        """
+        board_ids = await self.session.scalars(
+            select(BoardList.board_id)
+            .join(Card, Card.list_id == BoardList.id)
+            .where(Card.assignee_id == user_id)
+            .distinct()
+            .order_by(BoardList.board_id)
+        )
+        for board_id in board_ids.all():
+            version = await self.bump(board_id)
+            await self.session.execute(
+                update(Card)
+                .where(
+                    Card.assignee_id == user_id,
+                    Card.list_id.in_(select(BoardList.id).where(BoardList.board_id == board_id)),
+                )
+                .values(version=version)
+                .execution_options(synchronize_session=False)
+            )
+
+    async def add_tombstone(self, board_id: int, entity_type: str, entity_id: int, version: int) -> None:
+        await self.session.execute(
+            insert(BoardTombstone).values(
+                board_id=board_id, entity_type=entity_type, entity_id=entity_id, version=version
+            )
+        )
+
+    async def add_tombstones(self, board_id: int, entity_type: str, entity_ids: set[int], version: int) -> None:
+        if not entity_ids:
+            return
+        await self.session.execute(
+            insert(BoardTombstone),
+            [
+                {"board_id": board_id, "entity_type": entity_type, "entity_id": entity_id, "version": version}
+                for entity_id in entity_ids
+            ],
+        )
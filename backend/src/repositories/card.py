@@ -1,12 +1,37 @@
 from typing import List
 
-from sqlalchemy import select, text, update
+from sqlalchemy import Float, Integer, Row, and_, column, delete, func, insert, or_, select, tuple_, update, values
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import aliased, joinedload
+from sqlalchemy.orm.attributes import set_committed_value
 
-from src.models import Card, BoardList
-from src.schemas.card import CardCreate, CardUpdate
+from src.models import Board, BoardList, BoardShare, Card, Comment, User
+from src.schemas.card import CardBatchUpdate, CardCreate, CardMove, CardUpdate
 from .base import SqlAlchemyRepository
+from .board_share import board_access_type, board_share_join
+from .board_task_counter import BoardTaskCounterRepository
+from .board_version import BoardVersionRepository
+
+# Cards are ordered by fractional positions: a card dropped between two others gets
+# the midpoint of their positions, so a move rewrites only the moved row.
+POSITION_STEP = 1024.0
+MIN_POSITION_GAP = 1e-6
+
+
+def position_between(before: float | None, after: float | None) -> float | None:
+    """
+    Position for a card placed between two neighbours (None means the list edge).
+    Returns None when the gap is exhausted and the list has to be rebalanced.
+    """
+    if before is None and after is None:
+        return 0.0
+    if before is None:
+        return after - POSITION_STEP
+    if after is None:
+        return before + POSITION_STEP
+    if after - before < MIN_POSITION_GAP:
+        return None
+    return (before + after) / 2
 
 
 class CardRepository(SqlAlchemyRepository):
@@ -14,6 +39,8 @@ class CardRepository(SqlAlchemyRepository):
 
     def __init__(self, session: AsyncSession):
         super().__init__(Card, session)
+        self.task_numbers = BoardTaskCounterRepository(session)
+        self.versions = BoardVersionRepository(session)
 
     async def get_list_cards(self, list_id: int) -> List[Card]:
         """
@@ -28,119 +55,350 @@ class CardRepository(SqlAlchemyRepository):
         cards = result.scalars().all()
         return cards
 
-    async def create_card(self, card_in: CardCreate) -> Card:
+    async def get_card_with_access(
+        self, card_id: int, user_id: int
+    ) -> tuple[Card, BoardList, Board, str | None] | None:
         """
-        Create a new card.
+        Resolve card -> list -> board and the user's access type to the board in a single join.
         """
-        # Get the current highest position in the list
         result = await self.session.execute(
-            select(Card).where(Card.list_id == card_in.list_id).order_by(Card.position.desc()).limit(1)
+            select(Card, BoardList, Board, board_access_type(user_id))
+            .join(BoardList, Card.list_id == BoardList.id)
+            .join(Board, BoardList.board_id == Board.id)
+            .outerjoin(BoardShare, board_share_join(user_id))
+            .where(Card.id == card_id)
         )
-        last_card = result.scalar_one_or_none()
-        new_position = (last_card.position + 1) if last_card else 0
-
-        # Получаем информацию о списке чтобы знать ID доски
-        list_result = await self.session.execute(select(BoardList).where(BoardList.id == card_in.list_id))
-        list_obj = list_result.scalar_one()
+        row = result.first()
+        return tuple(row) if row else None
 
-        sequence_name = f"task_seq_board_{list_obj.board_id}"
-
-        # Создаем последовательность, если её нет
-        await self.session.execute(text(f"CREATE SEQUENCE IF NOT EXISTS {sequence_name} START 1"))
+    async def create_card(self, card_in: CardCreate, board_id: int) -> Card:
+        """
+        Create a new card at the end of the list.
 
-        # Получаем следующее значение ID
-        card_id = (await self.session.execute(text(f"SELECT nextval('{sequence_name}')"))).scalar()
+        The task number comes from the board counter and the position is computed inside
+        the INSERT ... RETURNING, so no DDL or extra lookups run on the insert path.
+        """
+        card_id = await self.task_numbers.next_task_number(board_id)
+        version = await self.versions.bump(board_id)
 
-        db_card = Card(
-            card_id=card_id,
-            title=card_in.title,
-            description=card_in.description,
-            list_id=card_in.list_id,
-            position=new_position,
+        last_position = select(func.max(Card.position)).where(Card.list_id == card_in.list_id).scalar_subquery()
+        result = await self.session.execute(
+            insert(Card)
+            .values(
+                card_id=card_id,
+                title=card_in.title,
+                description=card_in.description,
+                list_id=card_in.list_id,
+                position=func.coalesce(last_position + POSITION_STEP, 0.0),
+                version=version,
+            )
+            .returning(Card)
         )
-        self.session.add(db_card)
-        await self.session.commit()
-        await self.session.refresh(db_card)
-        return db_card
-    
+        return result.scalar_one()
+
     async def update_card(self, db_card: Card, card_in: CardUpdate) -> Card:
         """
         Update a card.
         """
         update_data = card_in.model_dump(exclude_unset=True)
 
+        _, version = await self.versions.bump_for_list(db_card.list_id)
+        db_card.version = version
         for field, value in update_data.items():
             setattr(db_card, field, value)
 
-        await self.session.commit()
-        await self.session.refresh(db_card)
+        await self.session.flush()
         return db_card
     
     async def delete_card(self, card_id: int) -> None:
         """
         Delete a card.
 
-    The task numbers (LA-XXX) remain consistent for existing cards.
-    Next task number after deletion will continue the sequence.
-    """
+        Positions are fractional, so the remaining cards keep their positions.
+        The task numbers (LA-XXX) remain consistent for existing cards.
+        Next task number after deletion will continue the sequence.
+        """
         card = await self.get_one(id=card_id)
         if card:
-            stmt = (
-                update(Card)
-                .where(Card.list_id == card.list_id and Card.position > card.position)
-                .values(position=card.position)
-            )
+            board_id, version = await self.versions.bump_for_list(card.list_id)
+            await self.versions.add_tombstone(board_id, "card", card.id, version)
+            await self.session.delete(card)
+            await self.session.flush()
 
-        await self.session.execute(stmt)
+    async def get_neighbour_positions(
+        self, list_id: int, index: int, exclude_card_id: int | None = None
+    ) -> tuple[float | None, float | None]:
+        """
+        Positions of the cards that would surround a card inserted at `index` of the list.
+        """
+        filters = [Card.list_id == list_id]
+        if exclude_card_id is not None:
+            filters.append(Card.id != exclude_card_id)
+        query = select(Card.position).where(*filters).order_by(Card.position, Card.id)
+
+        if index <= 0:
+            after = (await self.session.execute(query.limit(1))).scalar_one_or_none()
+            return None, after
 
-        await self.session.delete(card)
-        await self.session.commit()
+        positions = (await self.session.execute(query.offset(index - 1).limit(2))).scalars().all()
+        if not positions:
+            # Index is past the end of the list: append after the last card
+            last = await self.session.execute(select(func.max(Card.position)).where(*filters))
+            return last.scalar(), None
+        return positions[0], positions[1] if len(positions) > 1 else None
+
+    async def rebalance_list_positions(self, list_id: int, version: int) -> None:
+        """
+        Spread card positions of a list evenly again (one UPDATE for the whole list).
+        Needed only when repeated inserts into the same gap exhaust float precision.
+        `version` is the board version the rewritten cards are stamped with.
+        """
+        ranked = (
+            select(
+                Card.id,
+                (func.row_number().over(order_by=(Card.position, Card.id)) - 1).label("rank"),
+            )
+            .where(Card.list_id == list_id)
+            .subquery()
+        )
+        await self.session.execute(
+            update(Card)
+            .where(Card.id == ranked.c.id)
+            .values(position=ranked.c.rank * POSITION_STEP, version=version)
+            .execution_options(synchronize_session="fetch")
+        )
 
     async def move_card(self, card_id: int, target_list_id: int, new_position: int) -> Card | None:
         """
         Move a card to a new position and/or list.
+
+        `new_position` is the index of the card in the target list; only the moved row is written.
         """
         card = await self.get_one(id=card_id)
         if not card:
             return None
 
-        old_position = card.position
-        old_list_id = card.list_id
+        _, version = await self.versions.bump_for_list(target_list_id)
+        before, after = await self.get_neighbour_positions(target_list_id, new_position, card_id)
+        position = position_between(before, after)
+        if position is None:
+            await self.rebalance_list_positions(target_list_id, version)
+            before, after = await self.get_neighbour_positions(target_list_id, new_position, card_id)
+            position = position_between(before, after)
+
+        card.list_id = target_list_id
+        card.position = position
+        card.version = version
+        await self.session.flush()
+
+        return card
+
+    async def get_board_cards(self, board_id: int, card_ids: set[int]) -> dict[int, Row]:
+        """
+        Map card id -> (id, list_id, assignee_id) for the cards from card_ids that belong to the board.
+        """
+        result = await self.session.execute(
+            select(Card.id, Card.list_id, Card.assignee_id)
+            .join(BoardList, Card.list_id == BoardList.id)
+            .where(Card.id.in_(card_ids), BoardList.board_id == board_id)
+        )
+        return {row.id: row for row in result}
+
+    async def get_notification_targets(self, card_ids: set[int]) -> dict[int, Row]:
+        """
+        Map card id -> what an assignee notification needs (task number, title, board, assignee
+        email and username) for the assigned cards from card_ids, in one query.
+        """
+        result = await self.session.execute(
+            select(
+                Card.id,
+                Card.card_id,
+                Card.title,
+                Card.assignee_id,
+                Board.id.label("board_id"),
+                Board.title.label("board_title"),
+                User.email,
+                User.username,
+            )
+            .join(BoardList, Card.list_id == BoardList.id)
+            .join(Board, BoardList.board_id == Board.id)
+            .join(User, Card.assignee_id == User.id)
+            .where(Card.id.in_(card_ids))
+        )
+        return {row.id: row for row in result}
+
+    async def batch_move_cards(self, moves: List[CardMove], card_lists: dict[int, int]) -> List[Card]:
+        """
+        Apply a sequence of moves (a multi-select drag, "sort list by X") in one transaction.
+
+        Moves are applied in order to the in-memory ordering of the affected lists, and the
+        resulting positions are written with a single UPDATE ... FROM (VALUES ...).
+        `card_lists` maps every moved card to its current list (see get_board_cards).
+        """
+        list_ids = set(card_lists.values()) | {move.target_list_id for move in moves}
+        _, version = await self.versions.bump_for_list(moves[0].target_list_id)
+        result = await self.session.execute(
+            select(Card.id, Card.list_id, Card.position)
+            .where(Card.list_id.in_(list_ids))
+            .order_by(Card.position, Card.id)
+        )
+        orders: dict[int, list[list]] = {list_id: [] for list_id in list_ids}
+        entries: dict[int, list] = {}
+        for card_id, list_id, position in result:
+            entries[card_id] = [card_id, list_id, position]
+            orders[list_id].append(entries[card_id])
+
+        changed: set[int] = set()
+        for move in moves:
+            entry = entries[move.card_id]
+            orders[entry[1]].remove(entry)
 
-        if old_list_id != target_list_id:
-            # Освобождаем место в старом списке
-            await self.session.execute(
-                update(Card)
-                .where((Card.list_id == old_list_id) & (Card.position > old_position))
-                .values(position=Card.position - 1)
+            target = orders[move.target_list_id]
+            index = min(max(move.new_position, 0), len(target))
+            position = position_between(
+                target[index - 1][2] if index > 0 else None,
+                target[index][2] if index < len(target) else None,
             )
+            entry[1] = move.target_list_id
+            target.insert(index, entry)
+            changed.add(move.card_id)
+
+            if position is None:
+                # Gap exhausted: renumber the target list as part of the same UPDATE
+                for rank, list_entry in enumerate(target):
+                    list_entry[2] = rank * POSITION_STEP
+                    changed.add(list_entry[0])
+            else:
+                entry[2] = position
 
-            # Сдвигаем позиции в новом списке
-            await self.session.execute(
-                update(Card)
-                .where((Card.list_id == target_list_id) & (Card.position >= new_position))
-                .values(position=Card.position + 1)
+        moved = values(
+            column("id", Integer), column("list_id", Integer), column("position", Float), name="moved"
+        ).data([tuple(entries[card_id]) for card_id in changed])
+        await self.session.execute(
+            update(Card)
+            .where(Card.id == moved.c.id)
+            .values(list_id=moved.c.list_id, position=moved.c.position, version=version)
+            .execution_options(synchronize_session=False)
+        )
+
+        result = await self.session.execute(
+            select(Card)
+            .options(joinedload(Card.assignee))
+            .where(Card.id.in_({move.card_id for move in moves}))
+            .order_by(Card.list_id, Card.position)
+            .execution_options(populate_existing=True)
+        )
+        return result.scalars().all()
+
+    async def get_cards_with_assignees(self, card_ids: set[int]) -> List[Card]:
+        """
+        Cards by id with their assignees, re-read over the state in the session (bulk writes bypass it).
+        """
+        result = await self.session.execute(
+            select(Card)
+            .options(joinedload(Card.assignee))
+            .where(Card.id.in_(card_ids))
+            .order_by(Card.list_id, Card.position)
+            .execution_options(populate_existing=True)
+        )
+        return result.scalars().all()
+
+    async def create_cards(self, cards_in: List[CardCreate], board_id: int) -> List[Card]:
+        """
+        Create cards of one board (imports, scripts) with a multi-row INSERT ... RETURNING.
+
+        Task numbers are reserved with a single counter UPSERT and the board version is bumped once;
+        cards are appended to the end of their lists in the order given.
+        """
+        last_number = await self.task_numbers.allocate(board_id, len(cards_in))
+        version = await self.versions.bump(board_id)
+
+        result = await self.session.execute(
+            select(Card.list_id, func.max(Card.position))
+            .where(Card.list_id.in_({card_in.list_id for card_in in cards_in}))
+            .group_by(Card.list_id)
+        )
+        last_positions = dict(result.all())
+
+        rows = []
+        for card_id, card_in in enumerate(cards_in, start=last_number - len(cards_in) + 1):
+            last_position = last_positions.get(card_in.list_id)
+            position = 0.0 if last_position is None else last_position + POSITION_STEP
+            last_positions[card_in.list_id] = position
+            rows.append(
+                {
+                    "card_id": card_id,
+                    "title": card_in.title,
+                    "description": card_in.description,
+                    "list_id": card_in.list_id,
+                    "position": position,
+                    "version": version,
+                }
             )
 
-            card.list_id = target_list_id
+        cards = await self.create_many(rows)
+        for card in cards:
+            set_committed_value(card, "assignee", None)
+        return cards
 
-        else:
-            if old_position < new_position:
-                # Двигаем вперёд
-                await self.session.execute(
-                    update(Card)
-                    .where((Card.list_id == old_list_id) & (Card.position > old_position) & (Card.position <= new_position))
-                    .values(position=Card.position - 1)
-                )
-            elif old_position > new_position:
-                # Двигаем назад
-                await self.session.execute(
-                    update(Card)
-                    .where((Card.list_id == old_list_id) & (Card.position >= new_position) & (Card.position < old_position))
-                    .values(position=Card.position + 1)
-                )
+    async def update_cards(self, cards_in: List[CardBatchUpdate], board_id: int) -> List[Card]:
+        """
+        Update cards of one board with a single executemany UPDATE by primary key.
+        """
+        version = await self.versions.bump(board_id)
+        await self.update_many(
+            [{**card_in.model_dump(exclude_unset=True), "version": version} for card_in in cards_in]
+        )
+        return await self.get_cards_with_assignees({card_in.id for card_in in cards_in})
+
+    async def delete_cards(self, card_ids: set[int], board_id: int) -> None:
+        """
+        Delete cards of one board and their comments, leaving a tombstone for each card.
+        """
+        version = await self.versions.bump(board_id)
+        await self.versions.add_tombstones(board_id, "card", card_ids, version)
+        await self.session.execute(delete(Comment).where(Comment.card_id.in_(card_ids)))
+        await self.delete_many(card_ids)
 
-        card.position = new_position
-        await self.session.commit()
+    async def search_cards(
+        self, user_id: int, query: str, limit: int, after: int | None = None
+    ) -> list[tuple[Card, Board]]:
+        """
+        Cards matching the full-text query on boards the user owns or is shared on, with their boards,
+        best matches first (ts_rank_cd over the weighted title/description vector, ties by id).
 
-        return card
+        Matching is served by the GIN index on card.search_vector. `after` is the id of the last card
+        of the previous page: its rank is recomputed in SQL and used as a (rank, id) keyset cursor.
+        The cursor card must be on a board the user can access as well, otherwise the page is empty.
+        """
+        tsquery = func.websearch_to_tsquery("simple", query)
+        rank = func.ts_rank_cd(Card.search_vector, tsquery)
+        stmt = (
+            select(Card, Board)
+            .join(BoardList, Card.list_id == BoardList.id)
+            .join(Board, BoardList.board_id == Board.id)
+            .outerjoin(BoardShare, board_share_join(user_id))
+            .where(
+                Card.search_vector.op("@@")(tsquery),
+                or_(Board.owner_id == user_id, BoardShare.id.is_not(None)),
+            )
+        )
+        if after is not None:
+            cursor = aliased(Card)
+            cursor_list = aliased(BoardList)
+            cursor_board = aliased(Board)
+            cursor_share = aliased(BoardShare)
+            stmt = (
+                stmt.join(cursor, cursor.id == after)
+                .join(cursor_list, cursor.list_id == cursor_list.id)
+                .join(cursor_board, cursor_list.board_id == cursor_board.id)
+                .outerjoin(
+                    cursor_share, and_(cursor_share.board_id == cursor_board.id, cursor_share.user_id == user_id)
+                )
+                .where(
+                    or_(cursor_board.owner_id == user_id, cursor_share.id.is_not(None)),
+                    tuple_(rank, Card.id) < tuple_(func.ts_rank_cd(cursor.search_vector, tsquery), cursor.id),
+                )
+            )
+        stmt = stmt.order_by(rank.desc(), Card.id.desc()).limit(limit)
+        return (await self.session.execute(stmt)).tuples().all()
@@ -2,7 +2,10 @@ from src.schemas.comment import CommentUpdate
 from src.repositories import SqlAlchemyRepository
 from src.models import Comment
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, tuple_
+from sqlalchemy.orm import aliased, joinedload
+
+from .board_version import BoardVersionRepository
 
 
 class CommentRepository(SqlAlchemyRepository):
@@ -10,25 +13,62 @@ class CommentRepository(SqlAlchemyRepository):
 
     def __init__(self, session: AsyncSession):
         super().__init__(Comment, session)
+        self.versions = BoardVersionRepository(session)
 
 
-    async def get_card_comments(self, card_id: int) -> list[Comment]:
-        query = select(Comment).where(Comment.card_id == card_id).order_by(Comment.created_at)
+    async def get_comment(self, comment_id: int) -> Comment | None:
+        query = select(Comment).options(joinedload(Comment.user)).where(Comment.id == comment_id)
         result = await self.session.execute(query)
-        return result.scalars().all()
+        return result.scalar_one_or_none()
+
+
+    async def get_card_comments(
+        self, card_id: int, limit: int | None = None, before: int | None = None, after: int | None = None
+    ) -> list[Comment]:
+        """
+        Comments of the card with their authors, ordered by (created_at, id).
+
+        `before` / `after` are comment ids used as a keyset cursor: the page holds the `limit`
+        comments right before / after that comment, still in ascending order.
+        """
+        query = select(Comment).options(joinedload(Comment.user)).where(Comment.card_id == card_id)
+        key = tuple_(Comment.created_at, Comment.id)
+
+        if before is not None or after is not None:
+            cursor = aliased(Comment)
+            query = query.join(cursor, cursor.id == (before if before is not None else after))
+            cursor_key = tuple_(cursor.created_at, cursor.id)
+            query = query.where(key < cursor_key if before is not None else key > cursor_key)
+
+        if before is not None:
+            query = query.order_by(Comment.created_at.desc(), Comment.id.desc())
+        else:
+            query = query.order_by(Comment.created_at, Comment.id)
+        if limit is not None:
+            query = query.limit(limit)
+
+        comments = (await self.session.execute(query)).scalars().all()
+        return list(reversed(comments)) if before is not None else comments
+
+
+    async def create_comment(self, data: dict) -> Comment:
+        _, version = await self.versions.bump_for_card(data["card_id"])
+        return await self.create({**data, "version": version})
 
 
     async def update_comment(self, comment: Comment, comment_in: CommentUpdate) -> Comment:
         update_data = comment_in.dict(exclude_unset=True)
+        _, version = await self.versions.bump_for_card(comment.card_id)
+        comment.version = version
         for field, value in update_data.items():
             setattr(comment, field, value)
 
-        await self.session.commit()
-        await self.session.refresh(comment)
+        await self.session.flush()
         return comment
 
 
     async def delete_comment(self, comment: Comment) -> None:
+        board_id, version = await self.versions.bump_for_card(comment.card_id)
+        await self.versions.add_tombstone(board_id, "comment", comment.id, version)
         await self.session.delete(comment)
-        await self.session.commit()
-            
\ No newline at end of file
+        await self.session.flush()
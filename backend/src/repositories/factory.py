@@ -7,10 +7,14 @@ from .board_share import BoardShareReository
 from .list import ListRepository
 from .card import CardRepository
 from .comment import CommentRepository
+from .outbox import OutboxRepository
+from .unit_of_work import UnitOfWork
 
 class BaseRepositoryFactory(ABC):
     def __init__(self, session: AsyncSession):
         self.session = session
+        # Repositories of the factory share the session, so one unit of work commits all of them
+        self.uow = UnitOfWork(session)
 
 
 class SQLAlchemyRepositoryFactory(BaseRepositoryFactory):
@@ -30,4 +34,7 @@ class SQLAlchemyRepositoryFactory(BaseRepositoryFactory):
         return CardRepository(self.session)
 
     def create_comment_repository(self):
-        return CommentRepository(self.session)
\ No newline at end of file
+        return CommentRepository(self.session)
+
+    def create_outbox_repository(self):
+        return OutboxRepository(self.session)
\ No newline at end of file
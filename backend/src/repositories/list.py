@@ -1,15 +1,17 @@
 from typing import Sequence
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import Row, delete, func, select, update
 from sqlalchemy.orm import selectinload
 from fastapi import HTTPException
 
-from src.models import BoardList
+from src.models import Board, BoardList, BoardShare, Comment
 from src.models.card import Card
-from src.schemas.board import BoardListCreate, BoardListUpdate
+from src.schemas.board import BoardListBase, BoardListBatchUpdate, BoardListCreate, BoardListUpdate
 from src.schemas.list import ResponseBoardList
 from .base import SqlAlchemyRepository
+from .board_share import board_access_type, board_share_join
+from .board_version import BoardVersionRepository
 
 
 class ListRepository(SqlAlchemyRepository):
@@ -17,6 +19,7 @@ class ListRepository(SqlAlchemyRepository):
 
     def __init__(self, session: AsyncSession):
         super().__init__(BoardList, session)
+        self.versions = BoardVersionRepository(session)
 
     async def get_list(self, list_id: int, include_cards: bool = False) -> BoardList | None:
         query = select(BoardList)
@@ -26,6 +29,35 @@ class ListRepository(SqlAlchemyRepository):
         result = await self.session.execute(query)
         return result.scalar_one_or_none()
 
+    async def get_list_with_access(self, list_id: int, user_id: int) -> tuple[BoardList, Board, str | None] | None:
+        """
+        Resolve list -> board and the user's access type to the board in a single join.
+        """
+        result = await self.session.execute(
+            select(BoardList, Board, board_access_type(user_id))
+            .join(Board, BoardList.board_id == Board.id)
+            .outerjoin(BoardShare, board_share_join(user_id))
+            .where(BoardList.id == list_id)
+        )
+        row = result.first()
+        return tuple(row) if row else None
+
+    async def get_list_board_version(self, list_id: int, user_id: int) -> Row | None:
+        """
+        (board_id, title, version, updated_at, access_type) of the list's board for ETag checks,
+        in one indexed lookup without loading the list or the board.
+        """
+        result = await self.session.execute(
+            select(
+                Board.id.label("board_id"), Board.title, Board.version, Board.updated_at, board_access_type(user_id)
+            )
+            .select_from(BoardList)
+            .join(Board, BoardList.board_id == Board.id)
+            .outerjoin(BoardShare, board_share_join(user_id))
+            .where(BoardList.id == list_id)
+        )
+        return result.first()
+
     async def get_board_lists(self, board_id: int, include_cards: bool = False) -> Sequence[BoardList]:
         query = select(BoardList).where(BoardList.board_id == board_id)
         if include_cards:
@@ -35,25 +67,31 @@ class ListRepository(SqlAlchemyRepository):
         result = await self.session.execute(query)
         return result.scalars().all()
 
+    async def get_board_list_ids(self, board_id: int, list_ids: set[int]) -> set[int]:
+        """Ids from list_ids that belong to the board."""
+        query = select(BoardList.id).where(BoardList.id.in_(list_ids), BoardList.board_id == board_id)
+        result = await self.session.execute(query)
+        return set(result.scalars().all())
+
     async def create_list(self, list_in: BoardListCreate) -> BoardList:
         query = select(func.max(BoardList.position)).where(BoardList.board_id == list_in.board_id)
         result = await self.session.execute(query)
         max_position = result.scalar() or -1
         list_data = list_in.model_dump()
         list_data["position"] = max_position + 1
+        list_data["version"] = await self.versions.bump(list_in.board_id)
 
         db_list = BoardList(**list_data)
         self.session.add(db_list)
-        await self.session.commit()
-        await self.session.refresh(db_list)
+        await self.session.flush()
         return db_list
 
     async def update_list(self, db_list: BoardList, update_data: dict) -> BoardList:
+        db_list.version = await self.versions.bump(db_list.board_id)
         for field, value in update_data.items():
             setattr(db_list, field, value)
 
-        await self.session.commit()
-        await self.session.refresh(db_list)
+        await self.session.flush()
         return db_list
 
     async def delete_list(self, list_id: int) -> bool:
@@ -65,11 +103,14 @@ class ListRepository(SqlAlchemyRepository):
         result = await self.session.execute(query)
         higher_lists = result.scalars().all()
 
+        version = await self.versions.bump(list_obj.board_id)
         for l in higher_lists:
             l.position -= 1
+            l.version = version
 
+        await self.versions.add_tombstone(list_obj.board_id, "list", list_obj.id, version)
         await self.session.delete(list_obj)
-        await self.session.commit()
+        await self.session.flush()
         return True
 
     async def reorder_list(self, list_id: int, new_position: int) -> ResponseBoardList | None:
@@ -80,17 +121,82 @@ class ListRepository(SqlAlchemyRepository):
         board_lists = await self.get_board_lists(list_obj.board_id)
 
         old_position = list_obj.position
+        version = await self.versions.bump(list_obj.board_id)
         print(f"Reordering list {list_id} to position {new_position}")
         print(f"Old position: {old_position}")
         for l in board_lists:
             if old_position < new_position:
                 if l.position > old_position and l.position <= new_position:
                     l.position -= 1
+                    l.version = version
             else:
                 if l.position >= new_position and l.position < old_position:
                     l.position += 1
+                    l.version = version
 
         list_obj.position = new_position
-        await self.session.commit()
-        await self.session.refresh(list_obj)
+        list_obj.version = version
+        await self.session.flush()
         return list_obj
+
+    async def create_lists(self, lists_in: Sequence[BoardListBase], board_id: int) -> Sequence[BoardList]:
+        """
+        Append lists to the board in the order given with a multi-row INSERT ... RETURNING.
+        """
+        query = select(func.max(BoardList.position)).where(BoardList.board_id == board_id)
+        max_position = (await self.session.execute(query)).scalar()
+        if max_position is None:
+            max_position = -1
+        version = await self.versions.bump(board_id)
+
+        return await self.create_many(
+            [
+                {**list_in.model_dump(), "board_id": board_id, "position": max_position + index, "version": version}
+                for index, list_in in enumerate(lists_in, start=1)
+            ]
+        )
+
+    async def update_lists(self, lists_in: Sequence[BoardListBatchUpdate], board_id: int) -> Sequence[BoardList]:
+        """
+        Update titles and colors of the board's lists with a single executemany UPDATE by primary key.
+        Positions are changed by reorder_list only, so they stay dense.
+        """
+        version = await self.versions.bump(board_id)
+        await self.update_many(
+            [{**list_in.model_dump(exclude_unset=True), "version": version} for list_in in lists_in]
+        )
+        result = await self.session.execute(
+            select(BoardList)
+            .where(BoardList.id.in_({list_in.id for list_in in lists_in}))
+            .order_by(BoardList.position)
+            .execution_options(populate_existing=True)
+        )
+        return result.scalars().all()
+
+    async def delete_lists(self, list_ids: set[int], board_id: int) -> None:
+        """
+        Delete lists of the board with their cards and comments, then close the gaps in the positions
+        of the remaining lists with one UPDATE.
+        """
+        version = await self.versions.bump(board_id)
+        await self.versions.add_tombstones(board_id, "list", list_ids, version)
+
+        list_cards = select(Card.id).where(Card.list_id.in_(list_ids))
+        await self.session.execute(delete(Comment).where(Comment.card_id.in_(list_cards)))
+        await self.session.execute(delete(Card).where(Card.list_id.in_(list_ids)))
+        await self.delete_many(list_ids)
+
+        ranked = (
+            select(
+                BoardList.id,
+                (func.row_number().over(order_by=(BoardList.position, BoardList.id)) - 1).label("rank"),
+            )
+            .where(BoardList.board_id == board_id)
+            .subquery()
+        )
+        await self.session.execute(
+            update(BoardList)
+            .where(BoardList.id == ranked.c.id, BoardList.position != ranked.c.rank)
+            .values(position=ranked.c.rank, version=version)
+            .execution_options(synchronize_session=False)
+        )
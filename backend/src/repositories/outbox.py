@@ -0,0 +1,50 @@
+from datetime import UTC, datetime, timedelta
+from typing import Sequence
+
+from sqlalchemy import delete, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models import OutboxMessage
+from .base import SqlAlchemyRepository
+
+
+class OutboxRepository(SqlAlchemyRepository):
+    model: OutboxMessage
+
+    def __init__(self, session: AsyncSession):
+        super().__init__(OutboxMessage, session)
+
+    def add(self, topic: str, payload: dict) -> None:
+        """
+        Добавить сообщение в сессию без коммита: оно сохранится вместе с изменением,
+        которое закоммитит запрос, и пропадет при его откате.
+        """
+        self.session.add(OutboxMessage(topic=topic, payload=payload))
+
+    async def claim_batch(self, limit: int, topic: str, window: float = 0) -> Sequence[OutboxMessage]:
+        """
+        Заблокировать до конца транзакции сообщения до limit групп: сообщения topic группируются по карточке
+        (payload card_id) и забираются всей группой, когда старейшему исполнилось window секунд;
+        остальные темы забираются сразу. Строки, заблокированные другим relay, пропускаются.
+        """
+        card_id = OutboxMessage.payload["card_id"].as_integer()
+        cutoff = datetime.now(UTC).replace(tzinfo=None) - timedelta(seconds=window)
+        due_cards = (
+            select(card_id)
+            .where(OutboxMessage.topic == topic)
+            .group_by(card_id)
+            .having(func.min(OutboxMessage.created_at) <= cutoff)
+            .order_by(func.min(OutboxMessage.id))
+            .limit(limit)
+        )
+        query = (
+            select(OutboxMessage)
+            .where(or_(OutboxMessage.topic != topic, card_id.in_(due_cards)))
+            .order_by(OutboxMessage.id)
+            .with_for_update(skip_locked=True)
+        )
+        return (await self.session.execute(query)).scalars().all()
+
+    async def delete_batch(self, message_ids: list[int]) -> None:
+        """Удалить опубликованные сообщения (блокировки claim_batch снимает коммит unit of work relay)"""
+        await self.session.execute(delete(OutboxMessage).where(OutboxMessage.id.in_(message_ids)))
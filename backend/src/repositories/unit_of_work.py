@@ -0,0 +1,70 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class UnitOfWork:
+    """
+    Граница транзакции над сессией фабрики репозиториев.
+
+    Репозитории не коммитят: они только flush-ат изменения (INSERT/UPDATE ... RETURNING выполняются сразу,
+    ошибки ограничений по-прежнему всплывают в репозитории), а коммитит unit of work - один раз на явный блок
+    `async with factory.unit_of_work():` или, если блока не было, один раз на запрос (request_scope).
+    Вложенные блоки коммитят при выходе из внешнего, исключение в блоке откатывает всю транзакцию.
+
+    События досок публикуются после выхода из блока, чтобы подписчики не увидели незакоммиченное изменение;
+    сброс кэшей доступа и пользователей откладывается до коммита через after_commit.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.session.info["unit_of_work"] = self
+        self._depth = 0
+        self._after_commit: list[Callable[[], Awaitable[None]]] = []
+
+    async def __aenter__(self) -> "UnitOfWork":
+        self._depth += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self._depth -= 1
+        if exc_type is not None:
+            await self.rollback()
+        elif self._depth == 0:
+            await self.commit()
+
+    def after_commit(self, callback: Callable[[], Awaitable[None]]) -> None:
+        """Выполнить callback после следующего коммита (при откате он отбрасывается)"""
+        self._after_commit.append(callback)
+
+    async def commit(self) -> None:
+        await self.session.commit()
+        callbacks, self._after_commit = self._after_commit, []
+        for callback in callbacks:
+            await callback()
+
+    async def rollback(self) -> None:
+        self._after_commit.clear()
+        await self.session.rollback()
+
+    @asynccontextmanager
+    async def request_scope(self) -> AsyncIterator["UnitOfWork"]:
+        """Коммит изменений, оставшихся вне явных блоков, после успешного ответа эндпоинта; откат при ошибке"""
+        try:
+            yield self
+        except BaseException:
+            await self.rollback()
+            raise
+        await self.commit()
+
+
+async def after_commit(session: AsyncSession, callback: Callable[[], Awaitable[None]]) -> None:
+    """
+    Выполнить callback (сброс кэша) после коммита unit of work сессии: иначе параллельный запрос
+    успел бы закэшировать еще не закоммиченное состояние под новой версией. Без unit of work - сразу.
+    """
+    if (unit_of_work := session.info.get("unit_of_work")) is not None:
+        unit_of_work.after_commit(callback)
+    else:
+        await callback()
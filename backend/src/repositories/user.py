@@ -1,10 +1,11 @@
-from typing import Any
+from typing import Sequence
 
-from sqlalchemy import or_, select
+from sqlalchemy import func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models import User
 from .base import SqlAlchemyRepository
+from .board_version import BoardVersionRepository
 
 
 class UserRepository(SqlAlchemyRepository):
@@ -12,29 +13,54 @@ class UserRepository(SqlAlchemyRepository):
 
     def __init__(self, session: AsyncSession):
         super().__init__(User, session)
+        self.versions = BoardVersionRepository(session)
 
-    async def update_user_profile(self, current_user: User) -> User:
-        await self.session.commit()
-        await self.session.refresh(current_user)
+    async def get_fresh(self, user_id: int) -> User | None:
+        """Загрузить пользователя из БД, перезаписав значения уже находящегося в сессии объекта"""
+        query = select(User).where(User.id == user_id).execution_options(populate_existing=True)
+        return (await self.session.execute(query)).scalar_one_or_none()
+
+    async def update_user_profile(self, current_user: User, assignee_changed: bool = False) -> User:
+        """
+        Сохранить изменения профиля. assignee_changed - изменились email, username или full_name, которые
+        снимки досок и изменения отдают в assignee карточек: версии досок с карточками пользователя
+        увеличиваются, и закэшированные снимки с прежними данными больше не читаются.
+        """
+        if assignee_changed:
+            await self.versions.bump_for_assignee(current_user.id)
+        await self.session.flush()
         return current_user
     
-    async def search_users(self, query: str, limit: int, current_user_id: int):
-        search_query = f"%{query}%"
+    async def search_users(self, query: str, limit: int, current_user_id: int) -> Sequence[User]:
+        """
+        Пользователи, у которых username, email или full_name содержат query, кроме текущего.
+
+        ILIKE '%query%' обслуживается триграммными GIN-индексами (pg_trgm) вместо полного скана таблицы;
+        запросы короче трех символов триграмм не дают и индекс почти не сужают. Сначала идут совпадения
+        с начала username, затем по убыванию similarity; текущий пользователь исключается в SQL,
+        поэтому LIMIT не съедает его место.
+        """
+        escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        contains = f"%{escaped}%"
         stmt = (
             select(User)
-            .filter(
+            .where(
                 or_(
-                    User.username.ilike(search_query),
-                    User.email.ilike(search_query),
-                    User.full_name.ilike(search_query) if User.full_name else False,
-                )
+                    User.username.ilike(contains, escape="\\"),
+                    User.email.ilike(contains, escape="\\"),
+                    User.full_name.ilike(contains, escape="\\"),
+                ),
+                User.id != current_user_id,
+            )
+            .order_by(
+                User.username.ilike(f"{escaped}%", escape="\\").desc(),
+                func.greatest(
+                    func.similarity(User.username, query),
+                    func.similarity(User.email, query),
+                    func.similarity(func.coalesce(User.full_name, ""), query),
+                ).desc(),
+                User.username,
             )
             .limit(limit)
         )
-
-        result = await self.session.execute(stmt)
-
-        users = result.scalars().all()
-        users = [user for user in users if user.id != current_user_id]
-
-        return users
+        return (await self.session.execute(stmt)).scalars().all()
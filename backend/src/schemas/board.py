@@ -1,8 +1,10 @@
 from datetime import datetime
 from typing import ForwardRef, List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
+from src.schemas.card import CardWithAssignee
+from src.schemas.comment import CommentWithUser
 from src.schemas.user import UserInDBBase
 
 
@@ -38,6 +40,27 @@ class BoardListUpdate(BaseModel):
     list_color: Optional[str] = None
 
 
+class BoardListBatchUpdate(BaseModel):
+    id: int
+    title: Optional[str] = None
+    list_color: Optional[str] = None
+
+
+class BatchCreateLists(BaseModel):
+    board_id: int
+    lists: List[BoardListBase] = Field(..., min_length=1, max_length=1000)
+
+
+class BatchUpdateLists(BaseModel):
+    board_id: int
+    lists: List[BoardListBatchUpdate] = Field(..., min_length=1, max_length=1000)
+
+
+class BatchDeleteLists(BaseModel):
+    board_id: int
+    list_ids: List[int] = Field(..., min_length=1, max_length=1000)
+
+
 class BoardListInDBBase(BoardListBase):
     id: int
     board_id: int
@@ -61,6 +84,34 @@ class BoardInDBBase(BoardBase):
 
 class BoardWithLists(BoardInDBBase):
     lists: List[BoardListInDBBase] = []
+    access_type: Optional[str] = None
+
+
+class BoardListWithCards(BoardListInDBBase):
+    cards: List[CardWithAssignee] = []
+
+
+class BoardSnapshot(BoardInDBBase):
+    access_type: str
+    version: int = 0
+    lists: List[BoardListWithCards] = []
+
+
+class BoardTombstoneInfo(BaseModel):
+    entity_type: str
+    entity_id: int
+    version: int
+
+    class Config:
+        from_attributes = True
+
+
+class BoardChanges(BaseModel):
+    version: int
+    lists: List[BoardListInDBBase] = []
+    cards: List[CardWithAssignee] = []
+    comments: List[CommentWithUser] = []
+    deleted: List[BoardTombstoneInfo] = []
 
 
 class BoardShareBase(BaseModel):
@@ -1,8 +1,9 @@
 from datetime import datetime
 from typing import List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
+from src.core.serialization import SchemaSerializer
 from src.schemas.comment import CommentWithUser
 from src.schemas.user import UserInDBBase
 
@@ -10,7 +11,7 @@ from src.schemas.user import UserInDBBase
 class CardBase(BaseModel):
     title: str
     description: Optional[str] = None
-    position: int
+    position: float
 
 
 class CardCreate(CardBase):
@@ -21,12 +22,21 @@ class CardCreate(CardBase):
 class CardUpdate(BaseModel):
     title: Optional[str] = None
     description: Optional[str] = None
-    position: Optional[int] = None
+    position: Optional[float] = None
     list_id: Optional[int] = None
     card_color: Optional[str] = None
     assignee_id: Optional[int] = None
 
 
+# Content of one card in PUT /cards/batch: cards are moved only through POST /cards/batch-move
+class CardBatchUpdate(BaseModel):
+    id: int
+    title: Optional[str] = None
+    description: Optional[str] = None
+    card_color: Optional[str] = None
+    assignee_id: Optional[int] = None
+
+
 class CardInDBBase(CardBase):
     id: int
     list_id: int
@@ -49,6 +59,41 @@ class CardWithAssignee(CardInDBBase):
         from_attributes = True
 
 
+class CardSearchResult(CardInDBBase):
+    board_id: int
+    board_title: str
+
+
+# Cards of a list as returned by GET /cards: assignee loaded, comments not
+card_list_serializer = SchemaSerializer(
+    CardWithAssignee, nested={"assignee": SchemaSerializer(UserInDBBase)}, unloaded=("comments",)
+)
+
+
 class MoveCard(BaseModel):
     new_position: int
     target_list_id: int
+
+
+class CardMove(MoveCard):
+    card_id: int
+
+
+class BatchMoveCards(BaseModel):
+    board_id: int
+    moves: List[CardMove] = Field(..., min_length=1, max_length=500)
+
+
+class BatchCreateCards(BaseModel):
+    board_id: int
+    cards: List[CardCreate] = Field(..., min_length=1, max_length=1000)
+
+
+class BatchUpdateCards(BaseModel):
+    board_id: int
+    cards: List[CardBatchUpdate] = Field(..., min_length=1, max_length=1000)
+
+
+class BatchDeleteCards(BaseModel):
+    board_id: int
+    card_ids: List[int] = Field(..., min_length=1, max_length=1000)
@@ -4,3 +4,4 @@ from .board_share import BoardShareService
 from .factory import ServiceFactory
 from .card import CardService
 from .comment import CommentService
+from .outbox import OutboxService
@@ -1,7 +1,10 @@
-from typing import Sequence
+from typing import Literal, Sequence
 
+from sqlalchemy import Row
+
+from src.core.acl import board_access_cache
 from src.schemas.board import BoardCreate, BoardUpdate
-from src.models import Board
+from src.models import Board, BoardList, BoardTombstone, Card, Comment
 from src.repositories import BaseRepository
 
 
@@ -9,12 +12,35 @@ class BoardService:
     def __init__(self, repository: BaseRepository):
         self.repository = repository
 
-    async def get_boards(self, user_id: int) -> Sequence[Board]:
-        return await self.repository.get_boards_with_lists(user_id)
+    async def get_boards(
+        self,
+        user_id: int,
+        skip: int = 0,
+        limit: int | None = None,
+        sort: Literal["updated_at", "-updated_at"] | None = None,
+    ) -> Sequence[tuple[Board, str]]:
+        return await self.repository.get_user_boards(user_id, skip, limit, sort)
 
     async def get_board(self, board_id: int) -> Board | None:
         return await self.repository.get_board_with_lists(board_id)
 
+    async def get_board_with_access(self, board_id: int, user_id: int) -> tuple[Board, str | None] | None:
+        return await self.repository.get_board_with_access(board_id, user_id)
+
+    async def get_access_type(self, board_id: int, user_id: int) -> tuple[int, str | None] | None:
+        return await self.repository.get_access_type(board_id, user_id)
+
+    async def get_board_version(self, board_id: int, user_id: int) -> Row | None:
+        return await self.repository.get_board_version(board_id, user_id)
+
+    async def get_board_snapshot(self, board_id: int, user_id: int) -> tuple[Board, str | None] | None:
+        return await self.repository.get_board_snapshot(board_id, user_id)
+
+    async def get_board_changes(
+        self, board_id: int, since: int
+    ) -> tuple[Sequence[BoardList], Sequence[Card], Sequence[Comment], Sequence[BoardTombstone]]:
+        return await self.repository.get_board_changes(board_id, since)
+
     async def create_board(self, board_in: BoardCreate, user_id: int) -> Board:
         board = board_in.model_dump()
         board["owner_id"] = user_id
@@ -26,5 +52,6 @@ class BoardService:
         return await self.repository.update_board(db_board, board_update)
 
     async def delete_board(self, board_id: int) -> None:
-        self.repository.delete_board(board_id)
+        await self.repository.delete_board(board_id)
+        await self.repository.after_commit(lambda: board_access_cache.invalidate_board(board_id))
 
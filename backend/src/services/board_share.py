@@ -1,5 +1,6 @@
 from typing import Sequence
 
+from src.core.acl import board_access_cache
 from src.models import BoardShare
 from schemas.board import BoardShareCreate, BoardShareUpdate
 from src.repositories import BaseRepository
@@ -24,17 +25,29 @@ class BoardShareService:
     async def create_board_share(self, board_share: BoardShareCreate) -> BoardShare:
         """Предоставить пользователю доступ к доске"""
         board_share = board_share.model_dump()
-        return await self.repository.create(board_share)
+        db_board_share = await self.repository.create(board_share)
+        board_id = db_board_share.board_id
+        await self.repository.after_commit(lambda: board_access_cache.invalidate_board(board_id))
+        return db_board_share
 
     async def update_board_share(self, db_board_share: BoardShare, board_share_update: BoardShareUpdate) -> BoardShare:
         """Обновить тип доступа пользователя к доске"""
         update_data = board_share_update.model_dump(exclude_unset=True)
-        return await self.repository.update(db_board_share, update_data)
+        board_id = db_board_share.board_id
+        db_board_share = await self.repository.update(db_board_share, update_data)
+        await self.repository.after_commit(lambda: board_access_cache.invalidate_board(board_id))
+        return db_board_share
 
     async def delete_board_share(self, db_board_share: BoardShare) -> None:
         """Удалить доступ пользователя к доске"""
+        board_id = db_board_share.board_id
         await self.repository.delete(db_board_share)
+        await self.repository.after_commit(lambda: board_access_cache.invalidate_board(board_id))
 
     async def get_board_shares_with_user_info(self, board_id: int) -> Sequence[BoardShare]:
         """Получить список всех пользователей с доступом к доске, включая информацию о пользователях"""
-        return await self.repository.get_board_shares_with_user_info(board_id)
\ No newline at end of file
+        return await self.repository.get_board_shares_with_user_info(board_id)
+
+    async def get_board_member_ids(self, board_id: int, user_ids: set[int]) -> set[int]:
+        """Id из user_ids, у которых есть доступ к доске"""
+        return await self.repository.get_board_member_ids(board_id, user_ids)
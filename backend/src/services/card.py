@@ -1,6 +1,8 @@
+from sqlalchemy import Row
+
 from src.repositories import BaseRepository
-from src.models import Card
-from src.schemas.card import CardCreate, CardUpdate
+from src.models import Board, BoardList, Card
+from src.schemas.card import CardBatchUpdate, CardCreate, CardMove, CardUpdate
 
 class CardService:
     def __init__(self, repository: BaseRepository):
@@ -9,11 +11,16 @@ class CardService:
     async def get_card(self, card_id: int) -> Card | None:
         return await self.repository.get_one(id=card_id)
     
+    async def get_card_with_access(
+        self, card_id: int, user_id: int
+    ) -> tuple[Card, BoardList, Board, str | None] | None:
+        return await self.repository.get_card_with_access(card_id, user_id)
+
     async def get_list_cards(self, list_id: int) -> list[Card]:
         return await self.repository.get_list_cards(list_id)
     
-    async def create_card(self, card: CardCreate) -> Card:
-        return await self.repository.create_card(card)
+    async def create_card(self, card: CardCreate, board_id: int) -> Card:
+        return await self.repository.create_card(card, board_id)
     
     async def update_card(self, card: Card, card_in: CardUpdate) -> Card:
         return await self.repository.update_card(card, card_in)
@@ -23,3 +30,26 @@ class CardService:
     
     async def move_card(self, card_id: int, target_list_id: int, new_position: int) -> Card:
         return await self.repository.move_card(card_id, target_list_id, new_position)
+
+    async def get_board_cards(self, board_id: int, card_ids: set[int]) -> dict[int, Row]:
+        return await self.repository.get_board_cards(board_id, card_ids)
+
+    async def get_notification_targets(self, card_ids: set[int]) -> dict[int, Row]:
+        return await self.repository.get_notification_targets(card_ids)
+
+    async def batch_move_cards(self, moves: list[CardMove], card_lists: dict[int, int]) -> list[Card]:
+        return await self.repository.batch_move_cards(moves, card_lists)
+
+    async def create_cards(self, cards_in: list[CardCreate], board_id: int) -> list[Card]:
+        return await self.repository.create_cards(cards_in, board_id)
+
+    async def update_cards(self, cards_in: list[CardBatchUpdate], board_id: int) -> list[Card]:
+        return await self.repository.update_cards(cards_in, board_id)
+
+    async def delete_cards(self, card_ids: set[int], board_id: int) -> None:
+        return await self.repository.delete_cards(card_ids, board_id)
+
+    async def search_cards(
+        self, user_id: int, query: str, limit: int, after: int | None = None
+    ) -> list[tuple[Card, Board]]:
+        return await self.repository.search_cards(user_id, query, limit, after)
@@ -8,18 +8,20 @@ class CommentService:
         self.repository = repository
 
     async def get_comment(self, comment_id: int) -> Comment | None:
-        return await self.repository.get_one(id=comment_id)
+        return await self.repository.get_comment(comment_id)
     
-    async def get_card_comments(self, card_id: int) -> list[Comment]:
-        return await self.repository.get_all(card_id=card_id)
+    async def get_card_comments(
+        self, card_id: int, limit: int | None = None, before: int | None = None, after: int | None = None
+    ) -> list[Comment]:
+        return await self.repository.get_card_comments(card_id, limit, before, after)
     
     async def create_comment(self, comment_in: CommentCreate, user_id: int) -> Comment:
         comment = comment_in.model_dump()
         comment["user_id"] = user_id
-        return await self.repository.create(comment)
+        return await self.repository.create_comment(comment)
     
     async def update_comment(self, comment: Comment, comment_in: CommentUpdate) -> Comment:
-        return await self.repository.update(comment, comment_in)
+        return await self.repository.update_comment(comment, comment_in)
     
     async def delete_comment(self, comment: Comment) -> None:
-        return await self.repository.delete(comment)
+        return await self.repository.delete_comment(comment)
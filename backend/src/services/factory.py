@@ -1,16 +1,21 @@
-from src.repositories import BaseRepositoryFactory
+from src.repositories import BaseRepositoryFactory, UnitOfWork
 from .board import BoardService
 from .list import ListService
 from .user import UserService
 from .board_share import BoardShareService
 from .card import CardService
 from .comment import CommentService
+from .outbox import OutboxService
 
 
 class ServiceFactory:
     def __init__(self, repo: BaseRepositoryFactory):
         self.repo = repo
 
+    def unit_of_work(self) -> UnitOfWork:
+        """Транзакция для `async with`: изменения всех сервисов фабрики коммитятся один раз при выходе"""
+        return self.repo.uow
+
     def create_board_service(self):
         return BoardService(self.repo.create_board_repository())
     
@@ -28,3 +33,6 @@ class ServiceFactory:
     
     def create_comment_service(self):
         return CommentService(self.repo.create_comment_repository())
+
+    def create_outbox_service(self):
+        return OutboxService(self.repo.create_outbox_repository())
@@ -1,9 +1,12 @@
 from collections.abc import Sequence
 
+from sqlalchemy import Row
+
 from src.repositories import BaseRepository
+from src.models.board import Board
 from src.models.board_list import BoardList
 from src.models.card import Card
-from src.schemas.board import BoardListCreate, BoardListUpdate
+from src.schemas.board import BoardListBase, BoardListBatchUpdate, BoardListCreate, BoardListUpdate
 from src.schemas.list import ResponseBoardList
 
 
@@ -14,9 +17,18 @@ class ListService:
     async def get_list(self, list_id: int, include_cards: bool = False) -> BoardList | None:
         return await self.repository.get_list(list_id, include_cards)
 
+    async def get_list_with_access(self, list_id: int, user_id: int) -> tuple[BoardList, Board, str | None] | None:
+        return await self.repository.get_list_with_access(list_id, user_id)
+
+    async def get_list_board_version(self, list_id: int, user_id: int) -> Row | None:
+        return await self.repository.get_list_board_version(list_id, user_id)
+
     async def get_board_lists(self, board_id: int, include_cards: bool = False) -> Sequence[BoardList]:
         return await self.repository.get_board_lists(board_id, include_cards)
 
+    async def get_board_list_ids(self, board_id: int, list_ids: set[int]) -> set[int]:
+        return await self.repository.get_board_list_ids(board_id, list_ids)
+
     async def create_list(self, list_in: BoardListCreate) -> BoardList:
         return await self.repository.create_list(list_in)
 
@@ -29,7 +41,16 @@ class ListService:
         return await self.repository.update_list(db_list, update_data)
 
     async def delete_list(self, list_id: int) -> bool:
-        return self.repository.delete_list(list_id)
+        return await self.repository.delete_list(list_id)
 
     async def reorder_list(self, list_id: int, new_position: int) -> ResponseBoardList | None:
         return await self.repository.reorder_list(list_id, new_position)
+
+    async def create_lists(self, lists_in: Sequence[BoardListBase], board_id: int) -> Sequence[BoardList]:
+        return await self.repository.create_lists(lists_in, board_id)
+
+    async def update_lists(self, lists_in: Sequence[BoardListBatchUpdate], board_id: int) -> Sequence[BoardList]:
+        return await self.repository.update_lists(lists_in, board_id)
+
+    async def delete_lists(self, list_ids: set[int], board_id: int) -> None:
+        return await self.repository.delete_lists(list_ids, board_id)
@@ -0,0 +1,29 @@
+from typing import Sequence
+
+from src.models import OutboxMessage
+from src.repositories import BaseRepository
+
+
+# Уведомление исполнителя карточки об изменении или комментарии
+CARD_NOTIFICATION = "card.notification"
+
+
+class OutboxService:
+    def __init__(self, repository: BaseRepository):
+        self.repository = repository
+
+    def enqueue_card_notification(
+        self, card_id: int, editor_id: int, editor_username: str, comment_text: str | None = None
+    ) -> None:
+        """Записать уведомление в outbox; вызывать до коммита изменения, к которому оно относится"""
+        payload = {"card_id": card_id, "editor_id": editor_id, "editor_username": editor_username}
+        if comment_text:
+            payload["comment_text"] = comment_text
+        self.repository.add(CARD_NOTIFICATION, payload)
+
+    async def claim_batch(self, limit: int, digest_window: float = 0) -> Sequence[OutboxMessage]:
+        """Уведомления карточки забираются, когда закрылось их окно сводки (digest_window секунд)"""
+        return await self.repository.claim_batch(limit, CARD_NOTIFICATION, digest_window)
+
+    async def delete_batch(self, messages: Sequence[OutboxMessage]) -> None:
+        await self.repository.delete_batch([message.id for message in messages])
@@ -1,7 +1,8 @@
 from fastapi import HTTPException, status
 
-from src.core.security import verify_password
-from src.core.security import get_password_hash
+from src.core.principal import Principal, principal_cache
+from src.core.security import verify_password_async
+from src.core.security import get_password_hash_async
 from src.schemas.user import UserCreate, UserProfileUpdate
 from src.repositories import BaseRepository
 from src.models import User
@@ -14,6 +15,17 @@ class UserService:
     async def get_user_by_id(self, user_id: int) -> User | None:
         return await self.repository.get_one(id=user_id)
 
+    async def get_authenticated_user(self, user_id: int) -> Principal | None:
+        """Пользователь для аутентификации запроса: из principal_cache, при промахе из БД"""
+        stamp, data = await principal_cache.get(user_id)
+        if data is not None:
+            return Principal.from_dict(data)
+        user = await self.get_user_by_id(user_id)
+        if not user:
+            return None
+        await principal_cache.set(user, stamp)
+        return Principal.from_user(user)
+
     async def get_user_by_email(self, email: str) -> User | None:
         return await self.repository.get_one(email=email)
 
@@ -23,12 +35,12 @@ class UserService:
     async def create_user(self, user: UserCreate) -> User:
         user_in = user.model_dump()
         del user_in["password"]
-        user_in["hashed_password"] = get_password_hash(user.password)
+        user_in["hashed_password"] = await get_password_hash_async(user.password)
         return await self.repository.create(user_in)
 
     async def authenticate(self, username: str, password: str) -> User | None:
         user = await self.get_user_by_username(username)
-        if user and verify_password(password, user.hashed_password):
+        if user and await verify_password_async(password, user.hashed_password):
             if not user.is_active:
                 raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user")
             return user
@@ -39,7 +51,10 @@ class UserService:
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
-    async def update_user_profile(self, current_user: User, profile_update: UserProfileUpdate) -> User:
+    async def update_user_profile(self, principal: Principal, profile_update: UserProfileUpdate) -> User:
+        current_user = await self.repository.get_fresh(principal.id)
+        assignee_before = (current_user.email, current_user.username, current_user.full_name)
+
         if profile_update.email and profile_update.email != current_user.email:
             existing_user = await self.get_user_by_email(profile_update.email)
             if existing_user:
@@ -67,14 +82,19 @@ class UserService:
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Current password is required to set a new password"
                 )
-            if not verify_password(profile_update.current_password, current_user.hashed_password):
+            if not await verify_password_async(profile_update.current_password, current_user.hashed_password):
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Incorrect current password"
                 )
-            current_user.hashed_password = get_password_hash(profile_update.new_password)
+            current_user.hashed_password = await get_password_hash_async(profile_update.new_password)
 
-        return await self.repository.update_user_profile(current_user)
+        user = await self.repository.update_user_profile(
+            current_user,
+            assignee_changed=(current_user.email, current_user.username, current_user.full_name) != assignee_before,
+        )
+        await self.repository.after_commit(lambda: principal_cache.bump_stamp(user.id))
+        return user
 
     async def search_users(self, query: str, limit: int, current_user_id: int):
         return await self.repository.search_users(query, limit, current_user_id)
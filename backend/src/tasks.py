@@ -1,13 +1,11 @@
 import logging
-import os
-import smtplib as smtp
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
 
 from celery import Celery
-from jinja2 import Environment, FileSystemLoader
+from celery.signals import worker_process_shutdown
 
 from src.core.config import settings
+from src.core.email_templates import email_renderer
+from src.core.smtp import smtp_pool
 
 celery_app = Celery("tasks", broker=settings.REDIS_DSN)
 celery_app.conf.task_default_queue = "default"
@@ -15,10 +13,6 @@ celery_app.conf.task_default_queue = "default"
 # Автоматически обнаруживать задачи в этом файле
 celery_app.autodiscover_tasks(["src.tasks"])
 
-# Настраиваем Jinja2
-template_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
-jinja_env = Environment(loader=FileSystemLoader(template_dir))
-
 
 @celery_app.task(name="app.tasks.send_email")
 def send_email(
@@ -41,32 +35,9 @@ def send_email(
         board_id: ID доски
     """
     try:
-        # Получаем шаблон
-        template = jinja_env.get_template("email_notification.html")
-
-        # Рендерим HTML с переданными параметрами
-        html_content = template.render(
-            username=username,
-            card_title=card_title,
-            task_id=task_id,
-            editor_username=editor_username,
-            board_id=board_id,
-            frontend_url=settings.FRONTEND_URL,
+        smtp_pool.send(
+            email_renderer.build_notification(email, username, card_title, task_id, editor_username, board_id)
         )
-
-        msg = MIMEMultipart()
-        msg["From"] = settings.SMTP_LOGIN
-        msg["To"] = email
-        msg["Subject"] = f"Обновление карточки '{card_title}' в TaskFlow"
-
-        msg.attach(MIMEText(html_content, "html", "utf-8"))
-
-        server = smtp.SMTP(settings.SMTP_HOST, settings.SMTP_PORT)
-        server.starttls()
-        server.login(settings.SMTP_LOGIN, settings.SMTP_PASSWORD)
-
-        server.sendmail(settings.SMTP_LOGIN, email, msg.as_string())
-        server.quit()
         logging.info(f"Message sent to {email}")
         return True
     except Exception as e:
@@ -97,35 +68,53 @@ def send_comment_notification(
         comment_text: Текст комментария
     """
     try:
-        # Получаем шаблон
-        template = jinja_env.get_template("email_notification.html")
-
-        # Рендерим HTML с переданными параметрами
-        html_content = template.render(
-            username=username,
-            card_title=card_title,
-            task_id=task_id,
-            editor_username=editor_username,
-            board_id=board_id,
-            frontend_url=settings.FRONTEND_URL,
-            notification_type="comment",
-            comment_text=comment_text,
+        smtp_pool.send(
+            email_renderer.build_notification(
+                email, username, card_title, task_id, editor_username, board_id, comment_text
+            )
         )
+        logging.info(f"Comment notification sent to {email}")
+        return True
+    except Exception as e:
+        logging.error(f"Error sending comment notification: {e}")
+        return False
+
+
+@celery_app.task(name="app.tasks.send_emails_batch")
+def send_emails_batch(notifications: list[dict]):
+    """
+    Отправка пачки уведомлений через одно SMTP-соединение
+
+    Args:
+        notifications: Аргументы EmailRenderer.build_notification для каждого письма
+            (с comment_text для уведомления о комментарии)
 
-        msg = MIMEMultipart()
-        msg["From"] = settings.SMTP_LOGIN
-        msg["To"] = email
-        msg["Subject"] = f"Новый комментарий к карточке '{card_title}' в TaskFlow"
+    Returns:
+        Количество отправленных писем
+    """
+    sent = sum(smtp_pool.send_many(email_renderer.build_many(notifications)))
+    logging.info(f"Batch sent: {sent} of {len(notifications)} messages")
+    return sent
 
-        msg.attach(MIMEText(html_content, "html", "utf-8"))
 
-        with smtp.SMTP(settings.SMTP_HOST, settings.SMTP_PORT) as server:
-            server.starttls()
-            server.login(settings.SMTP_LOGIN, settings.SMTP_PASSWORD)
+@celery_app.task(name="app.tasks.send_card_digest")
+def send_card_digest(notifications: list[dict]):
+    """
+    Отправка сводки изменений карточки за окно NOTIFICATION_DIGEST_WINDOW
 
-            server.sendmail(settings.SMTP_LOGIN, email, msg.as_string())
-        logging.info(f"Comment notification sent to {email}")
+    Args:
+        notifications: Аргументы EmailRenderer.build_notification для каждого изменения одной карточки
+            одному получателю, в порядке поступления
+    """
+    try:
+        smtp_pool.send(email_renderer.build_digest(notifications))
+        logging.info(f"Digest of {len(notifications)} notifications sent to {notifications[-1]['email']}")
         return True
     except Exception as e:
-        logging.error(f"Error sending comment notification: {e}")
+        logging.error(f"Error sending notification digest: {e}")
         return False
+
+
+@worker_process_shutdown.connect
+def close_smtp_pool(**kwargs):
+    smtp_pool.close()
@@ -1,9 +1,11 @@
 import uuid
 import asyncio
 import pytest
+from contextlib import contextmanager
 from typing import AsyncGenerator
 from fastapi.testclient import TestClient
 from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import NullPool
@@ -24,6 +26,8 @@ TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engin
 @pytest.fixture(autouse=True, scope='session')
 async def prepare_database():
     async with engine.begin() as conn:
+        # Trigram indexes of the user table need pg_trgm (created by the migration outside tests)
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
         await conn.run_sync(Base.metadata.create_all)
     yield
     async with engine.begin() as conn:
@@ -33,6 +37,43 @@ async def prepare_database():
 client = TestClient(app)
 
 
+@contextmanager
+def engine_events(**listeners):
+    """Listen to events of the test engine (before_cursor_execute=..., commit=...) for the duration of the block."""
+    for name, listener in listeners.items():
+        event.listen(engine.sync_engine, name, listener)
+    try:
+        yield
+    finally:
+        for name, listener in listeners.items():
+            event.remove(engine.sync_engine, name, listener)
+
+
+@pytest.fixture
+def query_counter():
+    """Collects SQL statements executed against the test database."""
+    statements = []
+    with engine_events(before_cursor_execute=lambda conn, cursor, statement, *args: statements.append(statement)):
+        yield statements
+
+
+@pytest.fixture
+def committed_transactions():
+    """Statements of each transaction committed against the test database, one list per COMMIT."""
+    committed, current = [], []
+
+    def on_commit(conn):
+        committed.append(current.copy())
+        current.clear()
+
+    with engine_events(
+        before_cursor_execute=lambda conn, cursor, statement, *args: current.append(statement),
+        commit=on_commit,
+        rollback=lambda conn: current.clear(),
+    ):
+        yield committed
+
+
 @pytest.fixture(scope='session')
 async def test_client() -> AsyncGenerator[AsyncClient, None]:
     async def override_get_db():
@@ -47,4 +88,44 @@ async def test_client() -> AsyncGenerator[AsyncClient, None]:
     async with AsyncClient(
         transport=ASGITransport(app=app), base_url='http://test'
     ) as ac:
-        yield ac
\ No newline at end of file
+        yield ac
+
+
+@pytest.fixture
+async def db_session() -> AsyncGenerator[AsyncSession, None]:
+    async with TestingSessionLocal() as session:
+        yield session
+
+
+@pytest.fixture
+def select_statements():
+    """SELECT statements executed against the test database, with their parameters."""
+    statements = []
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            statements.append((statement, parameters))
+
+    with engine_events(before_cursor_execute=on_execute):
+        yield statements
+
+
+@pytest.fixture
+def find_seq_scans():
+    """
+    EXPLAIN statements with sequential scans disabled: the planner still falls back to a Seq Scan
+    when no index can serve the query, whatever the size of the seeded tables.
+    Returns (statement, plan) of the statements that scan a whole table.
+    """
+
+    async def explain(statements: list[tuple[str, tuple]]) -> list[tuple[str, list[str]]]:
+        seq_scans = []
+        async with engine.connect() as conn:
+            await conn.exec_driver_sql("SET enable_seqscan = off")
+            for statement, parameters in statements:
+                plan = (await conn.exec_driver_sql(f"EXPLAIN {statement}", parameters)).scalars().all()
+                if any("Seq Scan" in line for line in plan):
+                    seq_scans.append((statement, plan))
+        return seq_scans
+
+    return explain
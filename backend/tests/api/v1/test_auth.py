@@ -62,4 +62,32 @@ class TestAuth:
 
         all_cookies = "".join(cookie_headers)
         assert "access_token=" in all_cookies
-        assert "refresh_token=" in all_cookies
\ No newline at end of file
+        assert "refresh_token=" in all_cookies
+
+    async def test_update_profile_refreshes_cached_user(self, test_client):
+        access_token, _ = await register_and_login(
+            test_client, "stamp_test@test.com", "password123", "stamp_test"
+        )
+
+        test_client.cookies.set("access_token", access_token)
+        assert (await test_client.get("/api/v1/auth/me")).json()["full_name"] is None
+
+        response = await test_client.put(
+            "/api/v1/auth/update-profile",
+            json={"full_name": "Stamp Test", "current_password": "password123", "new_password": "password456"},
+        )
+        assert response.status_code == 200
+
+        response = await test_client.get("/api/v1/auth/me")
+        assert response.status_code == 200
+        assert response.json()["full_name"] == "Stamp Test"
+
+    async def test_search_users_excludes_current_user_in_sql(self, test_client):
+        for username in ("xsearcher", "searcher_b", "searcher_a"):
+            await register_and_login(test_client, f"{username}@test.com", "password123", username)
+        access_token, _ = await register_and_login(test_client, "searcher@test.com", "password123", "searcher")
+        test_client.cookies.set("access_token", access_token)
+
+        response = await test_client.get("/api/v1/users/search", params={"query": "searcher", "limit": 2})
+        assert response.status_code == 200
+        assert [user["username"] for user in response.json()] == ["searcher_a", "searcher_b"]
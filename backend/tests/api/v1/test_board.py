@@ -1,4 +1,13 @@
-from tests.api.v1.utils import register_and_login
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from src.core.cache import MemoryCache
+from src.core.snapshot_cache import BoardSnapshotCache, board_snapshot_cache
+from src.main import app
+from tests.api.v1.utils import create_board_with_list, create_cards, register_and_login
 
 
 class TestBoard:
@@ -16,3 +25,234 @@ class TestBoard:
         )
         assert response.status_code == 200
         assert response.json()["title"] == "Test Board"
+
+    async def test_get_board_snapshot(self, test_client):
+        access_token, _ = await register_and_login(
+            test_client, "snapshot_test@test.com", "password123", "snapshot_test"
+        )
+
+        test_client.cookies.set("access_token", access_token)
+        board = (await test_client.post("/api/v1/boards/", json={"title": "Snapshot Board"})).json()
+        board_list = (
+            await test_client.post(
+                "/api/v1/lists/", json={"title": "Todo", "position": 0, "board_id": board["id"]}
+            )
+        ).json()
+        await test_client.post(
+            "/api/v1/cards/", json={"title": "First card", "position": 0, "list_id": board_list["id"]}
+        )
+
+        response = await test_client.get(f"/api/v1/boards/{board['id']}")
+        assert response.status_code == 200
+        assert response.json()["access_type"] == "owner"
+        assert response.json()["lists"][0]["cards"][0]["title"] == "First card"
+        assert response.json()["lists"][0]["cards"][0]["formatted_id"] == "SB-1"
+
+        other_token, _ = await register_and_login(
+            test_client, "snapshot_other@test.com", "password123", "snapshot_other"
+        )
+        test_client.cookies.set("access_token", other_token)
+        response = await test_client.get(f"/api/v1/boards/{board['id']}")
+        assert response.status_code == 403
+
+    async def test_get_boards_includes_shared(self, test_client):
+        other_token, _ = await register_and_login(
+            test_client, "boards_other@test.com", "password123", "boards_other"
+        )
+        test_client.cookies.set("access_token", other_token)
+        other_id = (await test_client.get("/api/v1/auth/me")).json()["id"]
+
+        access_token, _ = await register_and_login(
+            test_client, "boards_owner@test.com", "password123", "boards_owner"
+        )
+        test_client.cookies.set("access_token", access_token)
+        first = (await test_client.post("/api/v1/boards/", json={"title": "First"})).json()
+        second = (await test_client.post("/api/v1/boards/", json={"title": "Second"})).json()
+        await test_client.post(
+            f"/api/v1/boards/{second['id']}/share",
+            json={"board_id": second["id"], "user_id": other_id, "access_type": "read"},
+        )
+
+        response = await test_client.get("/api/v1/boards/")
+        assert response.status_code == 200
+        assert [(b["title"], b["access_type"]) for b in response.json()] == [
+            ("First", "owner"), ("Second", "owner")
+        ]
+        response = await test_client.get("/api/v1/boards/", params={"sort": "-updated_at", "limit": 1})
+        assert [b["id"] for b in response.json()] == [second["id"]]
+
+        test_client.cookies.set("access_token", other_token)
+        response = await test_client.get("/api/v1/boards/")
+        assert [(b["id"], b["access_type"]) for b in response.json()] == [(second["id"], "read")]
+        assert first["id"] not in [b["id"] for b in response.json()]
+
+    async def test_share_changes_invalidate_access(self, test_client):
+        other_token, _ = await register_and_login(
+            test_client, "acl_other@test.com", "password123", "acl_other"
+        )
+        test_client.cookies.set("access_token", other_token)
+        other_id = (await test_client.get("/api/v1/auth/me")).json()["id"]
+
+        access_token, _ = await register_and_login(
+            test_client, "acl_owner@test.com", "password123", "acl_owner"
+        )
+        test_client.cookies.set("access_token", access_token)
+        board = (await test_client.post("/api/v1/boards/", json={"title": "ACL Board"})).json()
+
+        test_client.cookies.set("access_token", other_token)
+        assert (await test_client.get("/api/v1/lists/", params={"board_id": board["id"]})).status_code == 403
+
+        test_client.cookies.set("access_token", access_token)
+        await test_client.post(
+            f"/api/v1/boards/{board['id']}/share",
+            json={"board_id": board["id"], "user_id": other_id, "access_type": "read"},
+        )
+        test_client.cookies.set("access_token", other_token)
+        assert (await test_client.get("/api/v1/lists/", params={"board_id": board["id"]})).status_code == 200
+        response = await test_client.post(
+            "/api/v1/lists/", json={"title": "Todo", "position": 0, "board_id": board["id"]}
+        )
+        assert response.status_code == 403
+
+        test_client.cookies.set("access_token", access_token)
+        await test_client.delete(f"/api/v1/boards/{board['id']}/share/{other_id}")
+        test_client.cookies.set("access_token", other_token)
+        assert (await test_client.get("/api/v1/lists/", params={"board_id": board["id"]})).status_code == 403
+
+    async def test_board_events_websocket(self, test_client):
+        other_token, _ = await register_and_login(
+            test_client, "ws_other@test.com", "password123", "ws_other"
+        )
+        access_token, _ = await register_and_login(
+            test_client, "ws_owner@test.com", "password123", "ws_owner"
+        )
+        test_client.cookies.set("access_token", access_token)
+        board, board_list = await create_board_with_list(test_client, "Live Board")
+
+        # Mutations go through the same TestClient so that they share the event loop with the subscription
+        with TestClient(app) as client:
+            with pytest.raises(WebSocketDisconnect) as exc_info:
+                with client.websocket_connect(f"/api/v1/ws/boards/{board['id']}?token={other_token}") as ws:
+                    ws.receive_json()
+            assert exc_info.value.code == 1008
+
+            with client.websocket_connect(f"/api/v1/ws/boards/{board['id']}?token={access_token}") as ws:
+                client.post(
+                    "/api/v1/cards/",
+                    json={"title": "Live card", "position": 0, "list_id": board_list["id"]},
+                    headers={"Authorization": f"Bearer {access_token}"},
+                )
+                event = ws.receive_json()
+                assert event["type"] == "card.created"
+                assert event["board_id"] == board["id"]
+                assert event["data"]["title"] == "Live card"
+
+    async def test_board_changes_since_version(self, test_client):
+        access_token, _ = await register_and_login(
+            test_client, "changes_test@test.com", "password123", "changes_test"
+        )
+        test_client.cookies.set("access_token", access_token)
+        board, board_list = await create_board_with_list(test_client, "Changes Board")
+        first, second = await create_cards(test_client, board_list["id"], "first", "second")
+
+        version = (await test_client.get(f"/api/v1/boards/{board['id']}")).json()["version"]
+        await test_client.put(f"/api/v1/cards/{first['id']}", json={"title": "first, renamed"})
+        await test_client.delete(f"/api/v1/cards/{second['id']}")
+
+        response = await test_client.get(f"/api/v1/boards/{board['id']}/changes", params={"since": version})
+        assert response.status_code == 200
+        changes = response.json()
+        assert changes["version"] == version + 2
+        assert changes["lists"] == []
+        assert [card["title"] for card in changes["cards"]] == ["first, renamed"]
+        assert changes["deleted"] == [{"entity_type": "card", "entity_id": second["id"], "version": version + 2}]
+
+        response = await test_client.get(
+            f"/api/v1/boards/{board['id']}/changes", params={"since": changes["version"]}
+        )
+        assert response.json() == {"version": version + 2, "lists": [], "cards": [], "comments": [], "deleted": []}
+
+    async def test_board_etag_not_modified(self, test_client):
+        access_token, _ = await register_and_login(
+            test_client, "etag_test@test.com", "password123", "etag_test"
+        )
+        test_client.cookies.set("access_token", access_token)
+        board, board_list = await create_board_with_list(test_client, "ETag Board")
+
+        response = await test_client.get(f"/api/v1/boards/{board['id']}")
+        etag = response.headers["ETag"]
+        response = await test_client.get(f"/api/v1/boards/{board['id']}", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+        response = await test_client.get(
+            "/api/v1/lists/", params={"board_id": board["id"]}, headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 304
+
+        await create_cards(test_client, board_list["id"], "new card")
+        response = await test_client.get(f"/api/v1/boards/{board['id']}", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+    async def test_board_snapshot_cache(self, test_client):
+        access_token, _ = await register_and_login(
+            test_client, "snapshot_cache_test@test.com", "password123", "snapshot_cache_test"
+        )
+        test_client.cookies.set("access_token", access_token)
+        board, board_list = await create_board_with_list(test_client, "Cached Board")
+        await create_cards(test_client, board_list["id"], "first")
+
+        first = await test_client.get(f"/api/v1/boards/{board['id']}")
+        hits = board_snapshot_cache.stats.hits
+        second = await test_client.get(f"/api/v1/boards/{board['id']}")
+        assert board_snapshot_cache.stats.hits == hits + 1
+        assert second.json() == first.json()
+        assert second.json()["access_type"] == "owner"
+
+        await create_cards(test_client, board_list["id"], "second")
+        response = await test_client.get(f"/api/v1/boards/{board['id']}")
+        assert [card["title"] for card in response.json()["lists"][0]["cards"]] == ["first", "second"]
+
+    async def test_board_snapshot_picks_up_assignee_profile_change(self, test_client):
+        access_token, _ = await register_and_login(
+            test_client, "snapshot_assignee@test.com", "password123", "snapshot_assignee"
+        )
+        test_client.cookies.set("access_token", access_token)
+        user_id = (await test_client.get("/api/v1/auth/me")).json()["id"]
+        board, board_list = await create_board_with_list(test_client, "Assignee Board")
+        (card,) = await create_cards(test_client, board_list["id"], "assigned")
+        await test_client.put(f"/api/v1/cards/{card['id']}", json={"assignee_id": user_id})
+
+        response = await test_client.get(f"/api/v1/boards/{board['id']}")
+        version = response.json()["version"]
+        assert response.json()["lists"][0]["cards"][0]["assignee"]["username"] == "snapshot_assignee"
+
+        response = await test_client.put("/api/v1/auth/update-profile", json={"username": "snapshot_assignee_renamed"})
+        assert response.status_code == 200
+
+        response = await test_client.get(f"/api/v1/boards/{board['id']}")
+        assert response.json()["version"] > version
+        assert response.json()["lists"][0]["cards"][0]["assignee"]["username"] == "snapshot_assignee_renamed"
+
+        changes = (await test_client.get(f"/api/v1/boards/{board['id']}/changes", params={"since": version})).json()
+        assert [card["assignee"]["username"] for card in changes["cards"]] == ["snapshot_assignee_renamed"]
+
+    async def test_board_snapshot_cache_coalesces_loads(self):
+        snapshot_cache = BoardSnapshotCache(MemoryCache(ttl=60), coalesce_timeout=1)
+        loads = 0
+
+        async def load() -> bytes:
+            nonlocal loads
+            loads += 1
+            await asyncio.sleep(0.05)
+            return b'{"id":1}'
+
+        payloads = await asyncio.gather(*(snapshot_cache.get_or_load(1, 7, load) for _ in range(5)))
+        assert loads == 1
+        assert payloads == [b'{"id":1}'] * 5
+        assert snapshot_cache.stats.coalesced == 4
+
+        # A waiter that gives up on a slow load loads the snapshot itself
+        snapshot_cache.coalesce_timeout = 0.01
+        await asyncio.gather(*(snapshot_cache.get_or_load(1, 8, load) for _ in range(2)))
+        assert loads == 3
@@ -0,0 +1,254 @@
+from tests.api.v1.utils import create_board_with_list, create_cards, register_and_login
+
+
+class TestCard:
+    async def test_move_card_rewrites_only_moved_card(self, test_client):
+        access_token, _ = await register_and_login(
+            test_client, "move_test@test.com", "password123", "move_test"
+        )
+        test_client.cookies.set("access_token", access_token)
+        _, board_list = await create_board_with_list(test_client, "Move Board")
+        first, second, third = await create_cards(test_client, board_list["id"], "first", "second", "third")
+
+        response = await test_client.post(
+            f"/api/v1/cards/{third['id']}/move",
+            json={"new_position": 1, "target_list_id": board_list["id"]},
+        )
+        assert response.status_code == 200
+        assert first["position"] < response.json()["position"] < second["position"]
+
+        response = await test_client.get("/api/v1/cards/", params={"list_id": board_list["id"]})
+        cards = response.json()
+        assert [card["title"] for card in cards] == ["first", "third", "second"]
+        assert cards[0]["position"] == first["position"]
+        assert cards[2]["position"] == second["position"]
+
+    async def test_list_cards_match_card_schema(self, test_client):
+        access_token, _ = await register_and_login(
+            test_client, "list_cards_test@test.com", "password123", "list_cards_test"
+        )
+        test_client.cookies.set("access_token", access_token)
+        me = (await test_client.get("/api/v1/auth/me")).json()
+        _, board_list = await create_board_with_list(test_client, "Serializer Board")
+        first, second = await create_cards(test_client, board_list["id"], "first", "second")
+
+        # PUT responds through response_model validation, GET /cards through card_list_serializer
+        assigned = (await test_client.put(f"/api/v1/cards/{first['id']}", json={"assignee_id": me["id"]})).json()
+        response = await test_client.get("/api/v1/cards/", params={"list_id": board_list["id"]})
+        assert response.status_code == 200
+        cards = response.json()
+        assert cards[0] == assigned
+        assert cards[0]["assignee"]["username"] == "list_cards_test"
+        assert cards[0]["formatted_id"] == "SB-1"
+        assert cards[1] == second
+
+    async def test_card_update_writes_in_one_transaction(self, test_client, committed_transactions):
+        access_token, _ = await register_and_login(
+            test_client, "unit_of_work_test@test.com", "password123", "unit_of_work_test"
+        )
+        test_client.cookies.set("access_token", access_token)
+        me = (await test_client.get("/api/v1/auth/me")).json()
+        _, board_list = await create_board_with_list(test_client, "Unit Of Work Board")
+        (card,) = await create_cards(test_client, board_list["id"], "card")
+
+        committed_transactions.clear()
+        response = await test_client.put(
+            f"/api/v1/cards/{card['id']}", json={"title": "renamed", "assignee_id": me["id"]}
+        )
+        assert response.status_code == 200
+        assert response.json()["title"] == "renamed"
+
+        # Board version, outbox message and card are committed together, without re-reading the card
+        writes = [
+            statements
+            for statements in committed_transactions
+            if any(statement.lstrip().startswith(("INSERT", "UPDATE", "DELETE")) for statement in statements)
+        ]
+        assert len(writes) == 1
+        card_update = next(i for i, statement in enumerate(writes[0]) if statement.startswith("UPDATE card"))
+        assert not any("FROM card" in statement for statement in writes[0][card_update:])
+
+    async def test_batch_move_cards(self, test_client):
+        access_token, _ = await register_and_login(
+            test_client, "batch_move_test@test.com", "password123", "batch_move_test"
+        )
+        test_client.cookies.set("access_token", access_token)
+        board, todo = await create_board_with_list(test_client, "Batch Board")
+        done = (
+            await test_client.post("/api/v1/lists/", json={"title": "Done", "position": 1, "board_id": board["id"]})
+        ).json()
+        first, second, third = await create_cards(test_client, todo["id"], "first", "second", "third")
+
+        response = await test_client.post(
+            "/api/v1/cards/batch-move",
+            json={
+                "board_id": board["id"],
+                "moves": [
+                    {"card_id": first["id"], "target_list_id": done["id"], "new_position": 0},
+                    {"card_id": third["id"], "target_list_id": done["id"], "new_position": 0},
+                ],
+            },
+        )
+        assert response.status_code == 200
+        assert {card["list_id"] for card in response.json()} == {done["id"]}
+
+        response = await test_client.get("/api/v1/cards/", params={"list_id": done["id"]})
+        assert [card["title"] for card in response.json()] == ["third", "first"]
+        response = await test_client.get("/api/v1/cards/", params={"list_id": todo["id"]})
+        assert [card["title"] for card in response.json()] == ["second"]
+
+    async def test_batch_create_update_delete_cards(self, test_client, query_counter):
+        access_token, _ = await register_and_login(
+            test_client, "batch_cards_test@test.com", "password123", "batch_cards_test"
+        )
+        test_client.cookies.set("access_token", access_token)
+        board, board_list = await create_board_with_list(test_client, "Import Board")
+        (existing,) = await create_cards(test_client, board_list["id"], "existing")
+
+        query_counter.clear()
+        response = await test_client.post(
+            "/api/v1/cards/batch",
+            json={
+                "board_id": board["id"],
+                "cards": [
+                    {"title": f"imported {i}", "position": 0, "list_id": board_list["id"]} for i in range(50)
+                ],
+            },
+        )
+        assert response.status_code == 200
+        created = response.json()
+        assert [card["formatted_id"] for card in created] == [f"IB-{i}" for i in range(2, 52)]
+        assert all(existing["position"] < card["position"] for card in created)
+        assert sum(statement.startswith("INSERT INTO card") for statement in query_counter) == 1
+
+        response = await test_client.put(
+            "/api/v1/cards/batch",
+            json={
+                "board_id": board["id"],
+                "cards": [{"id": card["id"], "title": card["title"].upper()} for card in created[:2]],
+            },
+        )
+        assert response.status_code == 200
+        assert [card["title"] for card in response.json()] == ["IMPORTED 0", "IMPORTED 1"]
+
+        # Only users with access to the board can be assigned
+        outsider_token, _ = await register_and_login(
+            test_client, "batch_outsider@test.com", "password123", "batch_outsider"
+        )
+        test_client.cookies.set("access_token", outsider_token)
+        outsider_id = (await test_client.get("/api/v1/auth/me")).json()["id"]
+        test_client.cookies.set("access_token", access_token)
+        response = await test_client.put(
+            "/api/v1/cards/batch",
+            json={"board_id": board["id"], "cards": [{"id": created[0]["id"], "assignee_id": outsider_id}]},
+        )
+        assert response.status_code == 400
+
+        response = await test_client.post(
+            "/api/v1/cards/batch-delete",
+            json={"board_id": board["id"], "card_ids": [card["id"] for card in created[2:]]},
+        )
+        assert response.status_code == 200
+
+        response = await test_client.get("/api/v1/cards/", params={"list_id": board_list["id"]})
+        assert [card["title"] for card in response.json()] == ["existing", "IMPORTED 0", "IMPORTED 1"]
+
+    async def test_search_cards_on_accessible_boards(self, test_client):
+        other_token, _ = await register_and_login(
+            test_client, "search_other@test.com", "password123", "search_other"
+        )
+        test_client.cookies.set("access_token", other_token)
+        _, other_list = await create_board_with_list(test_client, "Other Board")
+        (other_card,) = await create_cards(test_client, other_list["id"], "invoice export")
+
+        access_token, _ = await register_and_login(
+            test_client, "search_test@test.com", "password123", "search_test"
+        )
+        test_client.cookies.set("access_token", access_token)
+        _, board_list = await create_board_with_list(test_client, "Search Board")
+        in_title, in_description, _ = await create_cards(
+            test_client, board_list["id"], "invoice export", "monthly report", "groceries"
+        )
+        await test_client.put(f"/api/v1/cards/{in_description['id']}", json={"description": "attach the invoice"})
+
+        response = await test_client.get("/api/v1/cards/search", params={"q": "invoice"})
+        assert response.status_code == 200
+        results = response.json()
+        # Title matches outrank description matches; the other user's board is not searched
+        assert [card["id"] for card in results] == [in_title["id"], in_description["id"]]
+        assert results[0]["board_title"] == "Search Board"
+        assert results[0]["formatted_id"] == in_title["formatted_id"]
+
+        first_page = (await test_client.get("/api/v1/cards/search", params={"q": "invoice", "limit": 1})).json()
+        second_page = (
+            await test_client.get(
+                "/api/v1/cards/search", params={"q": "invoice", "limit": 1, "after": first_page[-1]["id"]}
+            )
+        ).json()
+        assert [card["id"] for card in first_page + second_page] == [in_title["id"], in_description["id"]]
+
+        # A card of an inaccessible board is no cursor: its rank must not leak through the page boundary
+        response = await test_client.get("/api/v1/cards/search", params={"q": "invoice", "after": other_card["id"]})
+        assert response.status_code == 200
+        assert response.json() == []
+
+    async def test_card_context_is_single_query(self, test_client, query_counter):
+        access_token, _ = await register_and_login(
+            test_client, "context_test@test.com", "password123", "context_test"
+        )
+        test_client.cookies.set("access_token", access_token)
+        _, board_list = await create_board_with_list(test_client, "Context Board")
+        (card,) = await create_cards(test_client, board_list["id"], "card")
+
+        query_counter.clear()
+        response = await test_client.get(f"/api/v1/cards/{card['id']}/comments")
+        assert response.status_code == 200
+        # current user + card/list/board/access context + comments
+        assert len(query_counter) <= 3
+
+    async def test_card_comments_keyset_pagination(self, test_client):
+        access_token, _ = await register_and_login(
+            test_client, "comments_test@test.com", "password123", "comments_test"
+        )
+        test_client.cookies.set("access_token", access_token)
+        _, board_list = await create_board_with_list(test_client, "Comments Board")
+        (card,) = await create_cards(test_client, board_list["id"], "card")
+        for i in range(5):
+            await test_client.post(
+                f"/api/v1/cards/{card['id']}/comments", json={"text": f"c{i}", "card_id": card["id"]}
+            )
+
+        first_page = (await test_client.get(f"/api/v1/cards/{card['id']}/comments", params={"limit": 3})).json()
+        assert [comment["text"] for comment in first_page] == ["c0", "c1", "c2"]
+        assert first_page[0]["user"]["username"] == "comments_test"
+
+        second_page = (
+            await test_client.get(
+                f"/api/v1/cards/{card['id']}/comments", params={"limit": 3, "after": first_page[-1]["id"]}
+            )
+        ).json()
+        assert [comment["text"] for comment in second_page] == ["c3", "c4"]
+
+    async def test_assignee_notification_goes_to_outbox(self, test_client, query_counter):
+        assignee_token, _ = await register_and_login(
+            test_client, "outbox_assignee@test.com", "password123", "outbox_assignee"
+        )
+        test_client.cookies.set("access_token", assignee_token)
+        assignee_id = (await test_client.get("/api/v1/auth/me")).json()["id"]
+
+        access_token, _ = await register_and_login(
+            test_client, "outbox_test@test.com", "password123", "outbox_test"
+        )
+        test_client.cookies.set("access_token", access_token)
+        _, board_list = await create_board_with_list(test_client, "Outbox Board")
+        (card,) = await create_cards(test_client, board_list["id"], "notify me")
+
+        query_counter.clear()
+        response = await test_client.put(f"/api/v1/cards/{card['id']}", json={"assignee_id": assignee_id})
+        assert response.status_code == 200
+        assert sum("INSERT INTO outbox_message" in statement for statement in query_counter) == 1
+
+        query_counter.clear()
+        response = await test_client.put(f"/api/v1/cards/{card['id']}", json={"assignee_id": None})
+        assert response.status_code == 200
+        assert not any("INSERT INTO outbox_message" in statement for statement in query_counter)
@@ -0,0 +1,64 @@
+from src.repositories import (
+    BoardRepository,
+    BoardShareReository,
+    CardRepository,
+    CommentRepository,
+    ListRepository,
+    UserRepository,
+)
+from tests.api.v1.utils import create_board_with_list, register_and_login
+
+
+class TestQueryPlans:
+    async def test_repository_queries_use_indexes(
+        self, test_client, db_session, select_statements, find_seq_scans
+    ):
+        other_token, _ = await register_and_login(test_client, "plans_other@test.com", "password123", "plans_other")
+        test_client.cookies.set("access_token", other_token)
+        other_id = (await test_client.get("/api/v1/auth/me")).json()["id"]
+
+        access_token, _ = await register_and_login(test_client, "plans_owner@test.com", "password123", "plans_owner")
+        test_client.cookies.set("access_token", access_token)
+        owner_id = (await test_client.get("/api/v1/auth/me")).json()["id"]
+
+        board, board_list = await create_board_with_list(test_client, "Plans Board")
+        await test_client.post(
+            f"/api/v1/boards/{board['id']}/share",
+            json={"board_id": board["id"], "user_id": other_id, "access_type": "write"},
+        )
+        cards = (
+            await test_client.post(
+                "/api/v1/cards/batch",
+                json={
+                    "board_id": board["id"],
+                    "cards": [{"title": f"card {i}", "position": 0, "list_id": board_list["id"]} for i in range(200)],
+                },
+            )
+        ).json()
+        card_id = cards[0]["id"]
+        for i in range(20):
+            await test_client.post(f"/api/v1/cards/{card_id}/comments", json={"text": f"c{i}", "card_id": card_id})
+
+        boards = BoardRepository(db_session)
+        lists = ListRepository(db_session)
+        card_repository = CardRepository(db_session)
+
+        select_statements.clear()
+
+        await boards.get_user_boards(owner_id)
+        await boards.get_user_boards(other_id, sort="-updated_at")
+        await boards.get_board_with_access(board["id"], other_id)
+        await boards.get_board_snapshot(board["id"], owner_id)
+        await boards.get_board_changes(board["id"], 0)
+        await lists.get_board_lists(board["id"], include_cards=True)
+        await lists.get_list_board_version(board_list["id"], other_id)
+        await card_repository.get_list_cards(board_list["id"])
+        await card_repository.get_card_with_access(card_id, other_id)
+        await card_repository.get_neighbour_positions(board_list["id"], 100)
+        await card_repository.search_cards(other_id, "card", 10)
+        await CommentRepository(db_session).get_card_comments(card_id, 10)
+        await BoardShareReository(db_session).get_board_shares_with_user_info(board["id"])
+        await UserRepository(db_session).search_users("plans", 10, owner_id)
+
+        assert select_statements
+        assert await find_seq_scans(select_statements) == []
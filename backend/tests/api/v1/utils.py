@@ -20,3 +20,21 @@ async def register_and_login(test_client, email, password, username):
     refresh_token = login_response.json()["refresh_token"]
     
     return access_token, refresh_token
+
+
+async def create_board_with_list(test_client, title="Test Board"):
+    board = (await test_client.post("/api/v1/boards/", json={"title": title})).json()
+    board_list = (
+        await test_client.post("/api/v1/lists/", json={"title": "Todo", "position": 0, "board_id": board["id"]})
+    ).json()
+    return board, board_list
+
+
+async def create_cards(test_client, list_id, *titles):
+    cards = []
+    for position, title in enumerate(titles):
+        response = await test_client.post(
+            "/api/v1/cards/", json={"title": title, "position": position, "list_id": list_id}
+        )
+        cards.append(response.json())
+    return cards